@@ -0,0 +1,87 @@
+"""Batch classification of archived PGN games across a process pool."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+import sys
+
+# Keep the script runnable without requiring editable install first.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.batch import analyse_pgn_files
+from chess_punisher.engine.blunder_classifier import Thresholds, parse_thresholds
+from chess_punisher.observability import bind_correlation_id, configure_logging, get_logger
+
+LOGGER = get_logger(__name__)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Classify every move of PGN archives.")
+    parser.add_argument("pgn", nargs="+", help="PGN files to analyse.")
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="JSONL output path, one record per game (default: stdout).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes, one Stockfish each (default: CPU count).",
+    )
+    parser.add_argument("--time", type=float, default=0.1, help="Engine think time in seconds.")
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=None,
+        help="Fixed search depth; replaces --time for reproducible results.",
+    )
+    parser.add_argument(
+        "--nodes",
+        type=int,
+        default=None,
+        help="Fixed node budget; replaces --time (see make calibrate for nodes/sec).",
+    )
+    parser.add_argument(
+        "--thresholds",
+        type=parse_thresholds,
+        default=Thresholds(),
+        help="Centipawn thresholds inaccuracy,mistake,blunder (default: 50,150,300).",
+    )
+    return parser
+
+
+def main() -> int:
+    configure_logging()
+    args = _build_parser().parse_args()
+    with bind_correlation_id():
+        output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            stats = analyse_pgn_files(
+                args.pgn,
+                output,
+                workers=args.workers,
+                time_limit_s=args.time,
+                thresholds=args.thresholds,
+                depth=args.depth,
+                nodes=args.nodes,
+            )
+        except (OSError, RuntimeError) as exc:
+            LOGGER.error("batch_analysis_failed", extra={"error": str(exc)})
+            print(f"Batch analysis failed: {exc}", file=sys.stderr)
+            return 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+    print(json.dumps(stats.as_dict()), file=sys.stderr)
+    return 0 if stats.errors == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
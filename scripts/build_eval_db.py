@@ -0,0 +1,73 @@
+"""Build a memory-mapped eval database from the opening plies of PGN archives."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+# Keep the script runnable without requiring editable install first.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.batch import build_eval_db
+from chess_punisher.engine.engine_pool import shutdown_default_pool
+from chess_punisher.observability import bind_correlation_id, configure_logging, get_logger
+
+LOGGER = get_logger(__name__)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Precompute evaluations for a PGN corpus.")
+    parser.add_argument("pgn", nargs="+", help="PGN files to read positions from.")
+    parser.add_argument("--output", required=True, help="Eval database file to write.")
+    parser.add_argument(
+        "--max-ply",
+        type=int,
+        default=20,
+        help="Evaluate positions up to this many plies into each game (default: 20).",
+    )
+    parser.add_argument("--time", type=float, default=0.1, help="Engine think time in seconds.")
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=None,
+        help="Fixed search depth; replaces --time. Must match the classifier's limit.",
+    )
+    parser.add_argument(
+        "--nodes",
+        type=int,
+        default=None,
+        help="Fixed node budget; replaces --time. Must match the classifier's limit.",
+    )
+    return parser
+
+
+def main() -> int:
+    configure_logging()
+    args = _build_parser().parse_args()
+    with bind_correlation_id():
+        try:
+            count = build_eval_db(
+                args.pgn,
+                args.output,
+                max_ply=args.max_ply,
+                time_limit_s=args.time,
+                depth=args.depth,
+                nodes=args.nodes,
+            )
+        except (OSError, RuntimeError) as exc:
+            LOGGER.error("eval_db_build_failed", extra={"error": str(exc)})
+            print(f"Eval database build failed: {exc}", file=sys.stderr)
+            return 1
+        finally:
+            shutdown_default_pool()
+    print(json.dumps({"output": args.output, "positions": count}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
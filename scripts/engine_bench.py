@@ -0,0 +1,80 @@
+"""Benchmark engine helper latency against the fake engine or Stockfish."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+# Keep the script runnable without requiring editable install first.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.bench import run_benchmarks
+from chess_punisher.engine.fake_uci import fake_engine_command
+from chess_punisher.observability import bind_correlation_id, configure_logging, get_logger
+
+LOGGER = get_logger(__name__)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Engine latency benchmark suite.")
+    parser.add_argument(
+        "--engine",
+        choices=("fake", "stockfish"),
+        default="fake",
+        help="fake: bundled fake UCI engine; stockfish: binary at STOCKFISH_PATH.",
+    )
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per benchmark.")
+    parser.add_argument("--time", type=float, default=0.1, help="Engine think time in seconds.")
+    parser.add_argument("--depth", type=int, default=None, help="Fixed search depth.")
+    parser.add_argument("--nodes", type=int, default=None, help="Fixed node budget.")
+    parser.add_argument(
+        "--fake-latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated search time of the fake engine.",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="Write the JSON report here ('-' for stdout).",
+    )
+    return parser
+
+
+def main() -> int:
+    configure_logging()
+    args = _build_parser().parse_args()
+    command = None
+    if args.engine == "fake":
+        command = fake_engine_command("--latency-ms", str(args.fake_latency_ms))
+
+    with bind_correlation_id():
+        try:
+            report = run_benchmarks(
+                command=command,
+                iterations=args.iterations,
+                time_limit_s=args.time,
+                depth=args.depth,
+                nodes=args.nodes,
+            )
+        except (OSError, RuntimeError, ValueError) as exc:
+            LOGGER.error("engine_benchmark_failed", extra={"error": str(exc)})
+            print(f"Benchmark failed: {exc}")
+            return 1
+
+    report["engine"] = args.engine
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""Measure local engine speed and convert a time budget into a node budget."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+import chess
+
+# Keep the script runnable without requiring editable install first.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.stockfish_engine import measure_nps
+from chess_punisher.observability import bind_correlation_id, configure_logging, get_logger
+
+LOGGER = get_logger(__name__)
+
+# Opening, middlegame and endgame samples so the figure is not skewed by one phase.
+CALIBRATION_FENS = (
+    chess.STARTING_FEN,
+    "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 9",
+    "r2q1rk1/1b2bppp/p2ppn2/1p6/3NP3/1BN1B3/PPP2PPP/R2Q1RK1 w - - 0 12",
+    "8/5pk1/6p1/3R4/5P2/6P1/r5K1/8 w - - 0 45",
+)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Report engine nodes/sec on this host.")
+    parser.add_argument(
+        "--sample-time",
+        type=float,
+        default=1.0,
+        help="Search time per calibration position in seconds.",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=0.1,
+        help="Time budget (seconds) to convert into an equivalent --nodes value.",
+    )
+    return parser
+
+
+def main() -> int:
+    configure_logging()
+    args = _build_parser().parse_args()
+    boards = [chess.Board(fen) for fen in CALIBRATION_FENS]
+    with bind_correlation_id():
+        try:
+            nps = measure_nps(boards, time_limit_s=args.sample_time)
+        except (OSError, RuntimeError) as exc:
+            LOGGER.error("engine_calibration_failed", extra={"error": str(exc)})
+            print(f"Calibration failed: {exc}")
+            return 1
+
+        report = {
+            "nodes_per_s": round(nps),
+            "budget_s": args.budget,
+            "equivalent_nodes": max(1, round(nps * args.budget)),
+        }
+        LOGGER.info("engine_calibrated", extra=report)
+        print(json.dumps(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
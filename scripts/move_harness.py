@@ -17,15 +17,18 @@ SRC_PATH = PROJECT_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-from chess_punisher.engine.blunder_classifier import (
-    MATE_CP_EQUIVALENT,
-    Thresholds,
-    classify_cp_loss,
-    compute_cp_loss_for_mover,
-)
+from chess_punisher.engine.blunder_classifier import Thresholds, parse_thresholds
+from chess_punisher.engine.cancellation import AnalysisCancelled, CancellationRegistry
+from chess_punisher.engine.candidate import CandidatePipeline
+from chess_punisher.engine.eval_cache import get_default_cache
+from chess_punisher.engine.game_analyzer import GameAnalyzer
+from chess_punisher.engine.shortcuts import get_default_oracle
+from chess_punisher.engine.speculation import Speculator
+from chess_punisher.engine.warmup import EngineWarmup
 from chess_punisher.comms.punisher import PunishEvent, Punisher
 from chess_punisher.actuation import (
     MqttActuatorAdapter,
+    MqttCommandPipeline,
     MqttCommandTracker,
     PahoAckTransport,
     PunishCommand,
@@ -98,36 +101,24 @@ def _build_command(
     )
 
 
-def _evaluate_cp_for_color(
-    board: chess.Board,
-    color: chess.Color,
-    engine: chess.engine.SimpleEngine,
-    time_limit_s: float,
-) -> int:
-    info = engine.analyse(board, chess.engine.Limit(time=time_limit_s))
-    raw_score = info.get("score")
-    if raw_score is None:
-        raise RuntimeError("Engine analysis did not return a score.")
-    score = raw_score.pov(color)
-    return score.score(mate_score=MATE_CP_EQUIVALENT)
-
-
-def _parse_thresholds(raw: str) -> Thresholds:
-    try:
-        inaccuracy, mistake, blunder = [int(x.strip()) for x in raw.split(",")]
-    except ValueError as exc:
-        raise argparse.ArgumentTypeError(
-            "thresholds must be three comma-separated integers like 50,150,300"
-        ) from exc
-    return Thresholds(inaccuracy=inaccuracy, mistake=mistake, blunder=blunder)
-
-
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Interactive move classification harness.")
     parser.add_argument("--time", type=float, default=0.1, help="Engine think time in seconds.")
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=None,
+        help="Fixed search depth; replaces --time for reproducible results.",
+    )
+    parser.add_argument(
+        "--nodes",
+        type=int,
+        default=None,
+        help="Fixed node budget; replaces --time (see make calibrate for nodes/sec).",
+    )
     parser.add_argument(
         "--thresholds",
-        type=_parse_thresholds,
+        type=parse_thresholds,
         default=Thresholds(),
         help="Centipawn thresholds inaccuracy,mistake,blunder (default: 50,150,300).",
     )
@@ -170,16 +161,32 @@ def _build_parser() -> argparse.ArgumentParser:
         default=_env_int("MQTT_MAX_RETRIES", 3),
         help="Max retries for sim/mqtt modes.",
     )
+    parser.add_argument(
+        "--actuation-window",
+        type=int,
+        default=_env_int("ACTUATION_WINDOW", 4),
+        help="MQTT commands in flight per actuator before new ones queue.",
+    )
+    parser.add_argument(
+        "--confirm-moves",
+        action="store_true",
+        default=_env_bool("CONFIRM_MOVES", default=False),
+        help="Ask to confirm each move; classification runs while the prompt waits.",
+    )
+    parser.add_argument(
+        "--speculate",
+        type=int,
+        default=_env_int("SPECULATE_TOP_N", 3),
+        help="Pre-analyse this many likely replies while waiting for input (0 disables).",
+    )
     return parser
 
 
 def main() -> int:
     configure_logging()
     args = _build_parser().parse_args()
-    board = chess.Board()
     thresholds: Thresholds = args.thresholds
     time_limit_s: float = args.time
-    default_thresholds = Thresholds()
     stockfish_path = _stockfish_path()
     punisher = Punisher(
         white_url=os.getenv("PUNISHER_WHITE_URL"),
@@ -188,7 +195,9 @@ def main() -> int:
         timeout_s=0.3,
     )
     logger = GameLogger(log_path=os.getenv("GAME_LOG_PATH"))
-    machine = AppStateMachine()
+    # DESYNC / MOVE_REJECTED / reset abort any search still running for the old position.
+    cancellations = CancellationRegistry()
+    machine = AppStateMachine(on_abort=lambda reason: cancellations.cancel(reason))
     game_id = f"harness-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
 
     tracker: MqttCommandTracker | None = None
@@ -203,6 +212,7 @@ def main() -> int:
         sim = EspActuatorSim()
 
     mqtt_adapter: MqttActuatorAdapter | None = None
+    mqtt_pipeline: MqttCommandPipeline | None = None
     if args.actuation_mode == "mqtt":
         try:
             transport = PahoAckTransport(
@@ -220,6 +230,7 @@ def main() -> int:
             tracker=tracker,
             transport=transport,
         )
+        mqtt_pipeline = MqttCommandPipeline([mqtt_adapter], window=args.actuation_window)
 
     def emit(evt: Event) -> None:
         transition = machine.handle(evt)
@@ -233,10 +244,21 @@ def main() -> int:
             },
         )
 
-    def dispatch_punishment(punish_evt: PunishEvent, seq: int) -> bool:
+    def on_command_done(command: PunishCommand, executed: bool) -> None:
+        # Runs on the adapter's network/timer thread, so it only logs.
+        if executed:
+            LOGGER.info("punish_command_executed", extra={"command_id": command.command_id})
+        else:
+            LOGGER.warning(
+                "punish_command_not_executed",
+                extra={"command_id": command.command_id, "severity": command.severity},
+            )
+
+    def dispatch_punishment(punish_evt: PunishEvent, seq: int) -> str:
+        """Dispatch a punishment; returns the state machine event for the outcome."""
         if args.actuation_mode == "http":
             punisher.trigger(punish_evt)
-            return True
+            return "PUNISH_ACK"
 
         assert tracker is not None
         command = _build_command(
@@ -261,10 +283,17 @@ def main() -> int:
             for ack in sim.execute(command):
                 if tracker.mark_ack(ack):
                     executed = True
-            return executed
+            return "PUNISH_ACK" if executed else "PUNISH_TIMEOUT"
 
-        assert mqtt_adapter is not None
-        return mqtt_adapter.send_and_wait(command)
+        # Queued behind at most `--actuation-window` commands; the move loop does not
+        # wait for the actuator, and the outcome is logged by `on_command_done`.
+        assert mqtt_pipeline is not None
+        try:
+            mqtt_pipeline.submit(command, on_done=on_command_done, timeout_s=args.ack_timeout)
+        except (RuntimeError, TimeoutError) as exc:
+            LOGGER.error("punish_command_not_queued", extra={"error": str(exc)})
+            return "PUNISH_TIMEOUT"
+        return "PUNISH_QUEUED"
 
     if not stockfish_path.exists():
         print(
@@ -283,133 +312,182 @@ def main() -> int:
             extra={"correlation_id": correlation_id, "actuation_mode": args.actuation_mode},
         )
         emit(event("START"))
+        # Start and warm the engines in the background; the first move waits for them.
+        warmup = EngineWarmup(
+            time_limit_s=time_limit_s,
+            openings=_env_bool("WARMUP_OPENINGS", default=False),
+            depth=args.depth,
+            nodes=args.nodes,
+        )
+        warmup.start()
         emit(event("CALIBRATION_STABLE", confidence=1.0))
-        try:
-            with chess.engine.SimpleEngine.popen_uci(str(stockfish_path)) as engine:
-                command_seq = 0
-                while True:
-                    raw = input("> ").strip().lower()
-                    if raw == "quit":
-                        LOGGER.info("move_harness_quit")
-                        return 0
-                    if raw == "reset":
-                        board.reset()
-                        logger.reset()
-                        LOGGER.info("board_reset")
-                        emit(event("DESYNC"))
-                        emit(event("START"))
-                        emit(event("CALIBRATION_STABLE", confidence=1.0))
-                        print("Board reset.")
-                        continue
-                    if raw == "log":
-                        for entry in logger.tail(10):
-                            print(format_entry(entry))
-                        continue
-                    if raw == "clearlog":
-                        logger.reset()
-                        LOGGER.info("log_cleared")
-                        print("Log cleared.")
-                        continue
-                    if not raw:
-                        continue
+        analyzer = GameAnalyzer(
+            time_limit_s=time_limit_s, thresholds=thresholds, depth=args.depth, nodes=args.nodes
+        )
+        candidates = CandidatePipeline(analyzer, registry=cancellations, game_id=game_id)
+        speculator = (
+            Speculator(
+                top_n=args.speculate,
+                time_limit_s=time_limit_s,
+                depth=args.depth,
+                nodes=args.nodes,
+            )
+            if args.speculate > 0
+            else None
+        )
+        board = analyzer.board
+
+        def reset_game() -> None:
+            # Cancels a candidate search still in flight, then waits for it to stop.
+            cancellations.cancel("reset")
+            candidates.reject("reset")
+            if speculator is not None:
+                speculator.preempt()
+            analyzer.reset()
+            logger.reset()
+            LOGGER.info("board_reset")
+            emit(event("DESYNC"))
+            emit(event("START"))
+            emit(event("CALIBRATION_STABLE", confidence=1.0))
+            print("Board reset.")
+            if speculator is not None:
+                speculator.start(analyzer.board)
 
-                    try:
-                        move = chess.Move.from_uci(raw)
-                    except ValueError:
-                        LOGGER.warning("invalid_move_text", extra={"raw": raw})
-                        print(f"Invalid UCI move: {raw}")
-                        continue
-                    if move not in board.legal_moves:
-                        LOGGER.warning("illegal_move", extra={"move_uci": raw})
-                        print(f"Illegal move: {raw}")
+        try:
+            if speculator is not None:
+                speculator.start(board)
+            command_seq = 0
+            while True:
+                raw = input("> ").strip().lower()
+                if raw == "quit":
+                    LOGGER.info(
+                        "move_harness_quit",
+                        extra={
+                            "eval_cache": get_default_cache().stats().as_dict(),
+                            "speculation": speculator.stats() if speculator else None,
+                            "position_sources": get_default_oracle().stats(),
+                            "candidate_overlap": candidates.stats(),
+                            "actuation": (
+                                [stats.as_dict() for stats in mqtt_pipeline.stats()]
+                                if mqtt_pipeline
+                                else None
+                            ),
+                        },
+                    )
+                    return 0
+                if raw == "reset":
+                    reset_game()
+                    board = analyzer.board
+                    continue
+                if raw == "log":
+                    for entry in logger.tail(10):
+                        print(format_entry(entry))
+                    continue
+                if raw == "clearlog":
+                    logger.reset()
+                    LOGGER.info("log_cleared")
+                    print("Log cleared.")
+                    continue
+                if not raw:
+                    continue
+
+                try:
+                    move = chess.Move.from_uci(raw)
+                except ValueError:
+                    LOGGER.warning("invalid_move_text", extra={"raw": raw})
+                    print(f"Invalid UCI move: {raw}")
+                    continue
+                if move not in board.legal_moves:
+                    LOGGER.warning("illegal_move", extra={"move_uci": raw})
+                    print(f"Illegal move: {raw}")
+                    continue
+
+                # The first search needs the warmed engines (and the start position's eval).
+                if not warmup.wait():
+                    LOGGER.error("engine_error_analysis", extra={"error": warmup.error})
+                    print(f"Engine error: {warmup.error}")
+                    return 1
+                emit(event("MOVE_CANDIDATE", move_uci=move.uci(), confidence=1.0))
+                if speculator is not None:
+                    speculator.preempt(move)
+
+                # Classification starts on the candidate; one new engine search per ply,
+                # since the previous ply's search already provides this position's eval
+                # and best move. Only --confirm-moves has a confirmation step to overlap.
+                candidates.begin(move)
+                if args.confirm_moves:
+                    reply = input(f"Confirm {move.uci()}? [Enter=yes, n=reject, reset] ")
+                    reply = reply.strip().lower()
+                    if reply == "reset":
+                        reset_game()
+                        board = analyzer.board
                         continue
-
-                    emit(event("MOVE_CANDIDATE", move_uci=move.uci(), confidence=1.0))
-
-                    mover_color = board.turn
-                    mover_name = "white" if mover_color == chess.WHITE else "black"
-
-                    try:
-                        eval_before = _evaluate_cp_for_color(
-                            board, mover_color, engine, time_limit_s
-                        )
-                        suggested = engine.play(
-                            board, chess.engine.Limit(time=time_limit_s)
-                        ).move
-                        if suggested is None:
-                            raise RuntimeError("Engine did not return a move.")
-                    except RuntimeError as exc:
-                        LOGGER.error("engine_error_pre_move", extra={"error": str(exc)})
-                        print(f"Engine error: {exc}")
-                        return 1
-
-                    # Compute mover-aware loss/classification through shared classifier utility.
-                    try:
-                        loss, label = compute_cp_loss_for_mover(
-                            board_before=board,
-                            move=move,
-                            engine=engine,
-                            time_limit_s=time_limit_s,
-                        )
-                    except ValueError as exc:
-                        LOGGER.warning("illegal_move_rejected", extra={"error": str(exc)})
-                        print(f"Illegal move: {exc}")
+                    if reply in {"n", "no"}:
+                        # on_abort cancels the search; reject() waits for it to stop.
+                        emit(event("MOVE_REJECTED"))
+                        candidates.reject()
+                        print(f"Move rejected: {move.uci()}")
+                        if speculator is not None:
+                            speculator.start(board)
                         continue
-                    except RuntimeError as exc:
-                        LOGGER.error("engine_error_post_move", extra={"error": str(exc)})
-                        print(f"Engine error: {exc}")
-                        return 1
-
-                    if thresholds != default_thresholds:
-                        label = classify_cp_loss(loss, thresholds=thresholds)
-
-                    board_after = board.copy(stack=False)
-                    board_after.push(move)
-                    eval_after = _evaluate_cp_for_color(
-                        board_after, mover_color, engine, time_limit_s
-                    )
-
-                    entry = MoveLogEntry(
-                        move_uci=move.uci(),
+                try:
+                    analysis = candidates.confirm()
+                except ValueError as exc:
+                    LOGGER.warning("illegal_move_rejected", extra={"error": str(exc)})
+                    print(f"Illegal move: {exc}")
+                    continue
+                except AnalysisCancelled as exc:
+                    LOGGER.info("move_analysis_cancelled", extra={"error": str(exc)})
+                    print(f"Analysis cancelled: {exc}")
+                    emit(event("MOVE_REJECTED"))
+                    continue
+                except RuntimeError as exc:
+                    LOGGER.error("engine_error_analysis", extra={"error": str(exc)})
+                    print(f"Engine error: {exc}")
+                    return 1
+
+                mover_name = analysis.mover
+                loss = analysis.loss_cp
+                label = analysis.classification
+                entry = MoveLogEntry(
+                    move_uci=analysis.move_uci,
+                    mover=mover_name,
+                    bestmove_uci=analysis.bestmove_uci,
+                    eval_before_cp=analysis.eval_before_cp,
+                    eval_after_cp=analysis.eval_after_cp,
+                    loss_cp=loss,
+                    classification=label,
+                )
+                logger.log_move(entry)
+                LOGGER.info(
+                    "move_classified",
+                    extra={
+                        "move_uci": entry.move_uci,
+                        "mover": entry.mover,
+                        "classification": entry.classification,
+                        "loss_cp": entry.loss_cp,
+                        "bestmove_uci": entry.bestmove_uci,
+                        "source": analysis.source,
+                    },
+                )
+
+                print(format_entry(entry))
+                if speculator is not None:
+                    speculator.start(board)
+
+                if label != "OK":
+                    emit(event("MOVE_CONFIRMED", punish=True))
+                    command_seq += 1
+                    punish_evt = PunishEvent(
                         mover=mover_name,
-                        bestmove_uci=suggested.uci(),
-                        eval_before_cp=eval_before,
-                        eval_after_cp=eval_after,
+                        severity=label,
+                        move_uci=move.uci(),
                         loss_cp=loss,
-                        classification=label,
-                    )
-                    logger.log_move(entry)
-                    board.push(move)
-                    LOGGER.info(
-                        "move_classified",
-                        extra={
-                            "move_uci": entry.move_uci,
-                            "mover": entry.mover,
-                            "classification": entry.classification,
-                            "loss_cp": entry.loss_cp,
-                            "bestmove_uci": entry.bestmove_uci,
-                        },
+                        bestmove_uci=entry.bestmove_uci,
                     )
-
-                    print(format_entry(entry))
-
-                    if label != "OK":
-                        emit(event("MOVE_CONFIRMED", punish=True))
-                        command_seq += 1
-                        punish_evt = PunishEvent(
-                            mover=mover_name,
-                            severity=label,
-                            move_uci=move.uci(),
-                            loss_cp=loss,
-                            bestmove_uci=suggested.uci(),
-                        )
-                        acked = dispatch_punishment(punish_evt, seq=command_seq)
-                        if acked:
-                            emit(event("PUNISH_ACK"))
-                        else:
-                            emit(event("PUNISH_TIMEOUT"))
-                    else:
-                        emit(event("MOVE_CONFIRMED", punish=False))
+                    emit(event(dispatch_punishment(punish_evt, seq=command_seq)))
+                else:
+                    emit(event("MOVE_CONFIRMED", punish=False))
         except OSError as exc:
             LOGGER.error(
                 "engine_start_failed",
@@ -418,6 +496,10 @@ def main() -> int:
             print(f"Engine error: failed to start Stockfish at '{stockfish_path}': {exc}")
             return 1
         finally:
+            if speculator is not None:
+                speculator.close()
+            if mqtt_pipeline is not None:
+                mqtt_pipeline.close()
             if mqtt_adapter is not None:
                 mqtt_adapter.close()
 
@@ -0,0 +1,37 @@
+"""Micro-benchmark of MQTT command tracker retry bookkeeping."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+# Keep the script runnable without requiring editable install first.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.actuation.bench import run_tracker_benchmark
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="MqttCommandTracker micro-benchmark.")
+    parser.add_argument(
+        "--pending", type=int, default=10_000, help="Outstanding commands (default: 10000)."
+    )
+    parser.add_argument(
+        "--ticks", type=int, default=1_000, help="Idle due_retries/next_deadline calls timed."
+    )
+    return parser
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+    print(json.dumps(run_tracker_benchmark(pending=args.pending, ticks=args.ticks), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
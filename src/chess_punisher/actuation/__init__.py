@@ -2,9 +2,11 @@
 
 from .mqtt_dispatcher import MqttCommandTracker, PendingCommand
 from .mqtt_adapter import MqttActuatorAdapter, PahoAckTransport
+from .mqtt_pipeline import MqttCommandPipeline, PipelineStats
 from .protocol import (
     ACK_STATES,
     COMMAND_ACTIONS,
+    SEVERITY_PRIORITY,
     ActuatorStatus,
     CommandAck,
     PunishCommand,
@@ -16,12 +18,15 @@ from .protocol import (
 __all__ = [
     "ACK_STATES",
     "COMMAND_ACTIONS",
+    "SEVERITY_PRIORITY",
     "ActuatorStatus",
     "CommandAck",
     "MqttActuatorAdapter",
+    "MqttCommandPipeline",
     "MqttCommandTracker",
     "PahoAckTransport",
     "PendingCommand",
+    "PipelineStats",
     "PunishCommand",
     "ack_topic",
     "command_topic",
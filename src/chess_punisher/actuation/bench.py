@@ -0,0 +1,80 @@
+"""Micro-benchmark of MqttCommandTracker bookkeeping with many pending commands."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+from time import perf_counter
+from typing import Any, Callable
+
+from .mqtt_dispatcher import MqttCommandTracker
+from .protocol import CommandAck, PunishCommand
+
+
+def _commands(count: int) -> list[PunishCommand]:
+    return [
+        PunishCommand(
+            command_id=f"bench-{seq}",
+            game_id="bench",
+            seq=seq,
+            action="tap",
+            severity="MISTAKE",
+            pulse_ms=100,
+            ttl_ms=60_000,
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+        for seq in range(count)
+    ]
+
+
+def _per_op_us(fn: Callable[[], object], calls: int) -> float:
+    started = perf_counter()
+    for _ in range(calls):
+        fn()
+    return (perf_counter() - started) / calls * 1e6
+
+
+def run_tracker_benchmark(pending: int = 10_000, ticks: int = 1_000) -> dict[str, Any]:
+    """Time tracker operations with `pending` outstanding commands.
+
+    Logging is disabled while timing so the numbers show the bookkeeping
+    cost only. Returns microseconds per operation; `retry_burst_ms` is one
+    `due_retries()` call with every command due at once.
+    """
+    if pending < 1 or ticks < 1:
+        raise ValueError("pending and ticks must be >= 1")
+    commands = _commands(pending)
+    acks = [CommandAck(command_id=cmd.command_id, state="executed", ts_ms=1) for cmd in commands]
+    logging.disable(logging.CRITICAL)
+    try:
+        idle = MqttCommandTracker(ack_timeout_s=3600.0, max_attempts=3)
+        started = perf_counter()
+        for command in commands:
+            idle.register(command)
+        register_us = (perf_counter() - started) / pending * 1e6
+        next_deadline_us = _per_op_us(idle.next_deadline, ticks)
+        idle_tick_us = _per_op_us(idle.due_retries, ticks)
+        started = perf_counter()
+        for ack in acks:
+            idle.mark_ack(ack)
+        mark_ack_us = (perf_counter() - started) / pending * 1e6
+
+        due = MqttCommandTracker(ack_timeout_s=0.0, max_attempts=3)
+        for command in commands:
+            due.register(command)
+        started = perf_counter()
+        retried = len(due.due_retries())
+        retry_burst_ms = (perf_counter() - started) * 1000.0
+    finally:
+        logging.disable(logging.NOTSET)
+
+    return {
+        "pending": pending,
+        "ticks": ticks,
+        "register_us": round(register_us, 3),
+        "next_deadline_us": round(next_deadline_us, 3),
+        "idle_tick_us": round(idle_tick_us, 3),
+        "mark_ack_us": round(mark_ack_us, 3),
+        "retry_burst_ms": round(retry_burst_ms, 3),
+        "retried": retried,
+    }
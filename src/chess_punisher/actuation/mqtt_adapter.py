@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
 import queue
+import threading
 from time import monotonic
-from typing import Protocol
+from typing import Callable, Protocol
 
 from chess_punisher.observability import get_logger
 
@@ -14,6 +16,8 @@ from .protocol import CommandAck, PunishCommand, ack_topic, command_topic
 
 LOGGER = get_logger(__name__)
 
+AckHandler = Callable[[CommandAck], None]
+
 
 class AckTransport(Protocol):
     def publish(self, topic: str, payload: str, qos: int = 1) -> None: ...
@@ -42,6 +46,7 @@ class PahoAckTransport:
 
         self._ack_topic = ack_topic(device_id)
         self._ack_queue: queue.Queue[CommandAck] = queue.Queue()
+        self._ack_handler: AckHandler | None = None
         self._mqtt = mqtt.Client(client_id=client_id)
         self._mqtt.on_message = self._on_message
         self._mqtt.connect(host, port, keepalive=30)
@@ -52,13 +57,25 @@ class PahoAckTransport:
             extra={"host": host, "port": port, "ack_topic": self._ack_topic},
         )
 
+    def set_ack_handler(self, handler: AckHandler | None) -> None:
+        """Deliver ACKs to `handler` on the network thread instead of `recv_ack`."""
+        self._ack_handler = handler
+
     def _on_message(self, _client: object, _userdata: object, msg: object) -> None:
         try:
             payload_raw = msg.payload.decode("utf-8")
             ack = CommandAck.from_json(payload_raw)
-            self._ack_queue.put_nowait(ack)
         except Exception:
             LOGGER.warning("mqtt_ack_parse_failed", exc_info=True)
+            return
+        handler = self._ack_handler
+        if handler is None:
+            self._ack_queue.put_nowait(ack)
+            return
+        try:
+            handler(ack)
+        except Exception:
+            LOGGER.warning("mqtt_ack_handler_failed", exc_info=True)
 
     def publish(self, topic: str, payload: str, qos: int = 1) -> None:
         self._mqtt.publish(topic, payload, qos=qos)
@@ -76,39 +93,157 @@ class PahoAckTransport:
 
 @dataclass
 class MqttActuatorAdapter:
+    """Publishes commands and resolves one future per command from its ACKs.
+
+    Transports with `set_ack_handler` (such as `PahoAckTransport`) resolve the
+    future straight from their message callback. For other transports a
+    background thread started by the first send blocks in `recv_ack`. Each
+    publish arms a timer for the tracker's `next_deadline()`; when it fires,
+    the due retries are republished and commands that ran out of attempts
+    resolve to False. Commands past their TTL are never published; their
+    future resolves to False as well.
+
+    `send()` returns the future; `send_and_wait()` blocks on it.
+    """
+
     device_id: str
     tracker: MqttCommandTracker
     transport: AckTransport
-
-    def send_and_wait(self, command: PunishCommand) -> bool:
-        topic = command_topic(self.device_id)
-        self.tracker.register(command)
-        self.transport.publish(topic, command.to_json(), qos=1)
+    poll_interval_s: float = 0.05
+    _futures: dict[str, Future[bool]] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _closed: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _poller: threading.Thread | None = field(default=None, init=False, repr=False)
+    _timer: threading.Timer | None = field(default=None, init=False, repr=False)
+    _timer_due_s: float = field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        set_ack_handler = getattr(self.transport, "set_ack_handler", None)
+        if set_ack_handler is not None:
+            set_ack_handler(self._on_ack)
+
+    @property
+    def topic(self) -> str:
+        return command_topic(self.device_id)
+
+    def send(self, command: PunishCommand) -> Future[bool]:
+        """Publish `command`; the future resolves True once it is executed."""
+        future: Future[bool] = Future()
+        with self._lock:
+            if self._closed.is_set():
+                raise RuntimeError("MQTT adapter is closed.")
+            pending = self.tracker.register(command)
+            if not pending.expired:
+                self._futures[command.command_id] = future
+        if pending.expired:
+            future.set_result(False)
+            return future
+        self._ensure_poller()
+        self.transport.publish(self.topic, command.to_json(), qos=1)
+        self._arm_retry_timer()
         LOGGER.info(
             "mqtt_command_sent",
             extra={
                 "device_id": self.device_id,
                 "command_id": command.command_id,
-                "topic": topic,
+                "topic": self.topic,
             },
         )
+        return future
 
-        deadline = monotonic() + (self.tracker.ack_timeout_s * self.tracker.max_attempts) + 0.2
-        while monotonic() < deadline:
-            ack = self.transport.recv_ack(timeout_s=0.05)
+    def send_and_wait(self, command: PunishCommand) -> bool:
+        timeout_s = (self.tracker.ack_timeout_s * self.tracker.max_attempts) + 0.2
+        future = self.send(command)
+        try:
+            return future.result(timeout_s)
+        except FutureTimeoutError:
+            # The caller is told it failed, so the retry timer must not send it later.
+            self.tracker.discard(command.command_id)
+            self._resolve(command.command_id, False)
+            return False
+
+    def _on_ack(self, ack: CommandAck) -> None:
+        with self._lock:
+            executed = self.tracker.mark_ack(ack)
+            future = self._futures.pop(ack.command_id, None) if executed else None
+        if future is not None:
+            future.set_result(True)
+
+    def _arm_retry_timer(self) -> None:
+        """Keep one timer, due at the tracker's earliest retry deadline."""
+        next_deadline = self.tracker.next_deadline()
+        if next_deadline is None:
+            return
+        with self._lock:
+            if self._closed.is_set():
+                return
+            if self._timer is not None:
+                if self._timer_due_s <= next_deadline:
+                    return
+                self._timer.cancel()
+            # A small margin so the tracker's deadline has passed when the timer fires.
+            delay_s = max(0.0, next_deadline - monotonic()) + 0.001
+            self._timer_due_s = next_deadline
+            self._timer = threading.Timer(delay_s, self._on_retry_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_retry_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+        if self._closed.is_set():
+            return
+        retries = self.tracker.due_retries()
+        for retry_command in retries:
+            self.transport.publish(self.topic, retry_command.to_json(), qos=1)
+        self._arm_retry_timer()
+        with self._lock:
+            exhausted = [
+                command_id
+                for command_id in self._futures
+                if not self.tracker.is_pending(command_id)
+            ]
+        for command_id in exhausted:
+            self._resolve(command_id, False)
+
+    def _resolve(self, command_id: str, executed: bool) -> None:
+        with self._lock:
+            future = self._futures.pop(command_id, None)
+        if future is None:
+            return
+        if not executed:
+            LOGGER.error(
+                "mqtt_command_timeout",
+                extra={"command_id": command_id, "device_id": self.device_id},
+            )
+        future.set_result(executed)
+
+    def _ensure_poller(self) -> None:
+        if getattr(self.transport, "set_ack_handler", None) is not None:
+            return
+        with self._lock:
+            if self._poller is not None:
+                return
+            self._poller = threading.Thread(
+                target=self._poll_acks, name="mqtt-ack-poller", daemon=True
+            )
+            self._poller.start()
+
+    def _poll_acks(self) -> None:
+        while not self._closed.is_set():
+            ack = self.transport.recv_ack(timeout_s=self.poll_interval_s)
             if ack is not None:
-                is_executed = self.tracker.mark_ack(ack)
-                if ack.command_id == command.command_id and is_executed:
-                    return True
-
-            for retry_command in self.tracker.due_retries():
-                self.transport.publish(topic, retry_command.to_json(), qos=1)
-
-        LOGGER.error(
-            "mqtt_command_timeout",
-            extra={"command_id": command.command_id, "device_id": self.device_id},
-        )
-        return False
+                self._on_ack(ack)
 
     def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            pending = list(self._futures)
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for command_id in pending:
+            self._resolve(command_id, False)
+        if self._poller is not None:
+            self._poller.join(timeout=1.0)
         self.transport.close()
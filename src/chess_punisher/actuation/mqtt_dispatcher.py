@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import heapq
+import itertools
+import threading
 from time import monotonic
 
 from chess_punisher.observability import get_logger
@@ -16,22 +19,65 @@ LOGGER = get_logger(__name__)
 class PendingCommand:
     command: PunishCommand
     deadline_s: float
+    expires_s: float
     attempts: int = 1
     acked: bool = False
+    expired: bool = False
 
 
 class MqttCommandTracker:
-    """Tracks command ACK state; transport implementation can be plugged later."""
+    """Tracks command ACK state; transport implementation can be plugged later.
+
+    Retry deadlines live in a min-heap next to the pending map, so
+    registering or rescheduling a command is O(log n) and `due_retries()`
+    only touches commands whose deadline has passed. Entries made stale by
+    an ACK or a reschedule are skipped when they reach the top, and the
+    heap is rebuilt once stale entries outnumber live ones.
+    `next_deadline()` tells callers how long they can sleep.
+
+    Each command expires `ttl_ms` after its `created_at`. A command that is
+    already stale is not tracked (`register()` returns it with `expired`
+    set), and a pending command is dropped instead of retried once its TTL
+    runs out. A retry deadline never lies past the expiry, so stale commands
+    leave the tracker on time. `expired_total` counts both cases. Retries
+    due in the same tick are returned most severe first.
+
+    Safe to use from the transport's network thread and retry timers at once.
+    """
 
     def __init__(self, ack_timeout_s: float = 0.6, max_attempts: int = 3) -> None:
         self.ack_timeout_s = ack_timeout_s
         self.max_attempts = max_attempts
         self._pending: dict[str, PendingCommand] = {}
+        self._deadlines: list[tuple[float, int, str]] = []
+        self._order = itertools.count()
+        self._lock = threading.RLock()
+        self.expired_total = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
 
     def register(self, command: PunishCommand) -> PendingCommand:
         now = monotonic()
-        pending = PendingCommand(command=command, deadline_s=now + self.ack_timeout_s)
-        self._pending[command.command_id] = pending
+        expires_s = now + command.remaining_s()
+        pending = PendingCommand(
+            command=command,
+            deadline_s=min(now + self.ack_timeout_s, expires_s),
+            expires_s=expires_s,
+        )
+        if expires_s <= now:
+            pending.expired = True
+            with self._lock:
+                self.expired_total += 1
+            LOGGER.warning(
+                "command_expired",
+                extra={"command_ids": [command.command_id], "stage": "register"},
+            )
+            return pending
+        with self._lock:
+            self._pending[command.command_id] = pending
+            self._schedule(pending)
         LOGGER.info(
             "command_registered",
             extra={
@@ -42,14 +88,38 @@ class MqttCommandTracker:
         )
         return pending
 
+    def is_pending(self, command_id: str) -> bool:
+        with self._lock:
+            return command_id in self._pending
+
+    def discard(self, command_id: str) -> bool:
+        """Stop tracking a command, e.g. once its caller gave up; no more retries."""
+        with self._lock:
+            pending = self._pending.pop(command_id, None)
+            if pending is not None:
+                self._maybe_compact()
+        if pending is None:
+            return False
+        LOGGER.info("command_discarded", extra={"command_id": command_id})
+        return True
+
+    def next_deadline(self) -> float | None:
+        """Monotonic time of the earliest retry deadline, or None when idle."""
+        with self._lock:
+            self._drop_stale()
+            return self._deadlines[0][0] if self._deadlines else None
+
     def mark_ack(self, ack: CommandAck) -> bool:
-        pending = self._pending.get(ack.command_id)
+        with self._lock:
+            pending = self._pending.get(ack.command_id)
+            if pending is not None and ack.state == "executed":
+                pending.acked = True
+                del self._pending[ack.command_id]
+                self._maybe_compact()
         if pending is None:
             LOGGER.warning("ack_unknown_command", extra={"command_id": ack.command_id})
             return False
         if ack.state == "executed":
-            pending.acked = True
-            del self._pending[ack.command_id]
             LOGGER.info("command_executed", extra={"command_id": ack.command_id})
             return True
         LOGGER.info("command_ack_state", extra={"command_id": ack.command_id, "state": ack.state})
@@ -58,23 +128,66 @@ class MqttCommandTracker:
     def due_retries(self) -> list[PunishCommand]:
         now = monotonic()
         retries: list[PunishCommand] = []
-        for command_id, pending in list(self._pending.items()):
-            if pending.acked:
-                continue
-            if now < pending.deadline_s:
-                continue
-            if pending.attempts >= self.max_attempts:
-                LOGGER.error(
-                    "command_retry_exhausted",
-                    extra={"command_id": command_id, "attempts": pending.attempts},
-                )
-                del self._pending[command_id]
-                continue
-            pending.attempts += 1
-            pending.deadline_s = now + self.ack_timeout_s
+        exhausted: list[str] = []
+        expired: list[str] = []
+        rescheduled: list[PendingCommand] = []
+        with self._lock:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                deadline_s, _, command_id = heapq.heappop(self._deadlines)
+                pending = self._pending.get(command_id)
+                if pending is None or pending.deadline_s != deadline_s:
+                    continue
+                if pending.expires_s <= now:
+                    del self._pending[command_id]
+                    pending.expired = True
+                    expired.append(command_id)
+                    continue
+                if pending.attempts >= self.max_attempts:
+                    del self._pending[command_id]
+                    exhausted.append(command_id)
+                    continue
+                pending.attempts += 1
+                pending.deadline_s = min(now + self.ack_timeout_s, pending.expires_s)
+                rescheduled.append(pending)
+                retries.append(pending.command)
+            # Pushed after the loop so a command is retried at most once per call.
+            for pending in rescheduled:
+                self._schedule(pending)
+            self.expired_total += len(expired)
+        # Stable sort: equal severities keep their deadline order from the heap.
+        retries.sort(key=lambda command: command.priority)
+        if expired:
+            LOGGER.warning("command_expired", extra={"command_ids": expired, "stage": "retry"})
+        if exhausted:
+            LOGGER.error(
+                "command_retry_exhausted",
+                extra={"command_ids": exhausted, "attempts": self.max_attempts},
+            )
+        if retries:
             LOGGER.warning(
                 "command_retry_due",
-                extra={"command_id": command_id, "attempts": pending.attempts},
+                extra={"command_ids": [command.command_id for command in retries]},
             )
-            retries.append(pending.command)
         return retries
+
+    def _schedule(self, pending: PendingCommand) -> None:
+        heapq.heappush(
+            self._deadlines,
+            (pending.deadline_s, next(self._order), pending.command.command_id),
+        )
+
+    def _drop_stale(self) -> None:
+        while self._deadlines:
+            deadline_s, _, command_id = self._deadlines[0]
+            pending = self._pending.get(command_id)
+            if pending is not None and pending.deadline_s == deadline_s:
+                return
+            heapq.heappop(self._deadlines)
+
+    def _maybe_compact(self) -> None:
+        if len(self._deadlines) > 2 * len(self._pending) + 64:
+            self._deadlines = [
+                (pending.deadline_s, next(self._order), command_id)
+                for command_id, pending in self._pending.items()
+            ]
+            heapq.heapify(self._deadlines)
@@ -0,0 +1,250 @@
+"""Pipelined actuator dispatch with a bounded number of commands in flight per device."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import threading
+from time import monotonic
+from typing import Any, Callable, Iterable
+
+from chess_punisher.observability import get_logger
+
+from .mqtt_adapter import MqttActuatorAdapter
+from .protocol import PunishCommand
+
+LOGGER = get_logger(__name__)
+
+CompletionCallback = Callable[[PunishCommand, bool], None]
+
+
+@dataclass(order=True)
+class _Queued:
+    sort_key: tuple[int, float, int, int]
+    command: PunishCommand = field(compare=False)
+    future: Future[bool] = field(compare=False)
+    on_done: CompletionCallback | None = field(compare=False)
+    submitted_at: float = field(compare=False)
+
+
+@dataclass(frozen=True)
+class PipelineStats:
+    device_id: str
+    in_flight: int
+    queued: int
+    max_in_flight: int
+    submitted: int
+    executed: int
+    failed: int
+    expired: int
+    elapsed_s: float
+
+    @property
+    def throughput_per_s(self) -> float:
+        done = self.executed + self.failed
+        return done / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "device_id": self.device_id,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "submitted": self.submitted,
+            "executed": self.executed,
+            "failed": self.failed,
+            "expired": self.expired,
+            "throughput_per_s": round(self.throughput_per_s, 3),
+        }
+
+
+class _Lane:
+    def __init__(self, adapter: MqttActuatorAdapter) -> None:
+        self.adapter = adapter
+        self.queue: list[_Queued] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.submitted = 0
+        self.executed = 0
+        self.failed = 0
+        self.expired = 0
+        self.started: float | None = None
+
+
+class MqttCommandPipeline:
+    """Keeps up to `window` commands in flight per device without blocking callers.
+
+    `submit()` queues a command for its device and returns a future that
+    resolves to True once the actuator executed it. Each device has its own
+    lane. Whenever fewer than `window` commands are awaiting their ACK, the
+    next queued one is sent: most severe first, then earliest expiry, then
+    lowest `seq`. A slow actuator only delays its own lane. Commands whose
+    TTL ran out while queued are failed without being published.
+    `on_done(command, executed)` is called on completion. When a lane
+    already holds `max_queued` waiting commands, `submit()` blocks for up to
+    `timeout_s` and then raises `TimeoutError`.
+
+    `stats()` reports the in-flight depth, its peak, the throughput and the
+    number of expired commands per device. Expired commands also count as
+    failed. The expiry count includes the adapter's tracker, so give each
+    adapter its own tracker.
+    """
+
+    def __init__(
+        self,
+        adapters: Iterable[MqttActuatorAdapter],
+        window: int = 4,
+        max_queued: int = 64,
+    ) -> None:
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self.max_queued = max_queued
+        self._lanes = {adapter.device_id: _Lane(adapter) for adapter in adapters}
+        if not self._lanes:
+            raise ValueError("at least one adapter is required")
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._closed = False
+
+    def submit(
+        self,
+        command: PunishCommand,
+        device_id: str | None = None,
+        on_done: CompletionCallback | None = None,
+        timeout_s: float | None = None,
+    ) -> Future[bool]:
+        lane = self._lane(device_id)
+        future: Future[bool] = Future()
+        item = _Queued(
+            sort_key=(command.priority, command.expires_at(), command.seq, next(self._seq)),
+            command=command,
+            future=future,
+            on_done=on_done,
+            submitted_at=monotonic(),
+        )
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._closed or len(lane.queue) < self.max_queued, timeout_s
+            ):
+                raise TimeoutError(f"Actuator queue for {lane.adapter.device_id} is full.")
+            if self._closed:
+                raise RuntimeError("Command pipeline is closed.")
+            heapq.heappush(lane.queue, item)
+            lane.submitted += 1
+            if lane.started is None:
+                lane.started = item.submitted_at
+        self._pump(lane)
+        return future
+
+    def stats(self) -> list[PipelineStats]:
+        now = monotonic()
+        with self._cond:
+            return [
+                PipelineStats(
+                    device_id=device_id,
+                    in_flight=lane.in_flight,
+                    queued=len(lane.queue),
+                    max_in_flight=lane.max_in_flight,
+                    submitted=lane.submitted,
+                    executed=lane.executed,
+                    failed=lane.failed,
+                    expired=lane.expired + lane.adapter.tracker.expired_total,
+                    elapsed_s=0.0 if lane.started is None else now - lane.started,
+                )
+                for device_id, lane in self._lanes.items()
+            ]
+
+    def close(self) -> None:
+        """Fail every queued command; commands in flight finish on their adapter."""
+        with self._cond:
+            self._closed = True
+            dropped = [item for lane in self._lanes.values() for item in lane.queue]
+            for lane in self._lanes.values():
+                lane.failed += len(lane.queue)
+                lane.queue.clear()
+            self._cond.notify_all()
+        for item in dropped:
+            self._finish(item, False)
+
+    def _lane(self, device_id: str | None) -> _Lane:
+        if device_id is None:
+            if len(self._lanes) != 1:
+                raise ValueError("device_id is required with several actuators")
+            return next(iter(self._lanes.values()))
+        try:
+            return self._lanes[device_id]
+        except KeyError:
+            raise ValueError(f"Unknown actuator device: {device_id}") from None
+
+    def _pump(self, lane: _Lane) -> None:
+        while True:
+            with self._cond:
+                if self._closed or not lane.queue or lane.in_flight >= self.window:
+                    return
+                item = heapq.heappop(lane.queue)
+                self._cond.notify_all()
+                expired = item.command.remaining_s() <= 0
+                if expired:
+                    lane.failed += 1
+                    lane.expired += 1
+                else:
+                    lane.in_flight += 1
+                    lane.max_in_flight = max(lane.max_in_flight, lane.in_flight)
+            if expired:
+                LOGGER.warning(
+                    "actuator_command_expired",
+                    extra={
+                        "device_id": lane.adapter.device_id,
+                        "command_id": item.command.command_id,
+                        "queued_ms": round((monotonic() - item.submitted_at) * 1000.0, 1),
+                    },
+                )
+                self._finish(item, False)
+                continue
+            try:
+                sent = lane.adapter.send(item.command)
+            except Exception:
+                LOGGER.warning(
+                    "actuator_send_failed",
+                    extra={"command_id": item.command.command_id},
+                    exc_info=True,
+                )
+                self._complete(lane, item, None)
+                continue
+            sent.add_done_callback(lambda done, item=item: self._complete(lane, item, done))
+
+    def _complete(self, lane: _Lane, item: _Queued, done: Future[bool] | None) -> None:
+        executed = False
+        if done is not None and done.exception() is None:
+            executed = bool(done.result())
+        with self._cond:
+            lane.in_flight -= 1
+            if executed:
+                lane.executed += 1
+            else:
+                lane.failed += 1
+            in_flight = lane.in_flight
+        LOGGER.info(
+            "actuator_command_done",
+            extra={
+                "device_id": lane.adapter.device_id,
+                "command_id": item.command.command_id,
+                "seq": item.command.seq,
+                "executed": executed,
+                "latency_ms": round((monotonic() - item.submitted_at) * 1000.0, 1),
+                "in_flight": in_flight,
+            },
+        )
+        self._finish(item, executed)
+        self._pump(lane)
+
+    def _finish(self, item: _Queued, executed: bool) -> None:
+        if item.on_done is not None:
+            try:
+                item.on_done(item.command, executed)
+            except Exception:
+                LOGGER.warning("actuator_callback_failed", exc_info=True)
+        item.future.set_result(executed)
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime, timezone
 import json
+import time
 from typing import Any
 
 COMMAND_TOPIC_TEMPLATE = "cp/actuators/{device_id}/cmd"
@@ -12,6 +14,8 @@ STATUS_TOPIC_TEMPLATE = "cp/actuators/{device_id}/status"
 
 ACK_STATES = {"received", "executed", "rejected"}
 COMMAND_ACTIONS = {"tap", "press", "double_tap"}
+# Most severe first; unknown severities (e.g. probe "TEST") sort last.
+SEVERITY_PRIORITY = ("BLUNDER", "MISTAKE", "INACCURACY")
 
 
 def command_topic(device_id: str) -> str:
@@ -26,6 +30,14 @@ def status_topic(device_id: str) -> str:
     return STATUS_TOPIC_TEMPLATE.format(device_id=device_id)
 
 
+def _parse_timestamp(raw: str) -> datetime:
+    # `fromisoformat` only accepts a trailing "Z" from Python 3.11 on.
+    parsed = datetime.fromisoformat(raw[:-1] + "+00:00" if raw.endswith("Z") else raw)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
 @dataclass(frozen=True)
 class PunishCommand:
     command_id: str
@@ -52,6 +64,26 @@ class PunishCommand:
             raise ValueError("ttl_ms must be > 0")
         if not self.created_at:
             raise ValueError("created_at is required")
+        try:
+            _parse_timestamp(self.created_at)
+        except ValueError:
+            raise ValueError("created_at must be an ISO-8601 timestamp") from None
+
+    @property
+    def priority(self) -> int:
+        """Sort key for dispatch order; lower values are sent first."""
+        try:
+            return SEVERITY_PRIORITY.index(self.severity)
+        except ValueError:
+            return len(SEVERITY_PRIORITY)
+
+    def expires_at(self) -> float:
+        """Wall-clock expiry (epoch seconds): `created_at` plus `ttl_ms`."""
+        return _parse_timestamp(self.created_at).timestamp() + self.ttl_ms / 1000.0
+
+    def remaining_s(self, now: float | None = None) -> float:
+        """Seconds until the command expires; <= 0 once it is stale."""
+        return self.expires_at() - (time.time() if now is None else now)
 
     def as_dict(self) -> dict[str, Any]:
         self.validate()
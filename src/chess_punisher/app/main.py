@@ -2,23 +2,49 @@
 
 from __future__ import annotations
 
+import os
+from pathlib import Path
+
+from chess_punisher.engine.warmup import EngineWarmup
 from chess_punisher.observability import bind_correlation_id, configure_logging, get_logger
 from chess_punisher.orchestrator import AppStateMachine, event
 
 LOGGER = get_logger(__name__)
 
 
-def run_once() -> None:
+def _stockfish_path() -> Path:
+    return Path(os.getenv("STOCKFISH_PATH", "./bin/stockfish"))
+
+
+def run_once() -> EngineWarmup | None:
+    """Bootstrap the state machine; returns the background warm-up, if started."""
     machine = AppStateMachine()
     machine.handle(event("START"))
+    # Engines start and warm up in the background while vision calibrates.
+    warmup: EngineWarmup | None = None
+    if _stockfish_path().exists():
+        warmup = EngineWarmup()
+        warmup.start()
+    else:
+        LOGGER.warning("engine_warmup_skipped", extra={"stockfish_path": str(_stockfish_path())})
     machine.handle(event("CALIBRATION_STABLE", confidence=0.95))
-    LOGGER.info("app_bootstrap_complete", extra={"state": machine.state.value})
+    LOGGER.info(
+        "app_bootstrap_complete",
+        extra={
+            "state": machine.state.value,
+            **(warmup.stats() if warmup is not None else {"warmup_state": "skipped"}),
+        },
+    )
+    return warmup
 
 
 def main() -> int:
     configure_logging()
     with bind_correlation_id():
-        run_once()
+        warmup = run_once()
+        if warmup is not None:
+            # Let the warm-up finish before the engine pool is shut down at exit.
+            warmup.wait()
     return 0
 
 
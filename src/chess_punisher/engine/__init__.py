@@ -1,11 +1,89 @@
-from .blunder_classifier import Thresholds, classify_cp_loss, cp_loss
-from .stockfish_engine import analyse_board, analyse_fen, best_move
+from .async_engine import (
+    AsyncEnginePool,
+    analyse_board_async,
+    best_move_async,
+    compute_cp_loss_for_mover_async,
+    evaluate_position_async,
+    open_engine,
+)
+from .blunder_classifier import (
+    CLASSIFICATION_LABELS,
+    MultiPVClassifier,
+    Thresholds,
+    classify_cp_loss,
+    classify_cp_loss_array,
+    compute_cp_loss_for_mover,
+    cp_loss,
+    cp_loss_array,
+    move_accuracy_array,
+    parse_thresholds,
+    player_accuracy,
+    player_acpl,
+)
+from .cancellation import AnalysisCancelled, CancellationRegistry, CancelToken
+from .candidate import CandidatePipeline
+from .engine_pool import EnginePool, get_default_pool, set_default_pool, shutdown_default_pool
+from .eval_cache import CacheStats, EvalCache, PositionEval, get_default_cache
+from .eval_db import EvalDatabase, write_eval_db
+from .eval_store import SqliteEvalStore
+from .game_analyzer import GameAnalyzer, MoveAnalysis
+from .lean_uci import LeanUciEngine
+from .scheduler import AnalysisScheduler, SchedulerStats
+from .shortcuts import PositionOracle, get_default_oracle
+from .speculation import Speculator
+from .supervisor import SupervisedEngine
+from .warmup import EngineWarmup
+from .streaming import StreamingResult, compute_cp_loss_streaming
+from .stockfish_engine import analyse_board, analyse_fen, best_move, evaluate_position
 
 __all__ = [
+    "AnalysisCancelled",
+    "AnalysisScheduler",
+    "AsyncEnginePool",
+    "CLASSIFICATION_LABELS",
+    "CacheStats",
+    "CandidatePipeline",
+    "CancelToken",
+    "CancellationRegistry",
+    "EnginePool",
+    "EngineWarmup",
+    "EvalCache",
+    "EvalDatabase",
+    "GameAnalyzer",
+    "LeanUciEngine",
+    "MoveAnalysis",
+    "MultiPVClassifier",
+    "PositionEval",
+    "PositionOracle",
+    "SchedulerStats",
+    "Speculator",
+    "SqliteEvalStore",
+    "SupervisedEngine",
+    "StreamingResult",
     "Thresholds",
     "analyse_board",
+    "analyse_board_async",
     "analyse_fen",
     "best_move",
+    "best_move_async",
     "classify_cp_loss",
+    "classify_cp_loss_array",
+    "compute_cp_loss_for_mover",
+    "compute_cp_loss_for_mover_async",
+    "compute_cp_loss_streaming",
     "cp_loss",
+    "cp_loss_array",
+    "evaluate_position",
+    "evaluate_position_async",
+    "get_default_cache",
+    "get_default_oracle",
+    "get_default_pool",
+    "move_accuracy_array",
+    "open_engine",
+    "parse_thresholds",
+    "player_accuracy",
+    "player_acpl",
+    "set_default_pool",
+    "shutdown_default_pool",
+    "write_eval_db",
 ]
@@ -0,0 +1,249 @@
+"""Asyncio-native engine helpers built on `chess.engine.popen_uci`.
+
+These mirror the blocking helpers but run on the caller's event loop, so one
+loop can drive many engines and overlap analysis with actuation or vision
+I/O without a helper thread per engine.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+import chess
+import chess.engine
+
+from chess_punisher.observability import get_logger
+
+from .blunder_classifier import _score_to_cp, classify_cp_loss
+from .engine_pool import EngineCommand, _require_stockfish_binary, _uci_options
+from .eval_cache import EvalCache, PositionEval, get_default_cache
+from .shortcuts import PositionOracle, get_default_oracle
+from .stockfish_engine import build_limit, search_options
+
+LOGGER = get_logger(__name__)
+
+AsyncEngineFactory = Callable[[], Awaitable[chess.engine.Protocol]]
+
+
+async def open_engine(
+    command: EngineCommand | None = None,
+    threads: int = 1,
+    hash_mb: int = 16,
+) -> chess.engine.Protocol:
+    """Start a UCI engine on the running loop and apply Threads/Hash."""
+    if command is None:
+        command = str(_require_stockfish_binary())
+    _, engine = await chess.engine.popen_uci(command)
+    options = _uci_options(engine.options, threads, hash_mb)
+    if options:
+        await engine.configure(options)
+    LOGGER.info("async_engine_spawned", extra={"engine_options": options})
+    return engine
+
+
+async def _quit_engine(engine: chess.engine.Protocol) -> None:
+    try:
+        await engine.quit()
+    except Exception:
+        LOGGER.warning("async_engine_quit_failed", exc_info=True)
+
+
+class AsyncEnginePool:
+    """Asyncio counterpart of `EnginePool`: up to `size` engines on one loop."""
+
+    def __init__(
+        self,
+        command: EngineCommand | None = None,
+        size: int = 1,
+        threads: int = 1,
+        hash_mb: int = 16,
+        factory: AsyncEngineFactory | None = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self.command = command
+        self.size = size
+        self.threads = threads
+        self.hash_mb = hash_mb
+        self._factory = factory or self._spawn
+        self._cond = asyncio.Condition()
+        self._idle: list[chess.engine.Protocol] = []
+        self._live = 0
+        self._closed = False
+
+    async def _spawn(self) -> chess.engine.Protocol:
+        return await open_engine(self.command, threads=self.threads, hash_mb=self.hash_mb)
+
+    async def checkout(self) -> chess.engine.Protocol:
+        async with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Engine pool is closed.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._live < self.size:
+                    self._live += 1
+                    break
+                await self._cond.wait()
+
+        try:
+            return await self._factory()
+        except BaseException:
+            async with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+
+    async def checkin(self, engine: chess.engine.Protocol, discard: bool = False) -> None:
+        async with self._cond:
+            release = discard or self._closed
+            if release:
+                self._live -= 1
+            else:
+                self._idle.append(engine)
+            self._cond.notify()
+        if release:
+            await _quit_engine(engine)
+
+    @asynccontextmanager
+    async def engine(self) -> AsyncIterator[chess.engine.Protocol]:
+        engine = await self.checkout()
+        discard = False
+        try:
+            yield engine
+        except (chess.engine.EngineError, asyncio.TimeoutError):
+            discard = True
+            raise
+        finally:
+            await self.checkin(engine, discard=discard)
+
+    async def close(self) -> None:
+        async with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._cond.notify_all()
+        await asyncio.gather(*(_quit_engine(engine) for engine in idle))
+
+
+@asynccontextmanager
+async def _borrow(
+    engine: chess.engine.Protocol | None,
+    pool: AsyncEnginePool | None,
+) -> AsyncIterator[chess.engine.Protocol]:
+    if engine is not None:
+        yield engine
+        return
+    if pool is None:
+        raise ValueError("Pass an engine or an AsyncEnginePool.")
+    async with pool.engine() as pooled:
+        yield pooled
+
+
+async def evaluate_position_async(
+    board: chess.Board,
+    limit: chess.engine.Limit,
+    engine: chess.engine.Protocol | None = None,
+    pool: AsyncEnginePool | None = None,
+    cache: EvalCache | None = None,
+    oracle: PositionOracle | None = None,
+) -> PositionEval:
+    """Async `evaluate_position`; shares the eval cache and oracle of the blocking API."""
+    cache = cache if cache is not None else get_default_cache()
+    cached = cache.get(board, limit)
+    if cached is not None:
+        return cached
+
+    oracle = oracle if oracle is not None else get_default_oracle()
+    exact = oracle.probe_position(board, limit)
+    if exact is not None:
+        cache.put(board, limit, exact)
+        return exact
+
+    oracle.record("engine")
+
+    async with _borrow(engine, pool) as active:
+        info = await active.analyse(board, limit, **search_options(limit))
+    result = PositionEval.from_info(info)
+    cache.put(board, limit, result)
+    return result
+
+
+async def analyse_board_async(
+    board: chess.Board,
+    time_limit_s: float = 0.1,
+    engine: chess.engine.Protocol | None = None,
+    pool: AsyncEnginePool | None = None,
+    cache: EvalCache | None = None,
+    depth: int | None = None,
+    nodes: int | None = None,
+) -> chess.engine.PovScore:
+    limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+    result = await evaluate_position_async(board, limit, engine=engine, pool=pool, cache=cache)
+    return result.score
+
+
+async def best_move_async(
+    board: chess.Board,
+    time_limit_s: float = 0.1,
+    engine: chess.engine.Protocol | None = None,
+    pool: AsyncEnginePool | None = None,
+    depth: int | None = None,
+    nodes: int | None = None,
+) -> chess.Move:
+    limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+    async with _borrow(engine, pool) as active:
+        result = await active.play(board, limit, **search_options(limit))
+    if result.move is None:
+        raise RuntimeError("Engine did not return a move.")
+    return result.move
+
+
+async def compute_cp_loss_for_mover_async(
+    board_before: chess.Board,
+    move: chess.Move,
+    engine: chess.engine.Protocol | None = None,
+    time_limit_s: float = 0.1,
+    pool: AsyncEnginePool | None = None,
+    cache: EvalCache | None = None,
+    depth: int | None = None,
+    nodes: int | None = None,
+    oracle: PositionOracle | None = None,
+) -> tuple[int, str]:
+    """Async `compute_cp_loss_for_mover`.
+
+    Book moves from `oracle` (default: the shared one) score a zero loss
+    without searching. With a pool and no explicit engine, the two positions
+    are searched concurrently on separate engines when the pool has room.
+    """
+    if move not in board_before.legal_moves:
+        raise ValueError(f"Illegal move for position: {move.uci()}")
+
+    oracle = oracle if oracle is not None else get_default_oracle()
+    if oracle.is_book_move(board_before, move):
+        return 0, classify_cp_loss(0)
+
+    mover_color = board_before.turn
+    limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+    board_after = board_before.copy(stack=False)
+    board_after.push(move)
+
+    if engine is not None:
+        eval_before = await evaluate_position_async(
+            board_before, limit, engine=engine, cache=cache, oracle=oracle
+        )
+        eval_after = await evaluate_position_async(
+            board_after, limit, engine=engine, cache=cache, oracle=oracle
+        )
+    else:
+        eval_before, eval_after = await asyncio.gather(
+            evaluate_position_async(board_before, limit, pool=pool, cache=cache, oracle=oracle),
+            evaluate_position_async(board_after, limit, pool=pool, cache=cache, oracle=oracle),
+        )
+
+    before_cp = _score_to_cp(eval_before.score.pov(mover_color))
+    after_cp = _score_to_cp(eval_after.score.pov(mover_color))
+    loss = max(0, before_cp - after_cp)
+    return loss, classify_cp_loss(loss)
@@ -0,0 +1,234 @@
+"""Offline batch classification of PGN archives across a process pool."""
+
+from __future__ import annotations
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import asdict, dataclass
+import io
+import json
+import os
+from pathlib import Path
+from time import monotonic
+from typing import Any, Iterable, Iterator, TextIO
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+from chess_punisher.observability import get_logger
+
+from .blunder_classifier import Thresholds
+from .engine_pool import EngineCommand, EnginePool, get_default_pool, set_default_pool
+from .eval_cache import EvalCache, PositionEval
+from .eval_db import write_eval_db
+from .game_analyzer import GameAnalyzer
+from .shortcuts import PositionOracle
+from .stockfish_engine import build_limit, evaluate_position
+
+LOGGER = get_logger(__name__)
+
+RECORD_HEADERS = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+
+
+@dataclass(frozen=True)
+class BatchStats:
+    games: int
+    positions: int
+    errors: int
+    elapsed_s: float
+
+    @property
+    def games_per_s(self) -> float:
+        return self.games / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def positions_per_s(self) -> float:
+        return self.positions / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "games": self.games,
+            "positions": self.positions,
+            "errors": self.errors,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "games_per_s": round(self.games_per_s, 3),
+            "positions_per_s": round(self.positions_per_s, 3),
+        }
+
+
+def iter_pgn_games(paths: Iterable[str | Path]) -> Iterator[str]:
+    """Stream games from PGN files as standalone PGN strings."""
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            while True:
+                game = chess.pgn.read_game(handle)
+                if game is None:
+                    break
+                yield str(game)
+
+
+def analyse_game(game: chess.pgn.Game, analyzer: GameAnalyzer) -> dict[str, Any]:
+    """Classify every mainline move of `game`; returns one JSON-ready record."""
+    analyzer.reset(game.board())
+    moves = [asdict(analyzer.push(move)) for move in game.mainline_moves()]
+    return {
+        "headers": {key: game.headers[key] for key in RECORD_HEADERS if key in game.headers},
+        "moves": moves,
+    }
+
+
+_WORKER_ANALYZER: GameAnalyzer | None = None
+
+
+def _init_worker(
+    command: EngineCommand | None,
+    time_limit_s: float,
+    thresholds: Thresholds,
+    hash_mb: int,
+    depth: int | None,
+    nodes: int | None,
+) -> None:
+    global _WORKER_ANALYZER
+    # One single-threaded engine per worker process; kept for the worker's lifetime.
+    pool = EnginePool(command=command, size=1, threads=1, hash_mb=hash_mb, idle_timeout_s=0)
+    set_default_pool(pool)
+    _WORKER_ANALYZER = GameAnalyzer(
+        time_limit_s=time_limit_s, thresholds=thresholds, pool=pool, depth=depth, nodes=nodes
+    )
+
+
+def _analyse_pgn_text(index: int, pgn_text: str) -> dict[str, Any]:
+    assert _WORKER_ANALYZER is not None
+    record: dict[str, Any] = {"game_index": index}
+    try:
+        game = chess.pgn.read_game(io.StringIO(pgn_text))
+        if game is None:
+            raise ValueError("empty PGN")
+        record.update(analyse_game(game, _WORKER_ANALYZER))
+    except Exception as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    return record
+
+
+def analyse_pgn_files(
+    paths: Iterable[str | Path],
+    output: TextIO,
+    workers: int | None = None,
+    time_limit_s: float = 0.1,
+    thresholds: Thresholds = Thresholds(),
+    command: EngineCommand | None = None,
+    hash_mb: int = 16,
+    depth: int | None = None,
+    nodes: int | None = None,
+) -> BatchStats:
+    """Classify all games in `paths`, writing one JSON line per game to `output`.
+
+    Games are fanned out across `workers` processes (default: CPU count), each
+    owning one Stockfish. At most a few games per worker are held in memory;
+    records are written in completion order and carry a `game_index`.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+    games = positions = errors = 0
+    started = monotonic()
+
+    def drain(done: Iterable[Future[dict[str, Any]]]) -> None:
+        nonlocal games, positions, errors
+        for future in done:
+            record = future.result()
+            output.write(json.dumps(record, separators=(",", ":")) + "\n")
+            games += 1
+            positions += len(record.get("moves", ()))
+            errors += "error" in record
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(command, time_limit_s, thresholds, hash_mb, depth, nodes),
+    ) as executor:
+        in_flight: set[Future[dict[str, Any]]] = set()
+        for index, pgn_text in enumerate(iter_pgn_games(paths)):
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                drain(done)
+            in_flight.add(executor.submit(_analyse_pgn_text, index, pgn_text))
+        drain(wait(in_flight).done)
+
+    stats = BatchStats(
+        games=games, positions=positions, errors=errors, elapsed_s=monotonic() - started
+    )
+    LOGGER.info("batch_analysis_complete", extra={"workers": workers, **stats.as_dict()})
+    return stats
+
+
+def corpus_positions(paths: Iterable[str | Path], max_ply: int) -> list[chess.Board]:
+    """Unique unfinished positions within the first `max_ply` plies of every game."""
+    seen: set[int] = set()
+    boards: list[chess.Board] = []
+
+    def add(board: chess.Board) -> None:
+        key = chess.polyglot.zobrist_hash(board)
+        if key not in seen and not board.is_game_over():
+            seen.add(key)
+            boards.append(board.copy(stack=False))
+
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            while True:
+                game = chess.pgn.read_game(handle)
+                if game is None:
+                    break
+                board = game.board()
+                add(board)
+                for ply, move in enumerate(game.mainline_moves(), start=1):
+                    if ply > max_ply:
+                        break
+                    board.push(move)
+                    add(board)
+    return boards
+
+
+def build_eval_db(
+    paths: Iterable[str | Path],
+    output: str | Path,
+    max_ply: int = 20,
+    time_limit_s: float = 0.1,
+    depth: int | None = None,
+    nodes: int | None = None,
+    pool: EnginePool | None = None,
+) -> int:
+    """Evaluate every corpus position up to `max_ply` and write an eval database.
+
+    Positions are searched concurrently on `pool` (default: the shared pool)
+    with the same limit the classifier uses, which is recorded in the file
+    header. Book, tablebase and cache shortcuts are bypassed so every record
+    is a real search. Returns the number of positions written.
+    """
+    limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+    pool = pool or get_default_pool()
+    started = monotonic()
+    boards = corpus_positions(paths, max_ply)
+    cache = EvalCache(max_entries=0)
+    oracle = PositionOracle()
+
+    def evaluate(board: chess.Board) -> tuple[chess.Board, PositionEval]:
+        return board, evaluate_position(board, limit, pool=pool, cache=cache, oracle=oracle)
+
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        count = write_eval_db(output, limit, executor.map(evaluate, boards))
+    LOGGER.info(
+        "eval_db_built",
+        extra={
+            "path": str(output),
+            "positions": count,
+            "max_ply": max_ply,
+            "elapsed_s": round(monotonic() - started, 3),
+        },
+    )
+    return count
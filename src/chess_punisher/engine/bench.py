@@ -0,0 +1,308 @@
+"""Latency benchmarks for the engine helpers, with a per-phase breakdown."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import itertools
+import math
+import platform
+from time import perf_counter
+from typing import Any, Callable, Iterable
+
+import chess
+import chess.engine
+
+from chess_punisher.logging.game_logger import MoveLogEntry, format_entry
+from chess_punisher.observability import get_logger
+
+from .blunder_classifier import compute_cp_loss_for_mover
+from .candidate import CandidatePipeline
+from .engine_pool import DRIVERS, EngineCommand, EnginePool
+from .eval_cache import EvalCache
+from .game_analyzer import GameAnalyzer
+from .shortcuts import PositionOracle
+from .stockfish_engine import analyse_board, best_move, build_limit, search_options
+
+LOGGER = get_logger(__name__)
+
+# A short, varied game: replayed move by move for the harness path.
+BENCH_GAME = (
+    "e2e4 c7c5 g1f3 d7d6 d2d4 c5d4 f3d4 g8f6 b1c3 a7a6 c1e3 e7e5 d4b3 c8e6 f2f3 f8e7 "
+    "d1d2 e8g8 e1c1 b8d7 g2g4 b7b5 g4g5 b5b4 c3e2 f6e8 f3f4 a6a5 f4f5 a5a4"
+).split()
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+@dataclass(frozen=True)
+class LatencyStats:
+    name: str
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_samples(cls, name: str, samples_s: Iterable[float]) -> "LatencyStats":
+        ordered = sorted(sample * 1000.0 for sample in samples_s)
+        count = len(ordered)
+        return cls(
+            name=name,
+            count=count,
+            mean_ms=sum(ordered) / count if count else 0.0,
+            p50_ms=percentile(ordered, 50),
+            p95_ms=percentile(ordered, 95),
+            p99_ms=percentile(ordered, 99),
+            max_ms=ordered[-1] if ordered else 0.0,
+        )
+
+    @property
+    def throughput_per_s(self) -> float:
+        return 1000.0 / self.mean_ms if self.mean_ms > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "count": self.count,
+            "mean_ms": round(self.mean_ms, 3),
+            "p50_ms": round(self.p50_ms, 3),
+            "p95_ms": round(self.p95_ms, 3),
+            "p99_ms": round(self.p99_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "throughput_per_s": round(self.throughput_per_s, 1),
+        }
+
+
+def _time_calls(fn: Callable[[], object], iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        started = perf_counter()
+        fn()
+        samples.append(perf_counter() - started)
+    return samples
+
+
+def _bench_boards() -> list[chess.Board]:
+    boards = []
+    board = chess.Board()
+    for uci in BENCH_GAME:
+        boards.append(board.copy(stack=False))
+        board.push_uci(uci)
+    return boards
+
+
+def _phase_breakdown(
+    command: EngineCommand | None,
+    limit: chess.engine.Limit,
+    iterations: int,
+    spawn_samples: int,
+) -> dict[str, LatencyStats]:
+    """Split one analyse call into spawn, UCI round trip, search and client overhead.
+
+    `search` is the engine-reported search time; `client_overhead` is the
+    rest of the wall time of `analyse` (IPC, python-chess parsing, scheduling).
+    """
+    spawn = []
+    for _ in range(spawn_samples):
+        pool = EnginePool(command=command, idle_timeout_s=0)
+        started = perf_counter()
+        engine = pool.checkout()
+        spawn.append(perf_counter() - started)
+        pool.checkin(engine)
+        pool.close()
+
+    boards = _bench_boards()
+    ping, search, overhead, copies = [], [], [], []
+    pool = EnginePool(command=command, idle_timeout_s=0)
+    try:
+        with pool.engine() as engine:
+            for index in range(iterations):
+                board = boards[index % len(boards)]
+                started = perf_counter()
+                engine.ping()
+                ping.append(perf_counter() - started)
+
+                started = perf_counter()
+                board_copy = board.copy(stack=False)
+                copies.append(perf_counter() - started)
+
+                started = perf_counter()
+                info = engine.analyse(board_copy, limit, **search_options(limit))
+                wall = perf_counter() - started
+                reported = float(info.get("time", 0.0))
+                search.append(reported)
+                overhead.append(max(0.0, wall - reported))
+    finally:
+        pool.close()
+
+    return {
+        name: LatencyStats.from_samples(name, samples)
+        for name, samples in (
+            ("spawn", spawn),
+            ("uci_roundtrip", ping),
+            ("search", search),
+            ("client_overhead", overhead),
+            ("board_copy", copies),
+        )
+    }
+
+
+def compare_drivers(
+    command: EngineCommand | None,
+    limit: chess.engine.Limit,
+    iterations: int,
+) -> list[LatencyStats]:
+    """Time `analyse` through each UCI driver on the same positions and limit.
+
+    Each driver gets its own warm engine process; the difference between the
+    entries is the client-side cost of the driver.
+    """
+    boards = _bench_boards()
+    results = []
+    for driver in DRIVERS:
+        pool = EnginePool(command=command, idle_timeout_s=0, driver=driver)
+        try:
+            with pool.engine() as engine:
+                engine.analyse(boards[0], limit, **search_options(limit))
+                cursor = itertools.count()
+                samples = _time_calls(
+                    lambda: engine.analyse(
+                        boards[next(cursor) % len(boards)], limit, **search_options(limit)
+                    ),
+                    iterations,
+                )
+        finally:
+            pool.close()
+        results.append(LatencyStats.from_samples(f"{driver}_analyse", samples))
+    return results
+
+
+def run_benchmarks(
+    command: EngineCommand | None = None,
+    iterations: int = 200,
+    time_limit_s: float = 0.1,
+    depth: int | None = None,
+    nodes: int | None = None,
+    spawn_samples: int = 3,
+) -> dict[str, Any]:
+    """Benchmark the public engine helpers against `command` (default: Stockfish).
+
+    The eval cache is disabled and the classification paths skip the opening
+    book and tablebases, so every call reaches the engine. Returns a
+    JSON-ready report.
+    """
+    if iterations < 1:
+        raise ValueError("iterations must be >= 1")
+    limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+    boards = _bench_boards()
+    no_cache = EvalCache(max_entries=0)
+    no_oracle = PositionOracle()
+    results: list[LatencyStats] = []
+
+    pool = EnginePool(command=command, idle_timeout_s=0)
+    try:
+        # Spawn outside the timed loops.
+        pool.checkin(pool.checkout())
+        cursor = itertools.count()
+
+        def next_board() -> chess.Board:
+            return boards[next(cursor) % len(boards)]
+
+        def analyse_one() -> None:
+            analyse_board(
+                next_board(), time_limit_s, pool=pool, cache=no_cache, depth=depth, nodes=nodes
+            )
+
+        def best_move_one() -> None:
+            best_move(next_board(), time_limit_s, pool=pool, depth=depth, nodes=nodes)
+
+        def classify_one() -> None:
+            board = next_board()
+            move = next(iter(board.legal_moves))
+            with pool.engine() as engine:
+                compute_cp_loss_for_mover(
+                    board,
+                    move,
+                    engine,
+                    time_limit_s,
+                    cache=no_cache,
+                    depth=depth,
+                    nodes=nodes,
+                    oracle=no_oracle,
+                )
+
+        results.append(
+            LatencyStats.from_samples("analyse_board", _time_calls(analyse_one, iterations))
+        )
+        results.append(
+            LatencyStats.from_samples("best_move", _time_calls(best_move_one, iterations))
+        )
+        results.append(
+            LatencyStats.from_samples(
+                "compute_cp_loss_for_mover", _time_calls(classify_one, iterations)
+            )
+        )
+
+        analyzer = GameAnalyzer(
+            time_limit_s=time_limit_s,
+            pool=pool,
+            cache=no_cache,
+            depth=depth,
+            nodes=nodes,
+            oracle=no_oracle,
+        )
+        candidates = CandidatePipeline(analyzer)
+        moves = itertools.count()
+
+        def harness_move() -> None:
+            # Same per-move work as scripts.move_harness: a token-driven classification
+            # started at the candidate and collected on confirmation, then the log line.
+            ply = next(moves) % len(BENCH_GAME)
+            if ply == 0:
+                analyzer.reset()
+            candidates.begin(chess.Move.from_uci(BENCH_GAME[ply]))
+            analysis = candidates.confirm()
+            format_entry(
+                MoveLogEntry(
+                    move_uci=analysis.move_uci,
+                    mover=analysis.mover,
+                    bestmove_uci=analysis.bestmove_uci,
+                    eval_before_cp=analysis.eval_before_cp,
+                    eval_after_cp=analysis.eval_after_cp,
+                    loss_cp=analysis.loss_cp,
+                    classification=analysis.classification,
+                )
+            )
+
+        results.append(
+            LatencyStats.from_samples("harness_move", _time_calls(harness_move, iterations))
+        )
+        candidate_overlap = candidates.stats()
+    finally:
+        pool.close()
+
+    phases = _phase_breakdown(command, limit, iterations, spawn_samples)
+    drivers = compare_drivers(command, limit, iterations)
+    report = {
+        "engine_command": command,
+        "limit": {"time": limit.time, "depth": limit.depth, "nodes": limit.nodes},
+        "iterations": iterations,
+        "python": platform.python_version(),
+        "benchmarks": [stats.as_dict() for stats in results],
+        "candidate_overlap": candidate_overlap,
+        "phases": [stats.as_dict() for stats in phases.values()],
+        "drivers": [stats.as_dict() for stats in drivers],
+    }
+    LOGGER.info(
+        "engine_benchmark_complete",
+        extra={"benchmarks": {stats.name: stats.p50_ms for stats in [*results, *drivers]}},
+    )
+    return report
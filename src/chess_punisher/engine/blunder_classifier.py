@@ -2,14 +2,32 @@
 
 from __future__ import annotations
 
+import argparse
 from dataclasses import dataclass
-from typing import Union
+from typing import TYPE_CHECKING, Any
 
 import chess
 import chess.engine
 
-MATE_CP_EQUIVALENT = 10_000
-ScoreLike = Union[int, chess.engine.Score]
+from .cancellation import CancelToken
+from .engine_pool import get_default_pool
+from .eval_cache import EvalCache
+from .scores import MATE_CP_EQUIVALENT, ScoreLike, _score_to_cp
+from .shortcuts import PositionOracle, get_default_oracle
+from .stockfish_engine import build_limit, evaluate_position, search_options
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import ArrayLike
+
+# Category codes returned by `classify_cp_loss_array`, indexed by code.
+CLASSIFICATION_LABELS = ("OK", "INACCURACY", "MISTAKE", "BLUNDER")
+
+# Lichess win-probability model constants.
+_WIN_PROB_SLOPE = 0.00368208
+_ACCURACY_A = 103.1668
+_ACCURACY_K = 0.04354
+_ACCURACY_B = 3.1669
 
 
 @dataclass(frozen=True)
@@ -19,10 +37,15 @@ class Thresholds:
     blunder: int = 300
 
 
-def _score_to_cp(score: ScoreLike) -> int:
-    if isinstance(score, int):
-        return score
-    return score.score(mate_score=MATE_CP_EQUIVALENT)
+def parse_thresholds(raw: str) -> Thresholds:
+    """Parse "inaccuracy,mistake,blunder" centipawns; usable as an argparse `type`."""
+    try:
+        inaccuracy, mistake, blunder = [int(x.strip()) for x in raw.split(",")]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            "thresholds must be three comma-separated integers like 50,150,300"
+        ) from exc
+    return Thresholds(inaccuracy=inaccuracy, mistake=mistake, blunder=blunder)
 
 
 def cp_loss(before_score: ScoreLike, after_score: ScoreLike) -> int:
@@ -42,34 +65,209 @@ def classify_cp_loss(cp_loss: int, thresholds: Thresholds = Thresholds()) -> str
     return "OK"
 
 
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise RuntimeError(
+            "numpy is required for array classification. Install it via pip install numpy."
+        ) from exc
+    return numpy
+
+
+def _clipped_cp(scores: ArrayLike) -> np.ndarray:
+    """Scores as int32 clipped to +/-MATE_CP_EQUIVALENT (mate scores from `_score_to_cp`)."""
+    np = _numpy()
+    values = np.asarray(scores)
+    return np.clip(values, -MATE_CP_EQUIVALENT, MATE_CP_EQUIVALENT).astype(np.int32, copy=False)
+
+
+def cp_loss_array(before_cp: ArrayLike, after_cp: ArrayLike) -> np.ndarray:
+    """Vectorized `cp_loss` over mover-relative centipawn arrays (int32, clamped at 0)."""
+    np = _numpy()
+    return np.maximum(_clipped_cp(before_cp) - _clipped_cp(after_cp), 0)
+
+
+def classify_cp_loss_array(
+    losses: ArrayLike, thresholds: Thresholds = Thresholds()
+) -> np.ndarray:
+    """Vectorized `classify_cp_loss`: uint8 codes indexing `CLASSIFICATION_LABELS`."""
+    np = _numpy()
+    edges = np.array([thresholds.inaccuracy, thresholds.mistake, thresholds.blunder])
+    return np.searchsorted(edges, np.asarray(losses), side="right").astype(np.uint8)
+
+
+def win_probability_array(cp: ArrayLike) -> np.ndarray:
+    """Win probability in percent for mover-relative centipawns."""
+    np = _numpy()
+    return 50.0 + 50.0 * (2.0 / (1.0 + np.exp(-_WIN_PROB_SLOPE * _clipped_cp(cp))) - 1.0)
+
+
+def move_accuracy_array(before_cp: ArrayLike, after_cp: ArrayLike) -> np.ndarray:
+    """Per-move accuracy (0-100) from the drop in the mover's win probability."""
+    np = _numpy()
+    drop = np.maximum(win_probability_array(before_cp) - win_probability_array(after_cp), 0.0)
+    accuracy = _ACCURACY_A * np.exp(-_ACCURACY_K * drop) - _ACCURACY_B
+    return np.clip(accuracy, 0.0, 100.0)
+
+
+def _per_player_mean(
+    values: np.ndarray, is_white: ArrayLike, game_index: ArrayLike | None
+) -> np.ndarray:
+    np = _numpy()
+    games = np.zeros(len(values), dtype=np.int64) if game_index is None else np.asarray(game_index)
+    n_games = int(games.max()) + 1 if len(games) else 0
+    slots = games * 2 + np.where(np.asarray(is_white, dtype=bool), 0, 1)
+    totals = np.bincount(slots, weights=values, minlength=n_games * 2)
+    counts = np.bincount(slots, minlength=n_games * 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = totals / counts
+    return means.reshape(n_games, 2)
+
+
+def player_acpl(
+    losses: ArrayLike,
+    is_white: ArrayLike,
+    game_index: ArrayLike | None = None,
+    cap_cp: int | None = 1000,
+) -> np.ndarray:
+    """Average centipawn loss per player: shape (games, 2) as [white, black].
+
+    Plies are grouped by `game_index` (0..n-1; default: one game). Losses are
+    capped at `cap_cp` so a single mate blunder does not dominate the
+    average. Players without moves get NaN.
+    """
+    np = _numpy()
+    values = np.asarray(losses, dtype=np.float64)
+    if cap_cp is not None:
+        values = np.minimum(values, cap_cp)
+    return _per_player_mean(values, is_white, game_index)
+
+
+def player_accuracy(
+    before_cp: ArrayLike,
+    after_cp: ArrayLike,
+    is_white: ArrayLike,
+    game_index: ArrayLike | None = None,
+) -> np.ndarray:
+    """Mean win-probability accuracy per player: shape (games, 2) as [white, black]."""
+    return _per_player_mean(move_accuracy_array(before_cp, after_cp), is_white, game_index)
+
+
 def compute_cp_loss_for_mover(
     board_before: chess.Board,
     move: chess.Move,
-    engine: chess.engine.SimpleEngine,
-    time_limit_s: float,
+    engine: chess.engine.SimpleEngine | None = None,
+    time_limit_s: float = 0.1,
+    cache: EvalCache | None = None,
+    depth: int | None = None,
+    nodes: int | None = None,
+    oracle: PositionOracle | None = None,
+    token: CancelToken | None = None,
 ) -> tuple[int, str]:
-    """Compute centipawn loss and label from the mover's perspective."""
+    """Compute centipawn loss and label from the mover's perspective.
+
+    Book moves from `oracle` (default: the shared one) score a zero loss
+    without searching. Otherwise both positions are looked up in the eval cache
+    (default: the shared one) before searching. Without an explicit `engine`,
+    cache misses are searched on an engine borrowed from the shared pool.
+    Cancelling `token` aborts the search with `AnalysisCancelled`.
+    """
     if move not in board_before.legal_moves:
         raise ValueError(f"Illegal move for position: {move.uci()}")
 
+    oracle = oracle if oracle is not None else get_default_oracle()
+    if oracle.is_book_move(board_before, move):
+        return 0, classify_cp_loss(0)
+
     mover_color = board_before.turn
-    limit = chess.engine.Limit(time=time_limit_s)
+    limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
 
-    info_before = engine.analyse(board_before, limit)
-    raw_before = info_before.get("score")
-    if raw_before is None:
-        raise RuntimeError("Engine analysis did not return a score for pre-move position.")
-    score_before = raw_before.pov(mover_color)
-    before_cp = _score_to_cp(score_before)
+    eval_before = evaluate_position(
+        board_before, limit, engine=engine, cache=cache, oracle=oracle, token=token
+    )
+    before_cp = _score_to_cp(eval_before.score.pov(mover_color))
 
     board_after = board_before.copy(stack=False)
     board_after.push(move)
-    info_after = engine.analyse(board_after, limit)
-    raw_after = info_after.get("score")
-    if raw_after is None:
-        raise RuntimeError("Engine analysis did not return a score for post-move position.")
-    score_after = raw_after.pov(mover_color)
-    after_cp = _score_to_cp(score_after)
+    eval_after = evaluate_position(
+        board_after, limit, engine=engine, cache=cache, oracle=oracle, token=token
+    )
+    after_cp = _score_to_cp(eval_after.score.pov(mover_color))
 
     loss = max(0, before_cp - after_cp)
     return loss, classify_cp_loss(loss)
+
+
+class MultiPVClassifier:
+    """Classify moves from one MultiPV search when the played move is in the top `k`.
+
+    The pre-move search runs with MultiPV=k. If the played move heads one of
+    the returned lines its score is read from that line; otherwise the
+    post-move position is searched as in `compute_cp_loss_for_mover`.
+    `hits`/`misses` count how often the second search was avoided.
+    """
+
+    def __init__(
+        self,
+        k: int = 3,
+        time_limit_s: float = 0.1,
+        thresholds: Thresholds = Thresholds(),
+        cache: EvalCache | None = None,
+        depth: int | None = None,
+        nodes: int | None = None,
+    ) -> None:
+        if k < 1:
+            raise ValueError("k must be >= 1")
+        self.k = k
+        self.limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+        self.thresholds = thresholds
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def classify(
+        self,
+        board_before: chess.Board,
+        move: chess.Move,
+        engine: chess.engine.SimpleEngine | None = None,
+    ) -> tuple[int, str]:
+        if move not in board_before.legal_moves:
+            raise ValueError(f"Illegal move for position: {move.uci()}")
+        if engine is None:
+            with get_default_pool().engine() as pooled:
+                return self.classify(board_before, move, pooled)
+
+        mover_color = board_before.turn
+        limit = self.limit
+        infos = engine.analyse(board_before, limit, multipv=self.k, **search_options(limit))
+        if isinstance(infos, dict):
+            infos = [infos]
+        if not infos or infos[0].get("score") is None:
+            raise RuntimeError("Engine analysis did not return a score for pre-move position.")
+        before_cp = _score_to_cp(infos[0]["score"].pov(mover_color))
+
+        after_cp: int | None = None
+        for info in infos:
+            pv = info.get("pv")
+            score = info.get("score")
+            if pv and pv[0] == move and score is not None:
+                after_cp = _score_to_cp(score.pov(mover_color))
+                break
+
+        if after_cp is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            board_after = board_before.copy(stack=False)
+            board_after.push(move)
+            eval_after = evaluate_position(board_after, limit, engine=engine, cache=self.cache)
+            after_cp = _score_to_cp(eval_after.score.pov(mover_color))
+
+        loss = max(0, before_cp - after_cp)
+        return loss, classify_cp_loss(loss, thresholds=self.thresholds)
@@ -0,0 +1,112 @@
+"""Cancellation tokens that abort in-flight engine searches for stale positions."""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from chess_punisher.observability import get_logger
+
+LOGGER = get_logger(__name__)
+
+
+class AnalysisCancelled(Exception):
+    """Raised by a search whose token was cancelled before it finished."""
+
+
+class CancelToken:
+    """Cancellation handle for the analysis of one ply of one game.
+
+    Searches register a stop callback with `on_cancel()`; `cancel()` runs the
+    callbacks so the engine stops right away instead of finishing its budget.
+    """
+
+    def __init__(self, game_id: str = "", ply: int = 0) -> None:
+        self.game_id = game_id
+        self.ply = ply
+        self.reason: str | None = None
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        with self._lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                LOGGER.warning("cancel_callback_failed", exc_info=True)
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run `callback` on cancellation (immediately if already cancelled).
+
+        Returns a function that unregisters the callback once the guarded
+        work is done.
+        """
+        with self._lock:
+            if self.reason is None:
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self) -> None:
+        if self.reason is not None:
+            raise AnalysisCancelled(f"{self.game_id}#{self.ply}: {self.reason}")
+
+
+class CancellationRegistry:
+    """Tracks the live tokens of each game so whole games or plies can be aborted."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tokens: list[CancelToken] = []
+
+    def issue(self, game_id: str, ply: int) -> CancelToken:
+        token = CancelToken(game_id, ply)
+        with self._lock:
+            self._tokens = [live for live in self._tokens if not live.cancelled]
+            self._tokens.append(token)
+        return token
+
+    def release(self, token: CancelToken) -> None:
+        """Forget a token whose analysis has finished."""
+        with self._lock:
+            if token in self._tokens:
+                self._tokens.remove(token)
+
+    def cancel(
+        self,
+        reason: str,
+        game_id: str | None = None,
+        from_ply: int | None = None,
+    ) -> int:
+        """Cancel live tokens, optionally only one game and plies >= `from_ply`."""
+        with self._lock:
+            matched = [
+                token
+                for token in self._tokens
+                if (game_id is None or token.game_id == game_id)
+                and (from_ply is None or token.ply >= from_ply)
+            ]
+            self._tokens = [token for token in self._tokens if token not in matched]
+        for token in matched:
+            token.cancel(reason)
+        if matched:
+            LOGGER.info(
+                "analysis_cancelled",
+                extra={"reason": reason, "game_id": game_id, "count": len(matched)},
+            )
+        return len(matched)
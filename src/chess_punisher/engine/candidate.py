@@ -0,0 +1,156 @@
+"""Classification started at MOVE_CANDIDATE so it overlaps move confirmation."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import threading
+from time import monotonic
+from typing import Any
+
+import chess
+
+from chess_punisher.observability import get_logger
+
+from .cancellation import CancellationRegistry, CancelToken
+from .eval_cache import PositionEval
+from .game_analyzer import GameAnalyzer, MoveAnalysis
+
+LOGGER = get_logger(__name__)
+
+
+class CandidatePipeline:
+    """Runs `GameAnalyzer.classify` for a candidate move on a background thread.
+
+    `begin(move)` starts the analysis as soon as vision reports a candidate.
+    `confirm()` waits for it (often already done), plays the move on the
+    analyzer and returns the `MoveAnalysis`; `reject()` cancels the search.
+    The wall time that overlapped the confirmation window is logged per move
+    as `candidate_overlap` and summed in `stats()`.
+
+    Tokens are issued from `registry`, so cancelling it (e.g. from the state
+    machine's `on_abort`) also cancels a pending candidate.
+
+    Only one search touches the analyzer at a time: `reject()`, a new
+    `begin()` and a timed-out `confirm()` cancel the running search and wait
+    for its thread to finish before the analyzer is used again.
+    """
+
+    def __init__(
+        self,
+        analyzer: GameAnalyzer,
+        registry: CancellationRegistry | None = None,
+        game_id: str = "",
+    ) -> None:
+        self.analyzer = analyzer
+        self.registry = registry or CancellationRegistry()
+        self.game_id = game_id
+        self.confirmed = 0
+        self.rejected = 0
+        self.saved_s = 0.0
+        self._move: chess.Move | None = None
+        self._token: CancelToken | None = None
+        self._future: Future[tuple[MoveAnalysis, PositionEval | None]] | None = None
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+        self._finished: float | None = None
+
+    @property
+    def pending(self) -> chess.Move | None:
+        return self._move
+
+    def begin(self, move: chess.Move) -> None:
+        """Start classifying `move`; a previous pending candidate is rejected."""
+        if move not in self.analyzer.board.legal_moves:
+            raise ValueError(f"Illegal move for position: {move.uci()}")
+        if self._future is not None:
+            self.reject("superseded")
+        self._move = move
+        self._token = self.registry.issue(self.game_id, len(self.analyzer.board.move_stack))
+        self._future = Future()
+        self._started = monotonic()
+        self._finished = None
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(move, self._token, self._future),
+            name="candidate-analysis",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def confirm(self, timeout_s: float | None = None) -> MoveAnalysis:
+        """Wait for the pending analysis, play the move and return its analysis.
+
+        Raises `AnalysisCancelled` if the candidate was cancelled meanwhile,
+        and re-raises any engine error from the search. On timeout the search
+        is cancelled and `TimeoutError` is raised; the board is unchanged.
+        """
+        if self._future is None or self._move is None or self._token is None:
+            raise RuntimeError("No candidate move is pending.")
+        confirmed_at = monotonic()
+        future, move, token = self._future, self._move, self._token
+        try:
+            analysis, after = future.result(timeout_s)
+        except FutureTimeoutError:
+            token.cancel("confirm_timeout")
+            raise TimeoutError(f"Analysis of {move.uci()} did not finish in time.") from None
+        finally:
+            self._join()
+            self._clear()
+            self.registry.release(token)
+        self.analyzer.apply(move, after)
+
+        finished = self._finished or monotonic()
+        saved = max(0.0, min(confirmed_at, finished) - self._started)
+        self.confirmed += 1
+        self.saved_s += saved
+        LOGGER.info(
+            "candidate_overlap",
+            extra={
+                "move_uci": move.uci(),
+                "analysis_ms": round((finished - self._started) * 1000.0, 1),
+                "saved_ms": round(saved * 1000.0, 1),
+            },
+        )
+        return analysis
+
+    def reject(self, reason: str = "move_rejected") -> None:
+        """Cancel the pending candidate's search; the board is left unchanged."""
+        if self._token is not None:
+            self._token.cancel(reason)
+            self.registry.release(self._token)
+            self.rejected += 1
+        self._join()
+        self._clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "confirmed": self.confirmed,
+            "rejected": self.rejected,
+            "saved_ms": round(self.saved_s * 1000.0, 1),
+        }
+
+    def _join(self) -> None:
+        """Wait for the search thread; a cancelled search stops within one engine reply."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _clear(self) -> None:
+        self._move = None
+        self._token = None
+        self._future = None
+
+    def _run(
+        self,
+        move: chess.Move,
+        token: CancelToken,
+        future: Future[tuple[MoveAnalysis, PositionEval | None]],
+    ) -> None:
+        try:
+            result = self.analyzer.classify(move, token)
+        except BaseException as exc:
+            future.set_exception(exc)
+            return
+        if future is self._future:
+            self._finished = monotonic()
+        future.set_result(result)
@@ -0,0 +1,287 @@
+"""Long-lived, thread-safe pool of Stockfish processes."""
+
+from __future__ import annotations
+
+import atexit
+from contextlib import contextmanager
+import os
+from pathlib import Path
+import threading
+from time import monotonic
+from typing import Callable, Iterator, Mapping, Union
+
+import chess.engine
+
+from chess_punisher.observability import get_logger
+
+from .lean_uci import LeanUciEngine
+from .supervisor import SupervisedEngine
+
+LOGGER = get_logger(__name__)
+
+EngineCommand = Union[str, list[str]]
+EngineFactory = Callable[[], chess.engine.SimpleEngine]
+
+DRIVERS = ("simple", "lean")
+
+
+def _stockfish_path() -> Path:
+    return Path(os.getenv("STOCKFISH_PATH", "./bin/stockfish"))
+
+
+def _require_stockfish_binary() -> Path:
+    path = _stockfish_path()
+    if not path.exists():
+        raise RuntimeError(
+            f"Stockfish binary not found at '{path}'. "
+            "Set STOCKFISH_PATH or place the binary at ./bin/stockfish."
+        )
+    return path
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _uci_options(available: Mapping[str, object], threads: int, hash_mb: int) -> dict[str, int]:
+    options: dict[str, int] = {}
+    if "Threads" in available:
+        options["Threads"] = threads
+    if "Hash" in available:
+        options["Hash"] = hash_mb
+    return options
+
+
+def _quit_engine(engine: chess.engine.SimpleEngine) -> None:
+    try:
+        engine.quit()
+    except Exception:
+        LOGGER.warning("engine_quit_failed", exc_info=True)
+
+
+class EnginePool:
+    """Keeps up to `size` engines alive and hands them out one caller at a time.
+
+    Engines are spawned lazily on first checkout, configured once with the
+    `Threads`/`Hash` options and reused afterwards so searches start with a warm
+    process, and timed searches with a warm hash table. Engines idle for
+    longer than `idle_timeout_s` are shut down by a background reaper; set it
+    to 0 to keep them forever. With `supervise`, each engine is wrapped in a
+    `SupervisedEngine` that restarts crashed or hung processes and re-warms
+    their hash. `driver` picks the UCI
+    client: "simple" (python-chess `SimpleEngine`) or "lean" (`LeanUciEngine`).
+    """
+
+    def __init__(
+        self,
+        command: EngineCommand | None = None,
+        size: int = 1,
+        threads: int = 1,
+        hash_mb: int = 16,
+        idle_timeout_s: float = 60.0,
+        factory: EngineFactory | None = None,
+        supervise: bool = False,
+        driver: str = "simple",
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        if driver not in DRIVERS:
+            raise ValueError(f"driver must be one of {', '.join(DRIVERS)}")
+        self.command = command
+        self.size = size
+        self.threads = threads
+        self.hash_mb = hash_mb
+        self.idle_timeout_s = idle_timeout_s
+        self.supervise = supervise
+        self.driver = driver
+        self._base_factory = factory or self._spawn
+        self._factory = self._spawn_supervised if supervise else self._base_factory
+        self._cond = threading.Condition()
+        self._idle: list[tuple[chess.engine.SimpleEngine, float]] = []
+        self._live = 0
+        self._closed = False
+        self._reaper: threading.Thread | None = None
+        self._reaper_stop = threading.Event()
+
+    @classmethod
+    def from_env(cls) -> "EnginePool":
+        return cls(
+            size=max(1, _env_int("ENGINE_POOL_SIZE", 1)),
+            threads=max(1, _env_int("STOCKFISH_THREADS", 1)),
+            hash_mb=max(1, _env_int("STOCKFISH_HASH_MB", 16)),
+            idle_timeout_s=_env_float("ENGINE_IDLE_TIMEOUT_S", 60.0),
+            supervise=_env_int("ENGINE_SUPERVISE", 1) > 0,
+            driver=os.getenv("ENGINE_DRIVER", "simple"),
+        )
+
+    @property
+    def live_count(self) -> int:
+        with self._cond:
+            return self._live
+
+    @property
+    def idle_count(self) -> int:
+        with self._cond:
+            return len(self._idle)
+
+    def _spawn(self) -> chess.engine.SimpleEngine:
+        command = self.command
+        if command is None:
+            command = str(_require_stockfish_binary())
+        engine: chess.engine.SimpleEngine
+        if self.driver == "lean":
+            engine = LeanUciEngine.popen_uci(command)  # type: ignore[assignment]
+        else:
+            engine = chess.engine.SimpleEngine.popen_uci(command)
+        options = _uci_options(engine.options, self.threads, self.hash_mb)
+        if options:
+            engine.configure(options)
+        LOGGER.info("engine_spawned", extra={"engine_options": options, "driver": self.driver})
+        return engine
+
+    def _spawn_supervised(self) -> chess.engine.SimpleEngine:
+        return SupervisedEngine(self._base_factory)  # type: ignore[return-value]
+
+    def checkout(self, timeout_s: float | None = None) -> chess.engine.SimpleEngine:
+        """Borrow an engine, spawning one if the pool is below its size."""
+        deadline = None if timeout_s is None else monotonic() + timeout_s
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Engine pool is closed.")
+                if self._idle:
+                    # LIFO so the most recently used (hottest hash) engine is reused.
+                    engine, _ = self._idle.pop()
+                    return engine
+                if self._live < self.size:
+                    self._live += 1
+                    break
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Timed out waiting for an idle engine.")
+                self._cond.wait(remaining)
+
+        try:
+            engine = self._factory()
+        except BaseException:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+        self._ensure_reaper()
+        return engine
+
+    def checkin(self, engine: chess.engine.SimpleEngine, discard: bool = False) -> None:
+        """Return a borrowed engine; `discard` shuts it down instead of reusing it."""
+        with self._cond:
+            if discard or self._closed:
+                self._live -= 1
+                release = True
+            else:
+                self._idle.append((engine, monotonic()))
+                release = False
+            self._cond.notify()
+        if release:
+            _quit_engine(engine)
+
+    @contextmanager
+    def engine(self, timeout_s: float | None = None) -> Iterator[chess.engine.SimpleEngine]:
+        engine = self.checkout(timeout_s=timeout_s)
+        discard = False
+        try:
+            yield engine
+        except (chess.engine.EngineError, TimeoutError):
+            # A crashed or wedged engine must not be handed to the next caller.
+            discard = True
+            raise
+        finally:
+            self.checkin(engine, discard=discard)
+
+    def shutdown_idle(self, max_idle_s: float | None = None) -> int:
+        """Quit engines idle for at least `max_idle_s` (default: idle timeout)."""
+        threshold = self.idle_timeout_s if max_idle_s is None else max_idle_s
+        now = monotonic()
+        with self._cond:
+            expired = [engine for engine, since in self._idle if now - since >= threshold]
+            self._idle = [entry for entry in self._idle if now - entry[1] < threshold]
+            self._live -= len(expired)
+            self._cond.notify_all()
+        for engine in expired:
+            _quit_engine(engine)
+        if expired:
+            LOGGER.info("engine_idle_shutdown", extra={"count": len(expired)})
+        return len(expired)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = [engine for engine, _ in self._idle]
+            self._idle.clear()
+            self._live -= len(idle)
+            self._cond.notify_all()
+        self._reaper_stop.set()
+        for engine in idle:
+            _quit_engine(engine)
+
+    def _ensure_reaper(self) -> None:
+        if self.idle_timeout_s <= 0:
+            return
+        with self._cond:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(
+                target=self._reap_loop, name="engine-pool-reaper", daemon=True
+            )
+        self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        interval = max(0.01, self.idle_timeout_s / 2)
+        while not self._reaper_stop.wait(interval):
+            self.shutdown_idle()
+
+
+_DEFAULT_POOL: EnginePool | None = None
+_DEFAULT_POOL_LOCK = threading.Lock()
+
+
+def get_default_pool() -> EnginePool:
+    """Return the process-wide pool, creating it from env settings on first use."""
+    global _DEFAULT_POOL
+    with _DEFAULT_POOL_LOCK:
+        if _DEFAULT_POOL is None:
+            _DEFAULT_POOL = EnginePool.from_env()
+        return _DEFAULT_POOL
+
+
+def set_default_pool(pool: EnginePool | None) -> EnginePool | None:
+    """Replace the process-wide pool and return the previous one (not closed)."""
+    global _DEFAULT_POOL
+    with _DEFAULT_POOL_LOCK:
+        previous = _DEFAULT_POOL
+        _DEFAULT_POOL = pool
+        return previous
+
+
+def shutdown_default_pool() -> None:
+    pool = set_default_pool(None)
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(shutdown_default_pool)
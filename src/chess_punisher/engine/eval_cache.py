@@ -0,0 +1,240 @@
+"""Bounded in-memory LRU cache of engine evaluations keyed by Zobrist hash."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import os
+import threading
+from typing import Any, Callable, Hashable, Iterable, Protocol
+
+import chess
+import chess.engine
+import chess.polyglot
+
+from chess_punisher.observability import get_logger
+
+LOGGER = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class PositionEval:
+    score: chess.engine.PovScore
+    best_move: chess.Move | None
+
+    @classmethod
+    def from_info(cls, info: chess.engine.InfoDict) -> "PositionEval":
+        score = info.get("score")
+        if score is None:
+            raise RuntimeError("Engine analysis did not return a score.")
+        pv = info.get("pv") or []
+        return cls(score=score, best_move=pv[0] if pv else None)
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_entries: int
+    backing_hits: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": self.size,
+            "max_entries": self.max_entries,
+            "hit_rate": round(self.hit_rate, 4),
+            "backing_hits": self.backing_hits,
+        }
+
+
+def limit_key(limit: chess.engine.Limit) -> tuple[Hashable, ...]:
+    """Reduce a search limit to the fields that change the engine's answer."""
+    return (limit.time, limit.depth, limit.nodes, limit.mate)
+
+
+def runs_cold(limit: chess.engine.Limit) -> bool:
+    """Whether searches under `limit` start from a cleared hash: depth/node limits do."""
+    return limit.time is None
+
+
+def search_options(limit: chess.engine.Limit) -> dict[str, Any]:
+    """Keyword arguments for `analyse`/`analysis`/`play` under `limit`.
+
+    A depth/node-limited search on a warm hash can return a different score
+    than on a cold one, so those limits always run cold: a fresh `game` makes
+    the engine receive `ucinewgame` first, and the result matches the cache
+    key on any engine. Only timed searches, which are load-dependent anyway,
+    benefit from a reused engine's warm hash.
+    """
+    if runs_cold(limit):
+        return {"game": object()}
+    return {}
+
+
+def position_key(board: chess.Board, limit: chess.engine.Limit) -> tuple[Hashable, ...]:
+    return (chess.polyglot.zobrist_hash(board), *limit_key(limit))
+
+
+class EvalStore(Protocol):
+    """Second-level store keyed by `position_key`, e.g. `SqliteEvalStore`."""
+
+    def get(self, key: tuple[Hashable, ...]) -> PositionEval | None: ...
+
+    def put(self, key: tuple[Hashable, ...], value: PositionEval) -> None: ...
+
+
+class EvalCache:
+    """Thread-safe LRU map of (position, search limit) -> PositionEval.
+
+    A `max_entries` of 0 disables caching while keeping the counters working.
+    With a `backing` store, misses are looked up there (counted as
+    `backing_hits` when found) and every `put` is written through to it.
+    Memory hits are reported to the store's `touch(key)`, if it has one, so
+    the store's eviction sees which positions are actually in use.
+    """
+
+    def __init__(self, max_entries: int = 4096, backing: EvalStore | None = None) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must be >= 0")
+        self.max_entries = max_entries
+        self.backing = backing
+        self._touch: Callable[[tuple[Hashable, ...]], None] | None = getattr(
+            backing, "touch", None
+        )
+        self._entries: OrderedDict[tuple[Hashable, ...], PositionEval] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._backing_hits = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, board: chess.Board, limit: chess.engine.Limit) -> PositionEval | None:
+        key = position_key(board, limit)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+        if value is not None:
+            if self._touch is not None:
+                self._touch(key)
+            return value
+        if self.backing is None:
+            return None
+        value = self.backing.get(key)
+        if value is not None:
+            with self._lock:
+                self._backing_hits += 1
+                self._insert(key, value)
+        return value
+
+    def peek(self, board: chess.Board, limit: chess.engine.Limit) -> PositionEval | None:
+        """Look up the in-memory level only, leaving counters, LRU order and store alone.
+
+        For background work such as speculation, whose lookups are not
+        user-facing and should not skew the hit rate.
+        """
+        with self._lock:
+            return self._entries.get(position_key(board, limit))
+
+    def put(self, board: chess.Board, limit: chess.engine.Limit, value: PositionEval) -> None:
+        if self.max_entries == 0 and self.backing is None:
+            return
+        key = position_key(board, limit)
+        with self._lock:
+            self._insert(key, value)
+        if self.backing is not None:
+            self.backing.put(key, value)
+
+    def preload(self, items: Iterable[tuple[tuple[Hashable, ...], PositionEval]]) -> int:
+        """Fill the in-memory level from `(position_key, value)` pairs, e.g.
+        `SqliteEvalStore.items()`; stops once full. Returns the count loaded."""
+        loaded = 0
+        with self._lock:
+            for key, value in items:
+                if len(self._entries) >= self.max_entries:
+                    break
+                if key not in self._entries:
+                    self._entries[key] = value
+                    # Items arrive most recent first, so older ones go to the LRU end.
+                    self._entries.move_to_end(key, last=False)
+                    loaded += 1
+        return loaded
+
+    def _insert(self, key: tuple[Hashable, ...], value: PositionEval) -> None:
+        if self.max_entries == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                backing_hits=self._backing_hits,
+            )
+
+
+_DEFAULT_CACHE: EvalCache | None = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def get_default_cache() -> EvalCache:
+    """Return the process-wide cache sized by ENGINE_CACHE_SIZE (default 4096).
+
+    When EVAL_STORE_PATH is set, a `SqliteEvalStore` of at most
+    EVAL_STORE_SIZE rows (default 200000) backs the cache and its most recent
+    rows are preloaded.
+    """
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            max_entries = max(0, _env_int("ENGINE_CACHE_SIZE", 4096))
+            store_path = os.getenv("EVAL_STORE_PATH")
+            if not store_path:
+                _DEFAULT_CACHE = EvalCache(max_entries=max_entries)
+                return _DEFAULT_CACHE
+
+            from .eval_store import SqliteEvalStore
+
+            store = SqliteEvalStore(
+                store_path, max_entries=max(1, _env_int("EVAL_STORE_SIZE", 200_000))
+            )
+            _DEFAULT_CACHE = EvalCache(max_entries=max_entries, backing=store)
+            loaded = _DEFAULT_CACHE.preload(store.items(limit=max_entries))
+            LOGGER.info("eval_store_preloaded", extra={"path": store_path, "entries": loaded})
+        return _DEFAULT_CACHE
@@ -0,0 +1,190 @@
+"""Memory-mapped database of precomputed evaluations keyed by Zobrist hash."""
+
+from __future__ import annotations
+
+import math
+import mmap
+import os
+from pathlib import Path
+import struct
+import threading
+from typing import Hashable, Iterable
+
+import chess
+import chess.engine
+import chess.polyglot
+
+from chess_punisher.observability import get_logger
+
+from .eval_cache import PositionEval, limit_key
+
+LOGGER = get_logger(__name__)
+
+MAGIC = b"CPEVALDB"
+FORMAT_VERSION = 1
+
+# magic, version, limit time (NaN = unset), depth, nodes, mate (-1 = unset), record count.
+_HEADER = struct.Struct("<8sH6xdqqqQ")
+# zobrist, score from the side to move, best move, flags.
+_RECORD = struct.Struct("<QiHH")
+_FLAG_MATE = 1
+
+
+def _encode_limit(limit: chess.engine.Limit) -> tuple[float, int, int, int]:
+    time, depth, nodes, mate = limit_key(limit)
+    return (
+        math.nan if time is None else float(time),
+        -1 if depth is None else int(depth),
+        -1 if nodes is None else int(nodes),
+        -1 if mate is None else int(mate),
+    )
+
+
+def _decode_limit(time: float, depth: int, nodes: int, mate: int) -> chess.engine.Limit:
+    return chess.engine.Limit(
+        time=None if math.isnan(time) else time,
+        depth=None if depth < 0 else depth,
+        nodes=None if nodes < 0 else nodes,
+        mate=None if mate < 0 else mate,
+    )
+
+
+def _encode_move(move: chess.Move | None) -> int:
+    if move is None:
+        return 0
+    promotion = move.promotion or 0
+    return move.to_square | (move.from_square << 6) | (promotion << 12)
+
+
+def _decode_move(raw: int) -> chess.Move | None:
+    if raw == 0:
+        return None
+    promotion = raw >> 12
+    return chess.Move((raw >> 6) & 0x3F, raw & 0x3F, promotion=promotion or None)
+
+
+def _encode_record(key: int, value: PositionEval, turn: chess.Color) -> bytes:
+    score = value.score.pov(turn)
+    mate = score.mate()
+    if mate is not None:
+        return _RECORD.pack(key, mate, _encode_move(value.best_move), _FLAG_MATE)
+    return _RECORD.pack(key, score.score(), _encode_move(value.best_move), 0)
+
+
+class EvalDatabase:
+    """Read-only, memory-mapped table of `PositionEval`s for one search limit.
+
+    The file is a fixed header followed by fixed-size records sorted by
+    Zobrist hash, so `get()` is a binary search over the mapping and pages
+    are only read on demand. Scores are stored from the side to move.
+    Files with another format version are rejected on open, as are files
+    built for a different limit than `expected_limit` when one is given.
+    `lookup()` only answers for the limit the database was built with.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        expected_limit: chess.engine.Limit | None = None,
+    ) -> None:
+        self.path = str(path)
+        with open(self.path, "rb") as handle:
+            header = handle.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"{self.path}: truncated eval database header")
+            magic, version, time, depth, nodes, mate, count = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path}: not an eval database")
+            if version != FORMAT_VERSION:
+                raise ValueError(
+                    f"{self.path}: eval database version {version}, expected {FORMAT_VERSION}"
+                )
+            size = os.fstat(handle.fileno()).st_size
+            if size != _HEADER.size + count * _RECORD.size:
+                raise ValueError(f"{self.path}: eval database size does not match its header")
+            self.limit = _decode_limit(time, depth, nodes, mate)
+            self._limit_key: tuple[Hashable, ...] = limit_key(self.limit)
+            if expected_limit is not None and limit_key(expected_limit) != self._limit_key:
+                raise ValueError(
+                    f"{self.path}: eval database built for {self.limit}, expected {expected_limit}"
+                )
+            self._count = count
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if count else None
+        self._warned_limits: set[tuple[Hashable, ...]] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def matches(self, limit: chess.engine.Limit) -> bool:
+        return limit_key(limit) == self._limit_key
+
+    def get(self, board: chess.Board) -> PositionEval | None:
+        """Stored evaluation of `board` regardless of search limit, or None."""
+        if self._map is None:
+            return None
+        key = chess.polyglot.zobrist_hash(board)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = _HEADER.size + mid * _RECORD.size
+            found, value, raw_move, flags = _RECORD.unpack_from(self._map, offset)
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid
+            else:
+                relative: chess.engine.Score = (
+                    chess.engine.Mate(value) if flags & _FLAG_MATE else chess.engine.Cp(value)
+                )
+                return PositionEval(
+                    score=chess.engine.PovScore(relative, board.turn),
+                    best_move=_decode_move(raw_move),
+                )
+        return None
+
+    def lookup(self, board: chess.Board, limit: chess.engine.Limit) -> PositionEval | None:
+        """Like `get()`, but misses when `limit` is not the database's limit."""
+        if not self.matches(limit):
+            key = limit_key(limit)
+            with self._lock:
+                warn = key not in self._warned_limits
+                self._warned_limits.add(key)
+            if warn:
+                LOGGER.warning(
+                    "eval_db_limit_mismatch",
+                    extra={"path": self.path, "db_limit": str(self.limit), "limit": str(limit)},
+                )
+            return None
+        return self.get(board)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def write_eval_db(
+    path: str | Path,
+    limit: chess.engine.Limit,
+    entries: Iterable[tuple[chess.Board, PositionEval]],
+) -> int:
+    """Write `entries` as a sorted eval database; returns the record count.
+
+    Duplicate positions keep the first entry. The file is written next to
+    `path` and renamed over it, so readers never see a partial database.
+    """
+    records: dict[int, bytes] = {}
+    for board, value in entries:
+        key = chess.polyglot.zobrist_hash(board)
+        if key not in records:
+            records[key] = _encode_record(key, value, board.turn)
+    target = Path(path)
+    partial = target.with_name(target.name + ".partial")
+    with open(partial, "wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, FORMAT_VERSION, *_encode_limit(limit), len(records)))
+        for key in sorted(records):
+            handle.write(records[key])
+    os.replace(partial, target)
+    return len(records)
+
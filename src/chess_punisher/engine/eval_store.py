@@ -0,0 +1,254 @@
+"""Persistent SQLite store of engine evaluations shared across processes."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from typing import Hashable, Iterator, cast
+
+import chess
+import chess.engine
+
+from chess_punisher.observability import get_logger
+
+from .eval_cache import PositionEval
+
+LOGGER = get_logger(__name__)
+
+# Bumped when the table layout changes; the store is a cache, so older files are reset.
+SCHEMA_VERSION = 2
+
+# `used` is a store-wide counter, larger is more recently written or read.
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS evals (
+        zobrist INTEGER NOT NULL,
+        search_limit TEXT NOT NULL,
+        turn INTEGER NOT NULL,
+        cp INTEGER,
+        mate INTEGER,
+        best_move TEXT,
+        used INTEGER NOT NULL,
+        PRIMARY KEY (zobrist, search_limit)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS evals_used ON evals (used)",
+)
+
+def _signed(zobrist: int) -> int:
+    # SQLite integers are signed 64-bit.
+    return zobrist - (1 << 64) if zobrist >= 1 << 63 else zobrist
+
+
+def _unsigned(zobrist: int) -> int:
+    return zobrist + (1 << 64) if zobrist < 0 else zobrist
+
+
+def _key_columns(key: tuple[Hashable, ...]) -> tuple[int, str]:
+    return _signed(cast(int, key[0])), json.dumps(key[1:])
+
+
+def _row_to_eval(
+    turn: int, cp: int | None, mate: int | None, best_move: str | None
+) -> PositionEval:
+    relative: chess.engine.Score = (
+        chess.engine.Mate(mate) if mate is not None else chess.engine.Cp(cp or 0)
+    )
+    return PositionEval(
+        score=chess.engine.PovScore(relative, bool(turn)),
+        best_move=chess.Move.from_uci(best_move) if best_move else None,
+    )
+
+
+class SqliteEvalStore:
+    """Durable map of `position_key` -> `PositionEval` in a SQLite WAL database.
+
+    WAL mode lets any number of processes read while one writes, so batch
+    workers, the harness and the app can share one file. Each thread gets its
+    own connection. The store holds at most `max_entries` rows; every
+    `evict_every` writes the least recently used rows beyond that are
+    deleted. Writes and reads (`get` hits and `touch`) stamp rows from one
+    counter, so rows written together keep their order. Reads only update an
+    in-memory list; it is written back by the next `put_many`, `evict` or
+    `close`, so a read never waits for another process's write lock.
+
+    It is meant as the second level behind `EvalCache` (see its `backing`
+    argument), which also touches rows it serves from memory; `items()`
+    feeds `EvalCache.preload()` at startup.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 200_000,
+        evict_every: int = 256,
+        busy_timeout_s: float = 5.0,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_every = max(1, evict_every)
+        self.busy_timeout_s = busy_timeout_s
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+        self._writes = 0
+        # Rows read since the last write, least recent first (a dict keeps one entry per row).
+        self._touched: dict[tuple[int, str], None] = {}
+        self.evictions = 0
+        self._migrate(self._conn())
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version == SCHEMA_VERSION:
+                return
+            (existing,) = conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'evals'"
+            ).fetchone()
+            conn.execute("DROP TABLE IF EXISTS evals")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        if existing:
+            LOGGER.warning(
+                "eval_store_schema_reset",
+                extra={"path": self.path, "from_version": version, "to_version": SCHEMA_VERSION},
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=self.busy_timeout_s, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def __len__(self) -> int:
+        (count,) = self._conn().execute("SELECT COUNT(*) FROM evals").fetchone()
+        return int(count)
+
+    def get(self, key: tuple[Hashable, ...]) -> PositionEval | None:
+        columns = _key_columns(key)
+        row = self._conn().execute(
+            "SELECT turn, cp, mate, best_move FROM evals WHERE zobrist = ? AND search_limit = ?",
+            columns,
+        ).fetchone()
+        if row is None:
+            return None
+        self._touch(columns)
+        return _row_to_eval(*row)
+
+    def touch(self, key: tuple[Hashable, ...]) -> None:
+        """Mark a row as read without fetching it (e.g. a hit in the memory level)."""
+        self._touch(_key_columns(key))
+
+    def _touch(self, columns: tuple[int, str]) -> None:
+        with self._lock:
+            self._touched.pop(columns, None)
+            self._touched[columns] = None
+
+    def _flush_touches(self, conn: sqlite3.Connection) -> None:
+        """Stamp pending reads; call inside a write transaction."""
+        with self._lock:
+            touched, self._touched = list(self._touched), {}
+        if not touched:
+            return
+        base = self._next_stamp(conn)
+        conn.executemany(
+            "UPDATE evals SET used = ? WHERE zobrist = ? AND search_limit = ?",
+            [(base + offset, *columns) for offset, columns in enumerate(touched)],
+        )
+
+    @staticmethod
+    def _next_stamp(conn: sqlite3.Connection) -> int:
+        (latest,) = conn.execute("SELECT COALESCE(MAX(used), 0) FROM evals").fetchone()
+        return int(latest) + 1
+
+    def put(self, key: tuple[Hashable, ...], value: PositionEval) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, items: list[tuple[tuple[Hashable, ...], PositionEval]]) -> None:
+        """Insert or replace several evaluations in one transaction."""
+        if not items:
+            return
+        rows = []
+        for key, value in items:
+            relative = value.score.relative
+            rows.append(
+                (
+                    *_key_columns(key),
+                    int(value.score.turn),
+                    relative.score(),
+                    relative.mate(),
+                    value.best_move.uci() if value.best_move else None,
+                )
+            )
+        conn = self._conn()
+        with conn:
+            # IMMEDIATE takes the write lock first, so the stamps are unique across processes.
+            conn.execute("BEGIN IMMEDIATE")
+            self._flush_touches(conn)
+            base = self._next_stamp(conn)
+            conn.executemany(
+                "INSERT OR REPLACE INTO evals VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*row, base + offset) for offset, row in enumerate(rows)],
+            )
+        with self._lock:
+            before = self._writes
+            self._writes += len(rows)
+            due = self._writes // self.evict_every > before // self.evict_every
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete the least recently used rows beyond `max_entries`; returns how many."""
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._flush_touches(conn)
+            deleted = conn.execute(
+                "DELETE FROM evals WHERE (zobrist, search_limit) IN ("
+                " SELECT zobrist, search_limit FROM evals ORDER BY used DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        if deleted > 0:
+            self.evictions += deleted
+            LOGGER.info("eval_store_evicted", extra={"path": self.path, "rows": deleted})
+        return max(0, deleted)
+
+    def items(
+        self, limit: int | None = None
+    ) -> Iterator[tuple[tuple[Hashable, ...], PositionEval]]:
+        """Yield `(position_key, PositionEval)`, most recently used first."""
+        rows = self._conn().execute(
+            "SELECT zobrist, search_limit, turn, cp, mate, best_move FROM evals"
+            " ORDER BY used DESC LIMIT ?",
+            (-1 if limit is None else limit,),
+        )
+        for zobrist, search_limit, turn, cp, mate, best_move in rows:
+            key = (_unsigned(zobrist), *json.loads(search_limit))
+            yield key, _row_to_eval(turn, cp, mate, best_move)
+
+    def close(self) -> None:
+        with self._lock:
+            pending = bool(self._touched)
+        if pending:
+            conn = self._conn()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._flush_touches(conn)
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
@@ -0,0 +1,264 @@
+"""Scriptable fake UCI engine for tests and load benchmarks.
+
+Run it as `python -m chess_punisher.engine.fake_uci` (or through
+`fake_engine_command()`) anywhere a Stockfish command is accepted, e.g.
+`SimpleEngine.popen_uci(fake_engine_command("--latency-ms", "5"))` or
+`EnginePool(command=fake_engine_command())`.
+
+Position scores come from a JSON table and otherwise from a seeded hash of the
+position, so results are deterministic. Scores in the table are centipawns
+from White's point of view, keyed by full FEN, EPD or board FEN. The best move
+(and the MultiPV lines) are the legal moves whose resulting positions score
+best for the side to move.
+
+This module imports nothing but python-chess so it starts quickly and can run
+as a plain script.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from typing import Iterator, Sequence, TextIO
+
+import chess
+import chess.polyglot
+
+ENGINE_NAME = "chess-punisher fake UCI"
+
+
+def fake_engine_command(*args: str) -> list[str]:
+    """Command line that starts this fake engine, e.g. for `popen_uci`."""
+    return [sys.executable, __file__, *args]
+
+
+class FakeScorer:
+    """Deterministic White-point-of-view scores for positions."""
+
+    def __init__(
+        self,
+        table: dict[str, int] | None = None,
+        seed: int = 0,
+        spread_cp: int = 300,
+    ) -> None:
+        self.table = table or {}
+        self.seed = seed
+        self.spread_cp = spread_cp
+
+    def white_cp(self, board: chess.Board) -> int:
+        if self.table:
+            for key in (board.fen(), board.epd(), board.board_fen()):
+                if key in self.table:
+                    return self.table[key]
+        rng = random.Random(chess.polyglot.zobrist_hash(board) ^ self.seed)
+        return rng.randint(-self.spread_cp, self.spread_cp)
+
+    def pov_cp(self, board: chess.Board) -> int:
+        cp = self.white_cp(board)
+        return cp if board.turn == chess.WHITE else -cp
+
+    def ranked_moves(self, board: chess.Board) -> list[tuple[chess.Move, int]]:
+        """Legal moves with their side-to-move score, best first."""
+        ranked = []
+        for move in board.legal_moves:
+            board.push(move)
+            try:
+                ranked.append((move, -self.pov_cp(board)))
+            finally:
+                board.pop()
+        ranked.sort(key=lambda item: (-item[1], item[0].uci()))
+        return ranked
+
+
+class FakeUciEngine:
+    """Line-oriented UCI loop; `go` runs on a worker thread so `stop` works."""
+
+    def __init__(
+        self,
+        scorer: FakeScorer,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        max_depth: int = 8,
+        nps: int = 1_000_000,
+        output: TextIO = sys.stdout,
+    ) -> None:
+        self.scorer = scorer
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.max_depth = max_depth
+        self.nps = nps
+        self.output = output
+        self.multipv = 1
+        self.board = chess.Board()
+        self._rng = random.Random(scorer.seed)
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._search: threading.Thread | None = None
+
+    def send(self, line: str) -> None:
+        with self._write_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self, lines: Iterator[str]) -> None:
+        for raw in lines:
+            if not self.handle(raw.strip()):
+                break
+        self._finish_search()
+
+    def handle(self, line: str) -> bool:
+        """Process one command; returns False on `quit`."""
+        if not line:
+            return True
+        command, _, rest = line.partition(" ")
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send("id author chess-punisher")
+            self.send("option name Hash type spin default 16 min 1 max 33554432")
+            self.send("option name Threads type spin default 1 min 1 max 1024")
+            self.send("option name MultiPV type spin default 1 min 1 max 500")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self._set_option(rest)
+        elif command == "ucinewgame":
+            self.board = chess.Board()
+        elif command == "position":
+            self._set_position(rest.split())
+        elif command == "go":
+            self._finish_search()
+            self._stop.clear()
+            self._search = threading.Thread(
+                target=self._go, args=(rest.split(),), name="fake-uci-search", daemon=True
+            )
+            self._search.start()
+        elif command == "stop":
+            self._finish_search()
+        elif command == "quit":
+            return False
+        return True
+
+    def _finish_search(self) -> None:
+        self._stop.set()
+        if self._search is not None:
+            self._search.join()
+            self._search = None
+
+    def _set_option(self, rest: str) -> None:
+        tokens = rest.split()
+        if "name" not in tokens or "value" not in tokens:
+            return
+        name = " ".join(tokens[tokens.index("name") + 1 : tokens.index("value")])
+        value = " ".join(tokens[tokens.index("value") + 1 :])
+        if name == "MultiPV":
+            self.multipv = max(1, int(value))
+
+    def _set_position(self, tokens: list[str]) -> None:
+        if not tokens:
+            return
+        moves: list[str] = []
+        if "moves" in tokens:
+            split = tokens.index("moves")
+            tokens, moves = tokens[:split], tokens[split + 1 :]
+        if tokens[0] == "startpos":
+            board = chess.Board()
+        else:
+            board = chess.Board(" ".join(tokens[1:7]))
+        for uci in moves:
+            board.push_uci(uci)
+        self.board = board
+
+    def _go(self, tokens: list[str]) -> None:
+        params: dict[str, int] = {}
+        infinite = "infinite" in tokens
+        for key, value in zip(tokens, tokens[1:]):
+            if key in ("depth", "nodes", "movetime") and value.lstrip("-").isdigit():
+                params[key] = int(value)
+
+        board = self.board.copy(stack=False)
+        depth = min(params.get("depth", self.max_depth), self.max_depth) or 1
+        latency_s = max(0.0, self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000.0
+        if "movetime" in params:
+            latency_s = min(latency_s, params["movetime"] / 1000.0)
+        ranked = self.scorer.ranked_moves(board)
+
+        started = time.monotonic()
+        completed = 0
+        for current in range(1, depth + 1):
+            if self._stop.wait(latency_s / depth):
+                break
+            completed = current
+            self._send_info(board, ranked, current, started, params.get("nodes"))
+        while infinite and not self._stop.wait(max(latency_s, 0.01)):
+            completed += 1
+            self._send_info(board, ranked, completed, started, params.get("nodes"))
+        if completed == 0:
+            self._send_info(board, ranked, 1, started, params.get("nodes"))
+
+        best = ranked[0][0].uci() if ranked else "(none)"
+        self.send(f"bestmove {best}")
+
+    def _send_info(
+        self,
+        board: chess.Board,
+        ranked: Sequence[tuple[chess.Move, int]],
+        depth: int,
+        started: float,
+        nodes_limit: int | None,
+    ) -> None:
+        elapsed = time.monotonic() - started
+        nodes = max(depth, int(self.nps * elapsed))
+        if nodes_limit is not None:
+            nodes = min(nodes, nodes_limit)
+        stats = f"depth {depth} seldepth {depth} nodes {nodes} nps {self.nps} "
+        stats += f"time {int(elapsed * 1000)}"
+        if not ranked:
+            score = "mate 0" if board.is_checkmate() else "cp 0"
+            self.send(f"info {stats} score {score}")
+            return
+        # The position's own score comes from the scorer; extra lines from their child scores.
+        for index, (move, score) in enumerate(ranked[: self.multipv], start=1):
+            cp = self.scorer.pov_cp(board) if index == 1 else score
+            self.send(f"info {stats} multipv {index} score cp {cp} pv {move.uci()}")
+
+
+def _load_table(path: str | None) -> dict[str, int]:
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return {key: int(value) for key, value in json.load(handle).items()}
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fake UCI engine for tests and benchmarks.")
+    parser.add_argument("--table", help="JSON file mapping FEN/EPD/board FEN to White cp")
+    parser.add_argument("--seed", type=int, default=0, help="seed for positions not in table")
+    parser.add_argument("--spread-cp", type=int, default=300, help="range of seeded scores")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="search time per go")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra random latency")
+    parser.add_argument("--max-depth", type=int, default=8, help="depth reported by a full go")
+    parser.add_argument("--nps", type=int, default=1_000_000, help="reported nodes/sec")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    scorer = FakeScorer(_load_table(args.table), seed=args.seed, spread_cp=args.spread_cp)
+    engine = FakeUciEngine(
+        scorer,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        max_depth=max(1, args.max_depth),
+        nps=args.nps,
+    )
+    engine.run(iter(sys.stdin.readline, ""))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
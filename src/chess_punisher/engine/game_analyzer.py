@@ -0,0 +1,151 @@
+"""Stateful per-game move analysis that carries engine results across plies."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import chess
+import chess.engine
+
+from .blunder_classifier import Thresholds, _score_to_cp, classify_cp_loss
+from .cancellation import CancelToken
+from .engine_pool import EnginePool
+from .eval_cache import EvalCache, PositionEval
+from .shortcuts import PositionOracle, get_default_oracle
+from .stockfish_engine import build_limit, evaluate_position
+
+
+@dataclass(frozen=True)
+class MoveAnalysis:
+    move_uci: str
+    mover: str
+    bestmove_uci: str
+    eval_before_cp: int | None
+    eval_after_cp: int | None
+    loss_cp: int
+    classification: str
+    source: str = "engine"
+
+
+class GameAnalyzer:
+    """Classifies the moves of one game with at most one new search per ply.
+
+    A single search of a position yields both its score and its best move
+    (the first move of the principal variation). The search of the position
+    after ply N is therefore reused as the "before" search of ply N+1, and
+    positions already in the eval cache cost no search at all. Book moves
+    cost no search either: they are reported as "OK" with `source="book"` and
+    unknown evals are left as None.
+    """
+
+    def __init__(
+        self,
+        engine: chess.engine.SimpleEngine | None = None,
+        time_limit_s: float = 0.1,
+        thresholds: Thresholds = Thresholds(),
+        board: chess.Board | None = None,
+        pool: EnginePool | None = None,
+        cache: EvalCache | None = None,
+        depth: int | None = None,
+        nodes: int | None = None,
+        oracle: PositionOracle | None = None,
+    ) -> None:
+        self.engine = engine
+        self.limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+        self.thresholds = thresholds
+        self.pool = pool
+        self.cache = cache
+        self.oracle = oracle if oracle is not None else get_default_oracle()
+        self.board = board.copy() if board is not None else chess.Board()
+        self._current: PositionEval | None = None
+
+    def reset(self, board: chess.Board | None = None) -> None:
+        self.board = board.copy() if board is not None else chess.Board()
+        self._current = None
+
+    def current_eval(self, token: CancelToken | None = None) -> PositionEval:
+        """Return the evaluation of the current position, searching if unknown."""
+        if self._current is None:
+            self._current = self._search(self.board, token)
+        return self._current
+
+    def push(self, move: chess.Move, token: CancelToken | None = None) -> MoveAnalysis:
+        """Classify `move` for the side to move, then play it on the board.
+
+        Cancelling `token` aborts the searches with `AnalysisCancelled` and
+        leaves the board unchanged.
+        """
+        analysis, after = self.classify(move, token)
+        self.apply(move, after)
+        return analysis
+
+    def classify(
+        self, move: chess.Move, token: CancelToken | None = None
+    ) -> tuple[MoveAnalysis, PositionEval | None]:
+        """Classify `move` without playing it.
+
+        Returns the analysis and the evaluation of the resulting position
+        (None for book moves), to be handed to `apply` once the move is
+        confirmed.
+        """
+        if move not in self.board.legal_moves:
+            raise ValueError(f"Illegal move for position: {move.uci()}")
+        mover = "white" if self.board.turn == chess.WHITE else "black"
+        if self.oracle.is_book_move(self.board, move):
+            return self._classify_book_move(move, mover), None
+
+        before = self.current_eval(token)
+        if before.best_move is None:
+            raise RuntimeError("Engine did not return a move.")
+
+        mover_color = self.board.turn
+        board_after = self.board.copy(stack=False)
+        board_after.push(move)
+        after = self._search(board_after, token)
+
+        before_cp = _score_to_cp(before.score.pov(mover_color))
+        after_cp = _score_to_cp(after.score.pov(mover_color))
+        loss = max(0, before_cp - after_cp)
+        analysis = MoveAnalysis(
+            move_uci=move.uci(),
+            mover=mover,
+            bestmove_uci=before.best_move.uci(),
+            eval_before_cp=before_cp,
+            eval_after_cp=after_cp,
+            loss_cp=loss,
+            classification=classify_cp_loss(loss, thresholds=self.thresholds),
+        )
+        return analysis, after
+
+    def apply(self, move: chess.Move, after: PositionEval | None) -> None:
+        """Play `move` and adopt `after` (from `classify`) as the new position's eval."""
+        self.board.push(move)
+        # After a book move the next position is only searched if play leaves the book.
+        self._current = after
+
+    def _classify_book_move(self, move: chess.Move, mover: str) -> MoveAnalysis:
+        before_cp = None
+        if self._current is not None:
+            before_cp = _score_to_cp(self._current.score.pov(self.board.turn))
+        book_best = self.oracle.book_move(self.board) or move
+        return MoveAnalysis(
+            move_uci=move.uci(),
+            mover=mover,
+            bestmove_uci=book_best.uci(),
+            eval_before_cp=before_cp,
+            eval_after_cp=None,
+            loss_cp=0,
+            classification=classify_cp_loss(0, thresholds=self.thresholds),
+            source="book",
+        )
+
+    def _search(self, board: chess.Board, token: CancelToken | None = None) -> PositionEval:
+        return evaluate_position(
+            board,
+            self.limit,
+            engine=self.engine,
+            pool=self.pool,
+            cache=self.cache,
+            oracle=self.oracle,
+            token=token,
+        )
@@ -0,0 +1,325 @@
+"""Low-overhead UCI driver that talks to the engine over pipes on the calling thread."""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+from typing import Any, Iterator, Mapping, Union
+
+import chess
+import chess.engine
+
+from chess_punisher.observability import get_logger
+
+LOGGER = get_logger(__name__)
+
+LeanCommand = Union[str, list[str]]
+
+
+def _position_command(board: chess.Board) -> str:
+    root = board.root()
+    fen = root.fen()
+    command = "position startpos" if fen == chess.STARTING_FEN else f"position fen {fen}"
+    if board.move_stack:
+        command += " moves " + " ".join(move.uci() for move in board.move_stack)
+    return command
+
+
+def _go_command(limit: chess.engine.Limit | None) -> str:
+    parts = ["go"]
+    if limit is not None:
+        if limit.time is not None:
+            parts.append(f"movetime {max(1, round(limit.time * 1000))}")
+        if limit.depth is not None:
+            parts.append(f"depth {limit.depth}")
+        if limit.nodes is not None:
+            parts.append(f"nodes {limit.nodes}")
+        if limit.mate is not None:
+            parts.append(f"mate {limit.mate}")
+    if len(parts) == 1:
+        parts.append("infinite")
+    return " ".join(parts)
+
+
+def parse_info(line: str, turn: chess.Color) -> chess.engine.InfoDict:
+    """Parse the `depth`, `score` (with its bound flag) and `pv` of one UCI `info` line."""
+    info: chess.engine.InfoDict = {}
+    tokens = line.split()
+    i = 1
+    while i < len(tokens):
+        token = tokens[i]
+        if token == "depth":
+            info["depth"] = int(tokens[i + 1])
+            i += 2
+        elif token == "score":
+            value = int(tokens[i + 2])
+            relative: chess.engine.Score = (
+                chess.engine.Mate(value) if tokens[i + 1] == "mate" else chess.engine.Cp(value)
+            )
+            info["score"] = chess.engine.PovScore(relative, turn)
+            i += 3
+        elif token in ("lowerbound", "upperbound"):
+            info[token] = True  # type: ignore[literal-required]
+            i += 1
+        elif token == "pv":
+            info["pv"] = [chess.Move.from_uci(uci) for uci in tokens[i + 1 :]]
+            break
+        elif token == "string":
+            break
+        else:
+            i += 1
+    return info
+
+
+def _exact_score_line(line: str) -> int | None:
+    """MultiPV index (1-based) of an `info` line with an exact score, else None."""
+    if not line.startswith("info") or " score " not in line or "bound" in line:
+        return None
+    tokens = line.split()
+    if "multipv" in tokens:
+        return int(tokens[tokens.index("multipv") + 1])
+    return 1
+
+
+class LeanAnalysis:
+    """One running search; mirrors the parts of `SimpleAnalysisResult` we use.
+
+    Only the last exact-score line of each MultiPV index is kept and parsed
+    on demand (`info`, `multipv`). Iterating yields every `info` line as it
+    arrives, like python-chess, for callers that stop on provisional scores.
+    """
+
+    def __init__(self, engine: "LeanUciEngine", turn: chess.Color) -> None:
+        self._engine = engine
+        self._turn = turn
+        self._lines: dict[int, str] = {}
+        self._info: chess.engine.InfoDict | None = None
+        self._best: chess.engine.BestMove | None = None
+        self._stream: Iterator[chess.engine.InfoDict] | None = None
+
+    @property
+    def info(self) -> chess.engine.InfoDict:
+        if self._info is None:
+            line = self._lines.get(1)
+            self._info = {} if line is None else parse_info(line, self._turn)
+        return self._info
+
+    @property
+    def multipv(self) -> list[chess.engine.InfoDict]:
+        return [parse_info(self._lines[index], self._turn) for index in sorted(self._lines)]
+
+    def stop(self) -> None:
+        """Ask the engine to finish now; may be called from another thread."""
+        if self._best is None:
+            self._engine._send("stop")
+
+    def __iter__(self) -> "LeanAnalysis":
+        return self
+
+    def __next__(self) -> chess.engine.InfoDict:
+        if self._stream is None:
+            self._stream = self._info_stream()
+        return next(self._stream)
+
+    def _info_stream(self) -> Iterator[chess.engine.InfoDict]:
+        if self._best is not None:
+            return
+        for line in self._engine._lines_until("bestmove"):
+            if line.startswith("info") and " string " not in line:
+                self._record(line)
+                yield parse_info(line, self._turn)
+        self._finish()
+
+    def wait(self) -> chess.engine.BestMove:
+        """Read engine output until `bestmove`."""
+        if self._best is not None:
+            return self._best
+        for line in self._engine._lines_until("bestmove"):
+            self._record(line)
+        return self._finish()
+
+    def _record(self, line: str) -> None:
+        index = _exact_score_line(line)
+        if index is not None:
+            self._lines[index] = line
+            if index == 1:
+                self._info = None
+
+    def _finish(self) -> chess.engine.BestMove:
+        tokens = self._engine._last_line.split()
+        move = None
+        if len(tokens) > 1 and tokens[1] != "(none)":
+            move = chess.Move.from_uci(tokens[1])
+        ponder = chess.Move.from_uci(tokens[3]) if len(tokens) > 3 else None
+        self._best = chess.engine.BestMove(move, ponder)
+        return self._best
+
+    def __enter__(self) -> "LeanAnalysis":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._best is None:
+            try:
+                self.stop()
+                self.wait()
+            except chess.engine.EngineError:
+                pass
+
+
+class LeanUciEngine:
+    """Minimal UCI client for short, latency-sensitive searches.
+
+    `SimpleEngine` sends every call through an asyncio loop thread and parses
+    every `info` line into python-chess objects. This driver writes commands
+    to the engine's stdin and reads its stdout directly on the calling
+    thread, and only parses the last scored `info` line of each MultiPV line
+    (score, depth, pv) and `bestmove`, unless the caller iterates the search.
+
+    It implements the subset of the `SimpleEngine` API that the engine layer
+    uses (`analyse` and `analysis` with `multipv`, iteration over an
+    analysis, `play`, `configure`, `ping`, `quit`, `close`, `options`), so it
+    can be passed as `engine=` to the helpers or chosen for a pool with
+    `EnginePool(driver="lean")`. Like a pool checkout, it serves one caller
+    at a time. A dead process raises
+    `chess.engine.EngineTerminatedError`, as `SimpleEngine` does.
+    """
+
+    def __init__(self, process: subprocess.Popen[str]) -> None:
+        self._process = process
+        self._write_lock = threading.Lock()
+        self._last_line = ""
+        self._multipv = 1
+        self._game: object = None
+        self._first_game = True
+        self.options: dict[str, str] = {}
+        self.id: dict[str, str] = {}
+        self._send("uci")
+        for line in self._lines_until("uciok"):
+            if line.startswith("option name "):
+                name, _, spec = line[len("option name ") :].partition(" type ")
+                self.options[name] = spec
+            elif line.startswith("id "):
+                key, _, value = line[len("id ") :].partition(" ")
+                self.id[key] = value
+        self.ping()
+
+    @classmethod
+    def popen_uci(cls, command: LeanCommand) -> "LeanUciEngine":
+        args = [command] if isinstance(command, str) else list(command)
+        process = subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        return cls(process)
+
+    def _send(self, line: str) -> None:
+        stdin = self._process.stdin
+        assert stdin is not None
+        with self._write_lock:
+            try:
+                stdin.write(line + "\n")
+                stdin.flush()
+            except (OSError, ValueError) as exc:
+                raise chess.engine.EngineTerminatedError(
+                    f"engine process died unexpectedly (exit code: {self._process.poll()})"
+                ) from exc
+
+    def _readline(self) -> str:
+        stdout = self._process.stdout
+        assert stdout is not None
+        try:
+            line = stdout.readline()
+        except (OSError, ValueError):
+            line = ""
+        if not line:
+            raise chess.engine.EngineTerminatedError(
+                f"engine process died unexpectedly (exit code: {self._process.poll()})"
+            )
+        return line.rstrip("\r\n")
+
+    def _lines_until(self, prefix: str) -> Iterator[str]:
+        """Yield output lines up to the first starting with `prefix` (kept in `_last_line`)."""
+        while True:
+            line = self._readline()
+            if line.startswith(prefix):
+                self._last_line = line
+                return
+            yield line
+
+    def configure(self, options: Mapping[str, Any]) -> None:
+        for name, value in options.items():
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            self._send(f"setoption name {name} value {value}")
+
+    def ping(self) -> None:
+        self._send("isready")
+        for _ in self._lines_until("readyok"):
+            pass
+
+    def analysis(
+        self,
+        board: chess.Board,
+        limit: chess.engine.Limit | None = None,
+        multipv: int | None = None,
+        game: object = None,
+        **kwargs: Any,
+    ) -> LeanAnalysis:
+        if kwargs:
+            raise ValueError(f"LeanUciEngine does not support {', '.join(sorted(kwargs))}")
+        if self._first_game or game != self._game:
+            # Same rule as python-chess: a new game clears the engine's hash.
+            self._send("ucinewgame")
+            self.ping()
+            self._first_game = False
+            self._game = game
+        lines = max(1, multipv or 1)
+        if lines != self._multipv:
+            if "MultiPV" not in self.options:
+                raise chess.engine.EngineError("engine does not support MultiPV")
+            self._send(f"setoption name MultiPV value {lines}")
+            self._multipv = lines
+        self._send(_position_command(board))
+        self._send(_go_command(limit))
+        return LeanAnalysis(self, board.turn)
+
+    def analyse(
+        self,
+        board: chess.Board,
+        limit: chess.engine.Limit,
+        multipv: int | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Like `SimpleEngine.analyse`: a list of InfoDicts when `multipv` is given."""
+        analysis = self.analysis(board, limit, multipv, **kwargs)
+        analysis.wait()
+        return analysis.info if multipv is None else analysis.multipv
+
+    def play(
+        self, board: chess.Board, limit: chess.engine.Limit, **kwargs: Any
+    ) -> chess.engine.PlayResult:
+        analysis = self.analysis(board, limit, **kwargs)
+        best = analysis.wait()
+        return chess.engine.PlayResult(best.move, best.ponder, analysis.info)
+
+    def quit(self, timeout_s: float = 2.0) -> None:
+        try:
+            self._send("quit")
+            self._process.wait(timeout_s)
+        except (chess.engine.EngineError, subprocess.TimeoutExpired):
+            pass
+        self.close()
+
+    def close(self) -> None:
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        for stream in (self._process.stdin, self._process.stdout):
+            if stream is not None:
+                try:
+                    stream.close()
+                except OSError:
+                    LOGGER.debug("engine_pipe_close_failed", exc_info=True)
@@ -0,0 +1,229 @@
+"""Deadline- and priority-aware scheduling of analysis jobs over an engine pool."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import threading
+from time import monotonic
+from typing import Any
+
+import chess
+import chess.engine
+
+from chess_punisher.observability import get_logger
+
+from .blunder_classifier import compute_cp_loss_for_mover
+from .engine_pool import EnginePool, get_default_pool
+from .eval_cache import EvalCache
+from .stockfish_engine import build_limit, evaluate_position
+
+LOGGER = get_logger(__name__)
+
+
+@dataclass(order=True)
+class _Job:
+    sort_key: tuple[int, float, int]
+    board: chess.Board = field(compare=False)
+    move: chess.Move | None = field(compare=False)
+    deadline: float = field(compare=False)
+    time_limit_s: float = field(compare=False)
+    depth: int | None = field(compare=False)
+    nodes: int | None = field(compare=False)
+    future: Future[Any] = field(compare=False)
+
+
+@dataclass(frozen=True)
+class SchedulerStats:
+    queue_depth: int
+    submitted: int
+    completed: int
+    failed: int
+    missed_deadlines: int
+    budget_cuts: int
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "queue_depth": self.queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "missed_deadlines": self.missed_deadlines,
+            "budget_cuts": self.budget_cuts,
+        }
+
+
+class AnalysisScheduler:
+    """Runs analysis jobs on a bounded pool, most urgent first.
+
+    Jobs are ordered by priority (higher first), then by earliest deadline.
+    One worker thread per pool engine takes the most urgent job. Its time
+    budget is the requested `time_limit_s`, shrunk to fit the time left
+    before the deadline and divided by the backlog per worker when the queue
+    is deeper than the pool. A cut budget is rounded down to `time_limit_s`
+    halved one or more times, so cut searches share a few eval-cache keys
+    instead of caching one-off limits. It never drops below `min_time_s`.
+    Jobs submitted with a `depth` or `nodes` budget run with that fixed limit
+    and are never cut. Jobs that finish after their deadline still return
+    their result but are counted in `missed_deadlines`.
+
+    `submit(board)` resolves to a `PositionEval`; `submit(board, move)`
+    resolves to `(loss_cp, classification)` like `compute_cp_loss_for_mover`.
+    """
+
+    def __init__(
+        self,
+        pool: EnginePool | None = None,
+        cache: EvalCache | None = None,
+        min_time_s: float = 0.01,
+        workers: int | None = None,
+    ) -> None:
+        self.pool = pool or get_default_pool()
+        self.cache = cache
+        self.min_time_s = min_time_s
+        self.workers = workers or self.pool.size
+        self._cond = threading.Condition()
+        self._queue: list[_Job] = []
+        self._seq = itertools.count()
+        self._closed = False
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._missed = 0
+        self._budget_cuts = 0
+        self._threads = [
+            threading.Thread(target=self._work, name=f"analysis-scheduler-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        board: chess.Board,
+        move: chess.Move | None = None,
+        deadline_s: float = 1.0,
+        priority: int = 0,
+        time_limit_s: float = 0.1,
+        depth: int | None = None,
+        nodes: int | None = None,
+    ) -> Future[Any]:
+        """Queue a job that should finish within `deadline_s` seconds from now."""
+        if move is not None and move not in board.legal_moves:
+            raise ValueError(f"Illegal move for position: {move.uci()}")
+        build_limit(time_limit_s, depth=depth, nodes=nodes)  # Reject bad budgets up front.
+        future: Future[Any] = Future()
+        deadline = monotonic() + deadline_s
+        job = _Job(
+            sort_key=(-priority, deadline, next(self._seq)),
+            board=board.copy(stack=False),
+            move=move,
+            deadline=deadline,
+            time_limit_s=time_limit_s,
+            depth=depth,
+            nodes=nodes,
+            future=future,
+        )
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Scheduler is closed.")
+            heapq.heappush(self._queue, job)
+            self._submitted += 1
+            self._cond.notify()
+        return future
+
+    @property
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def stats(self) -> SchedulerStats:
+        with self._cond:
+            return SchedulerStats(
+                queue_depth=len(self._queue),
+                submitted=self._submitted,
+                completed=self._completed,
+                failed=self._failed,
+                missed_deadlines=self._missed,
+                budget_cuts=self._budget_cuts,
+            )
+
+    def close(self, cancel_pending: bool = True) -> None:
+        with self._cond:
+            self._closed = True
+            pending, self._queue = (self._queue, []) if cancel_pending else ([], self._queue)
+            self._cond.notify_all()
+        for job in pending:
+            job.future.cancel()
+        for thread in self._threads:
+            thread.join()
+
+    def _budget(self, job: _Job, backlog: int) -> float:
+        if job.depth is not None or job.nodes is not None:
+            return job.time_limit_s
+        budget = job.time_limit_s
+        # Two searches per classification share the remaining time.
+        searches = 2 if job.move is not None else 1
+        remaining = job.deadline - monotonic()
+        budget = min(budget, remaining / searches)
+        if backlog > self.workers:
+            budget = min(budget, job.time_limit_s * self.workers / backlog)
+        step = job.time_limit_s
+        while step > budget and step > self.min_time_s:
+            step /= 2
+        return max(self.min_time_s, step)
+
+    def _next_job(self) -> tuple[_Job, int] | None:
+        with self._cond:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            job = heapq.heappop(self._queue)
+            return job, len(self._queue) + 1
+
+    def _work(self) -> None:
+        while True:
+            item = self._next_job()
+            if item is None:
+                return
+            job, backlog = item
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            budget = self._budget(job, backlog)
+            try:
+                result = self._run(job, budget)
+            except BaseException as exc:
+                with self._cond:
+                    self._failed += 1
+                job.future.set_exception(exc)
+                continue
+
+            missed = monotonic() > job.deadline
+            with self._cond:
+                self._completed += 1
+                self._missed += missed
+                self._budget_cuts += budget < job.time_limit_s
+            if missed:
+                LOGGER.warning(
+                    "analysis_deadline_missed",
+                    extra={"budget_s": round(budget, 4), "queue_depth": backlog - 1},
+                )
+            job.future.set_result(result)
+
+    def _run(self, job: _Job, budget: float) -> Any:
+        with self.pool.engine() as engine:
+            if job.move is None:
+                limit = build_limit(budget, depth=job.depth, nodes=job.nodes)
+                return evaluate_position(job.board, limit, engine=engine, cache=self.cache)
+            return compute_cp_loss_for_mover(
+                job.board,
+                job.move,
+                engine,
+                time_limit_s=budget,
+                cache=self.cache,
+                depth=job.depth,
+                nodes=job.nodes,
+            )
@@ -0,0 +1,16 @@
+"""Score conversion shared by the classifier and the engine helpers."""
+
+from __future__ import annotations
+
+from typing import Union
+
+import chess.engine
+
+MATE_CP_EQUIVALENT = 10_000
+ScoreLike = Union[int, chess.engine.Score]
+
+
+def _score_to_cp(score: ScoreLike) -> int:
+    if isinstance(score, int):
+        return score
+    return score.score(mate_score=MATE_CP_EQUIVALENT)
@@ -0,0 +1,209 @@
+"""Opening-book, tablebase and eval-database answers that avoid an engine search."""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Protocol
+
+import chess
+import chess.engine
+import chess.polyglot
+import chess.syzygy
+
+from chess_punisher.observability import get_logger
+
+from .eval_cache import PositionEval
+from .eval_db import EvalDatabase
+from .scores import MATE_CP_EQUIVALENT
+
+LOGGER = get_logger(__name__)
+
+SOURCES = ("book", "tablebase", "database", "engine")
+
+# Cursed wins / blessed losses are draws under the fifty-move rule.
+_WDL_CP = {2: MATE_CP_EQUIVALENT, 1: 0, 0: 0, -1: 0, -2: -MATE_CP_EQUIVALENT}
+
+
+class BookReader(Protocol):
+    def find_all(self, board: chess.Board) -> Any: ...
+
+    def close(self) -> None: ...
+
+
+class TablebaseProber(Protocol):
+    def probe_wdl(self, board: chess.Board) -> int: ...
+
+    def probe_dtz(self, board: chess.Board) -> int: ...
+
+    def close(self) -> None: ...
+
+
+class PositionOracle:
+    """Answers from a Polyglot book, Syzygy tablebases and a precomputed eval
+    database, with per-source counters.
+
+    Book moves are treated as never punishable. Positions with at most
+    `max_tablebase_pieces` pieces and no castling rights are scored exactly
+    from WDL tables (win/loss map to +/-MATE_CP_EQUIVALENT) with the best move
+    chosen by WDL then DTZ. Other positions are looked up in `eval_db` when
+    the search limit matches the one it was built with. Any source may be
+    missing.
+    """
+
+    def __init__(
+        self,
+        book: BookReader | None = None,
+        tablebase: TablebaseProber | None = None,
+        max_tablebase_pieces: int = 7,
+        eval_db: EvalDatabase | None = None,
+    ) -> None:
+        self.book = book
+        self.tablebase = tablebase
+        self.eval_db = eval_db
+        self.max_tablebase_pieces = max_tablebase_pieces
+        self._lock = threading.Lock()
+        self._counts = {source: 0 for source in SOURCES}
+
+    @classmethod
+    def from_paths(
+        cls,
+        book_path: str | None = None,
+        syzygy_path: str | None = None,
+        eval_db_path: str | None = None,
+    ) -> "PositionOracle":
+        book = None
+        tablebase = None
+        eval_db = None
+        if book_path:
+            try:
+                book = chess.polyglot.open_reader(book_path)
+            except OSError as exc:
+                LOGGER.warning(
+                    "opening_book_unavailable", extra={"path": book_path, "error": str(exc)}
+                )
+        if syzygy_path:
+            tablebase = chess.syzygy.Tablebase()
+            loaded = 0
+            for directory in syzygy_path.split(os.pathsep):
+                try:
+                    tablebase.add_directory(directory)
+                except OSError as exc:
+                    LOGGER.warning(
+                        "tablebase_unavailable", extra={"path": directory, "error": str(exc)}
+                    )
+                else:
+                    loaded += 1
+            if not loaded:
+                tablebase.close()
+                tablebase = None
+        if eval_db_path:
+            try:
+                eval_db = EvalDatabase(eval_db_path)
+            except (OSError, ValueError) as exc:
+                LOGGER.warning(
+                    "eval_db_unavailable", extra={"path": eval_db_path, "error": str(exc)}
+                )
+        return cls(book=book, tablebase=tablebase, eval_db=eval_db)
+
+    @classmethod
+    def from_env(cls) -> "PositionOracle":
+        return cls.from_paths(
+            os.getenv("POLYGLOT_BOOK_PATH"), os.getenv("SYZYGY_PATH"), os.getenv("EVAL_DB_PATH")
+        )
+
+    def record(self, source: str) -> None:
+        with self._lock:
+            self._counts[source] += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def book_move(self, board: chess.Board) -> chess.Move | None:
+        """Return the highest-weighted book move for `board`, if any."""
+        if self.book is None:
+            return None
+        for entry in self.book.find_all(board):
+            return entry.move
+        return None
+
+    def is_book_move(self, board: chess.Board, move: chess.Move) -> bool:
+        if self.book is None:
+            return False
+        hit = any(entry.move == move for entry in self.book.find_all(board))
+        if hit:
+            self.record("book")
+        return hit
+
+    def probe_position(
+        self, board: chess.Board, limit: chess.engine.Limit | None = None
+    ) -> PositionEval | None:
+        """Tablebase or eval-database evaluation of `board`, or None when not covered.
+
+        The eval database is only consulted for the `limit` it was built with.
+        """
+        exact = self._probe_tablebase(board)
+        if exact is not None or self.eval_db is None or limit is None:
+            return exact
+        stored = self.eval_db.lookup(board, limit)
+        if stored is not None:
+            self.record("database")
+        return stored
+
+    def _probe_tablebase(self, board: chess.Board) -> PositionEval | None:
+        if self.tablebase is None:
+            return None
+        if board.castling_rights or chess.popcount(board.occupied) > self.max_tablebase_pieces:
+            return None
+        try:
+            wdl = self.tablebase.probe_wdl(board)
+            best_move = self._tablebase_best_move(board)
+        except KeyError:
+            return None
+        self.record("tablebase")
+        return PositionEval(
+            score=chess.engine.PovScore(chess.engine.Cp(_WDL_CP[wdl]), board.turn),
+            best_move=best_move,
+        )
+
+    def _tablebase_best_move(self, board: chess.Board) -> chess.Move | None:
+        probe = board.copy(stack=False)
+        best: chess.Move | None = None
+        best_key: tuple[int, int] | None = None
+        for move in board.legal_moves:
+            probe.push(move)
+            try:
+                if probe.is_checkmate():
+                    return move
+                wdl = -self.tablebase.probe_wdl(probe)
+                dtz = abs(self.tablebase.probe_dtz(probe))
+            finally:
+                probe.pop()
+            # Win quickly, lose slowly.
+            key = (wdl, -dtz if wdl > 0 else dtz)
+            if best_key is None or key > best_key:
+                best, best_key = move, key
+        return best
+
+    def close(self) -> None:
+        if self.book is not None:
+            self.book.close()
+        if self.tablebase is not None:
+            self.tablebase.close()
+        if self.eval_db is not None:
+            self.eval_db.close()
+
+
+_DEFAULT_ORACLE: PositionOracle | None = None
+_DEFAULT_ORACLE_LOCK = threading.Lock()
+
+
+def get_default_oracle() -> PositionOracle:
+    """Return the process-wide oracle built from POLYGLOT_BOOK_PATH, SYZYGY_PATH
+    and EVAL_DB_PATH."""
+    global _DEFAULT_ORACLE
+    with _DEFAULT_ORACLE_LOCK:
+        if _DEFAULT_ORACLE is None:
+            _DEFAULT_ORACLE = PositionOracle.from_env()
+        return _DEFAULT_ORACLE
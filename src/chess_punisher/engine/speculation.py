@@ -0,0 +1,164 @@
+"""Background pre-analysis of the opponent's likely replies."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import chess
+import chess.engine
+
+from chess_punisher.observability import get_logger
+
+from .engine_pool import EnginePool, get_default_pool
+from .eval_cache import EvalCache, PositionEval, get_default_cache
+from .stockfish_engine import build_limit, search_options
+
+LOGGER = get_logger(__name__)
+
+
+class Speculator:
+    """Fills the eval cache with the positions after the top-N candidate replies.
+
+    Call `start(board)` once a move is confirmed; the worker finds the top
+    `top_n` replies with one MultiPV search and then searches each resulting
+    position with the same limit the classifier uses, so classifying one of
+    those replies is a cache lookup. `preempt(move)` stops the in-flight
+    search (partial results are discarded) and records whether `move` had
+    been speculated.
+    """
+
+    def __init__(
+        self,
+        top_n: int = 3,
+        time_limit_s: float = 0.1,
+        pool: EnginePool | None = None,
+        cache: EvalCache | None = None,
+        depth: int | None = None,
+        nodes: int | None = None,
+    ) -> None:
+        if top_n < 1:
+            raise ValueError("top_n must be >= 1")
+        self.top_n = top_n
+        self.limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+        self.pool = pool
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.preempted = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._active: Any = None
+        self._ready: set[chess.Move] = set()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "preempted": self.preempted,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+    def start(self, board: chess.Board) -> None:
+        """Begin speculating on replies to the side to move in `board`."""
+        self.preempt()
+        if board.is_game_over():
+            return
+        self._stop.clear()
+        with self._lock:
+            self._ready = set()
+        self._thread = threading.Thread(
+            target=self._run, args=(board.copy(stack=False),), name="speculator", daemon=True
+        )
+        self._thread.start()
+
+    def preempt(self, move: chess.Move | None = None) -> bool:
+        """Stop speculating; with `move`, count a hit if its position is cached."""
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            with self._lock:
+                active = self._active
+                if thread.is_alive():
+                    self.preempted += 1
+            if active is not None:
+                active.stop()
+            thread.join()
+            self._thread = None
+
+        if move is None:
+            return False
+        with self._lock:
+            hit = move in self._ready
+            self._ready = set()
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        LOGGER.info(
+            "speculation_preempted",
+            extra={"move_uci": move.uci(), "hit": hit, "hit_rate": round(self.hit_rate, 4)},
+        )
+        return hit
+
+    def wait(self, timeout_s: float | None = None) -> bool:
+        """Block until the current speculation finishes; True if it did."""
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout_s)
+        return not thread.is_alive()
+
+    def close(self) -> None:
+        self.preempt()
+
+    def _run(self, board: chess.Board) -> None:
+        cache = self.cache if self.cache is not None else get_default_cache()
+        limit = self.limit
+        try:
+            with (self.pool or get_default_pool()).engine() as engine:
+                lines = self._search(engine, board, limit, multipv=self.top_n)
+                if lines is None:
+                    return
+                candidates = [info["pv"][0] for info in lines if info.get("pv")]
+                for reply in candidates:
+                    board_after = board.copy(stack=False)
+                    board_after.push(reply)
+                    if cache.peek(board_after, limit) is None:
+                        result = self._search(engine, board_after, limit)
+                        if result is None:
+                            return
+                        cache.put(board_after, limit, PositionEval.from_info(result[0]))
+                    with self._lock:
+                        self._ready.add(reply)
+        except Exception:
+            LOGGER.warning("speculation_failed", exc_info=True)
+
+    def _search(
+        self,
+        engine: chess.engine.SimpleEngine,
+        board: chess.Board,
+        limit: chess.engine.Limit,
+        multipv: int | None = None,
+    ) -> list[chess.engine.InfoDict] | None:
+        with self._lock:
+            if self._stop.is_set():
+                return None
+            self._active = engine.analysis(
+                board, limit, multipv=multipv, **search_options(limit)
+            )
+        try:
+            self._active.wait()
+        finally:
+            with self._lock:
+                active, self._active = self._active, None
+        if self._stop.is_set():
+            # The search was cut short; its scores are not comparable.
+            return None
+        return list(active.multipv)
@@ -2,25 +2,33 @@
 
 from __future__ import annotations
 
-import os
-from pathlib import Path
-
 import chess
 import chess.engine
 
+from .cancellation import CancelToken
+from .engine_pool import EnginePool, get_default_pool
+from .eval_cache import EvalCache, PositionEval, get_default_cache, search_options
+from .shortcuts import PositionOracle, get_default_oracle
 
-def _stockfish_path() -> Path:
-    return Path(os.getenv("STOCKFISH_PATH", "./bin/stockfish"))
 
+def build_limit(
+    time_limit_s: float = 0.1,
+    depth: int | None = None,
+    nodes: int | None = None,
+) -> chess.engine.Limit:
+    """Build a search limit; a depth or node budget replaces the time budget.
 
-def _require_stockfish_binary() -> Path:
-    path = _stockfish_path()
-    if not path.exists():
-        raise RuntimeError(
-            f"Stockfish binary not found at '{path}'. "
-            "Set STOCKFISH_PATH or place the binary at ./bin/stockfish."
-        )
-    return path
+    Depth/node limits make results independent of machine load, so they are
+    reproducible across hosts and make eval-cache keys stable. Searches under
+    them run on a cleared hash (see `search_options`).
+    """
+    if depth is not None and depth <= 0:
+        raise ValueError("depth must be > 0")
+    if nodes is not None and nodes <= 0:
+        raise ValueError("nodes must be > 0")
+    if depth is None and nodes is None:
+        return chess.engine.Limit(time=time_limit_s)
+    return chess.engine.Limit(depth=depth, nodes=nodes)
 
 
 def _format_score(score: chess.engine.PovScore) -> str:
@@ -39,31 +47,133 @@ def _format_score(score: chess.engine.PovScore) -> str:
     return f"{cp / 100.0:+.2f} pawns (White)"
 
 
-def analyse_board(board: chess.Board, time_limit_s: float = 0.1) -> chess.engine.PovScore:
+def _search(
+    engine: chess.engine.SimpleEngine,
+    board: chess.Board,
+    limit: chess.engine.Limit,
+    token: CancelToken | None,
+) -> chess.engine.InfoDict:
+    if token is None:
+        return engine.analyse(board, limit, **search_options(limit))
+    token.raise_if_cancelled()
+    with engine.analysis(board, limit, **search_options(limit)) as analysis:
+        unregister = token.on_cancel(analysis.stop)
+        try:
+            analysis.wait()
+        finally:
+            unregister()
+        info = dict(analysis.info)
+    token.raise_if_cancelled()
+    return info
+
+
+def evaluate_position(
+    board: chess.Board,
+    limit: chess.engine.Limit,
+    engine: chess.engine.SimpleEngine | None = None,
+    pool: EnginePool | None = None,
+    cache: EvalCache | None = None,
+    oracle: PositionOracle | None = None,
+    token: CancelToken | None = None,
+) -> PositionEval:
+    """Return score and best move for a position, consulting the eval cache first.
+
+    Positions covered by the Syzygy tablebases or the eval database of
+    `oracle` (default: the shared oracle) are answered without a search.
+    Searches run on `engine` when given (a `SimpleEngine` or `LeanUciEngine`),
+    otherwise on an engine borrowed from `pool` (default: the shared pool).
+    Cancelling `token` stops the search and raises `AnalysisCancelled`; the
+    partial result is not cached.
+    """
+    cache = cache if cache is not None else get_default_cache()
+    cached = cache.get(board, limit)
+    if cached is not None:
+        return cached
+
+    oracle = oracle if oracle is not None else get_default_oracle()
+    exact = oracle.probe_position(board, limit)
+    if exact is not None:
+        cache.put(board, limit, exact)
+        return exact
+
+    oracle.record("engine")
+
+    if engine is not None:
+        info = _search(engine, board, limit, token)
+    else:
+        with (pool or get_default_pool()).engine() as pooled:
+            info = _search(pooled, board, limit, token)
+
+    result = PositionEval.from_info(info)
+    cache.put(board, limit, result)
+    return result
+
+
+def analyse_board(
+    board: chess.Board,
+    time_limit_s: float = 0.1,
+    pool: EnginePool | None = None,
+    cache: EvalCache | None = None,
+    depth: int | None = None,
+    nodes: int | None = None,
+) -> chess.engine.PovScore:
     """Analyze a board and return the engine score object."""
-    stockfish_path = _require_stockfish_binary()
-    with chess.engine.SimpleEngine.popen_uci(str(stockfish_path)) as engine:
-        info = engine.analyse(board, chess.engine.Limit(time=time_limit_s))
+    limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+    return evaluate_position(board, limit, pool=pool, cache=cache).score
 
-    score = info.get("score")
-    if score is None:
-        raise RuntimeError("Engine analysis did not return a score.")
-    return score
 
-
-def best_move(board: chess.Board, time_limit_s: float = 0.1) -> chess.Move:
+def best_move(
+    board: chess.Board,
+    time_limit_s: float = 0.1,
+    pool: EnginePool | None = None,
+    depth: int | None = None,
+    nodes: int | None = None,
+) -> chess.Move:
     """Return the engine's best move for the current position."""
-    stockfish_path = _require_stockfish_binary()
-    with chess.engine.SimpleEngine.popen_uci(str(stockfish_path)) as engine:
-        result = engine.play(board, chess.engine.Limit(time=time_limit_s))
+    limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+    with (pool or get_default_pool()).engine() as engine:
+        result = engine.play(board, limit, **search_options(limit))
 
     if result.move is None:
         raise RuntimeError("Engine did not return a move.")
     return result.move
 
 
-def analyse_fen(fen: str, time_limit_s: float = 0.1) -> str:
+def analyse_fen(
+    fen: str,
+    time_limit_s: float = 0.1,
+    pool: EnginePool | None = None,
+    depth: int | None = None,
+    nodes: int | None = None,
+) -> str:
     """Analyze a FEN with Stockfish and return a readable evaluation string."""
     board = chess.Board(fen)
-    score = analyse_board(board, time_limit_s=time_limit_s)
+    score = analyse_board(board, time_limit_s=time_limit_s, pool=pool, depth=depth, nodes=nodes)
     return _format_score(score)
+
+
+def measure_nps(
+    boards: list[chess.Board],
+    time_limit_s: float = 1.0,
+    engine: chess.engine.SimpleEngine | None = None,
+    pool: EnginePool | None = None,
+) -> float:
+    """Return the engine's average nodes/second over timed searches of `boards`.
+
+    Multiply by a time budget to get the equivalent `nodes` budget for this host.
+    """
+    if engine is None:
+        with (pool or get_default_pool()).engine() as pooled:
+            return measure_nps(boards, time_limit_s, engine=pooled)
+
+    total_nodes = 0
+    total_time_s = 0.0
+    for board in boards:
+        info = engine.analyse(board, chess.engine.Limit(time=time_limit_s))
+        nodes = info.get("nodes")
+        elapsed = info.get("time")
+        if nodes is None or not elapsed:
+            raise RuntimeError("Engine analysis did not report nodes and time.")
+        total_nodes += nodes
+        total_time_s += elapsed
+    return total_nodes / total_time_s if total_time_s else 0.0
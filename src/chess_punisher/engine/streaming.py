@@ -0,0 +1,121 @@
+"""Move classification that stops searching once the verdict is certain."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import monotonic
+
+import chess
+import chess.engine
+
+from .blunder_classifier import Thresholds, _score_to_cp, classify_cp_loss
+from .engine_pool import get_default_pool
+from .eval_cache import EvalCache, PositionEval, get_default_cache
+from .stockfish_engine import build_limit, evaluate_position, search_options
+
+
+@dataclass(frozen=True)
+class StreamingResult:
+    loss_cp: int
+    classification: str
+    depth: int | None
+    elapsed_s: float
+    saved_s: float
+    stopped_early: bool
+
+
+def compute_cp_loss_streaming(
+    board_before: chess.Board,
+    move: chess.Move,
+    engine: chess.engine.SimpleEngine | None = None,
+    time_limit_s: float = 0.1,
+    thresholds: Thresholds = Thresholds(),
+    min_depth: int = 10,
+    margin_cp: int = 50,
+    cache: EvalCache | None = None,
+    depth: int | None = None,
+    nodes: int | None = None,
+) -> StreamingResult:
+    """Like `compute_cp_loss_for_mover`, but stops the post-move search early.
+
+    The pre-move score comes from the eval cache or a normal search. The
+    post-move position is searched through `engine.analysis()`. Once the
+    search reaches `min_depth`, it stops as soon as the provisional loss is at
+    least `margin_cp` past the blunder threshold or at least `margin_cp` under
+    the inaccuracy threshold. Early-stopped results are not cached because
+    they are shallower than a full search. `saved_s` is only reported for
+    time-limited searches.
+    """
+    if move not in board_before.legal_moves:
+        raise ValueError(f"Illegal move for position: {move.uci()}")
+    if engine is None:
+        with get_default_pool().engine() as pooled:
+            return compute_cp_loss_streaming(
+                board_before,
+                move,
+                pooled,
+                time_limit_s,
+                thresholds,
+                min_depth,
+                margin_cp,
+                cache,
+                depth,
+                nodes,
+            )
+
+    cache = cache if cache is not None else get_default_cache()
+    mover_color = board_before.turn
+    limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+    budget_s = limit.time or 0.0
+    eval_before = evaluate_position(board_before, limit, engine=engine, cache=cache)
+    before_cp = _score_to_cp(eval_before.score.pov(mover_color))
+
+    board_after = board_before.copy(stack=False)
+    board_after.push(move)
+    cached_after = cache.get(board_after, limit)
+    if cached_after is not None:
+        loss = max(0, before_cp - _score_to_cp(cached_after.score.pov(mover_color)))
+        return StreamingResult(
+            loss_cp=loss,
+            classification=classify_cp_loss(loss, thresholds=thresholds),
+            depth=None,
+            elapsed_s=0.0,
+            saved_s=budget_s,
+            stopped_early=False,
+        )
+
+    started = monotonic()
+    stopped_early = False
+    last_info: chess.engine.InfoDict = {}
+    with engine.analysis(board_after, limit, **search_options(limit)) as analysis:
+        for info in analysis:
+            score = info.get("score")
+            if score is None or info.get("lowerbound") or info.get("upperbound"):
+                continue
+            last_info = info
+            depth = info.get("depth")
+            if depth is None or depth < min_depth:
+                continue
+            provisional = before_cp - _score_to_cp(score.pov(mover_color))
+            if (
+                provisional >= thresholds.blunder + margin_cp
+                or provisional < thresholds.inaccuracy - margin_cp
+            ):
+                stopped_early = True
+                analysis.stop()
+                break
+        final_info = last_info or dict(analysis.info)
+    elapsed = monotonic() - started
+
+    eval_after = PositionEval.from_info(final_info)
+    if not stopped_early:
+        cache.put(board_after, limit, eval_after)
+    loss = max(0, before_cp - _score_to_cp(eval_after.score.pov(mover_color)))
+    return StreamingResult(
+        loss_cp=loss,
+        classification=classify_cp_loss(loss, thresholds=thresholds),
+        depth=final_info.get("depth"),
+        elapsed_s=elapsed,
+        saved_s=max(0.0, budget_s - elapsed) if stopped_early else 0.0,
+        stopped_early=stopped_early,
+    )
@@ -0,0 +1,329 @@
+"""Crash/hang detection and transparent restart for a single UCI engine."""
+
+from __future__ import annotations
+
+from collections import deque
+import threading
+from time import monotonic
+from typing import Any, Callable, Mapping
+
+import chess
+import chess.engine
+
+from chess_punisher.observability import get_logger
+
+from .eval_cache import runs_cold, search_options
+
+LOGGER = get_logger(__name__)
+
+SpawnEngine = Callable[[], chess.engine.SimpleEngine]
+
+# Failures after which the process is assumed dead or wedged.
+_RESTART_ERRORS = (chess.engine.EngineError, TimeoutError)
+
+
+class _TrackedAnalysis:
+    """Delegates to a `SimpleAnalysisResult` and tells the supervisor when it ends.
+
+    If the engine dies mid-search, the supervisor restarts it and the search
+    is started again once on the replacement, unless it was stopped.
+    """
+
+    def __init__(
+        self,
+        supervisor: "SupervisedEngine",
+        inner: Any,
+        board: chess.Board,
+        limit: chess.engine.Limit | None,
+        kwargs: dict[str, Any],
+    ) -> None:
+        self._supervisor = supervisor
+        self._inner = inner
+        self._board = board
+        self._limit = limit
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+        self._retried = False
+        self._stopped = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+            inner = self._inner
+        try:
+            inner.stop()
+        except _RESTART_ERRORS:
+            pass  # The engine is gone; the waiting side sees the same error.
+
+    def wait(self) -> chess.engine.BestMove:
+        try:
+            while True:
+                try:
+                    return self._inner.wait()
+                except _RESTART_ERRORS as exc:
+                    if not self._retry(exc):
+                        raise
+        finally:
+            self._supervisor._end_analysis()
+
+    def __iter__(self) -> "_TrackedAnalysis":
+        iter(self._inner)
+        return self
+
+    def __next__(self) -> chess.engine.InfoDict:
+        while True:
+            try:
+                return next(self._inner)
+            except StopIteration:
+                self._supervisor._end_analysis()
+                raise
+            except _RESTART_ERRORS as exc:
+                if not self._retry(exc):
+                    self._supervisor._end_analysis()
+                    raise
+                iter(self._inner)
+
+    def __enter__(self) -> "_TrackedAnalysis":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        try:
+            self._inner.__exit__(*exc_info)
+        except _RESTART_ERRORS:
+            # Already failing (dead engine): keep the original error.
+            if exc_info[0] is None:
+                raise
+        finally:
+            self._supervisor._end_analysis()
+
+    def _retry(self, exc: BaseException) -> bool:
+        with self._lock:
+            if self._retried or self._stopped:
+                return False
+            self._retried = True
+            inner = self._supervisor._restart_analysis(
+                self._board, self._limit, self._kwargs, exc
+            )
+            if inner is None:
+                return False
+            self._inner = inner
+            return True
+
+
+class SupervisedEngine:
+    """Drop-in stand-in for `SimpleEngine` that restarts a dead or hung engine.
+
+    A watchdog thread pings the engine with `isready` every
+    `watchdog_interval_s` while it is idle and restarts it when the ping fails
+    or takes longer than `ping_timeout_s`. A blocking call running longer than
+    `hang_timeout_s` gets its process killed. A call that fails because the
+    process died is retried once on the replacement engine; so is a streaming
+    `analysis()` whose engine dies (or is killed as hung) mid-search.
+
+    Replacements are warmed by replaying the last `warm_positions` timed
+    searches with their original limits, so the hash table of the current
+    game is rebuilt before the retried call runs. Depth/node-limited searches
+    run on a cleared hash anyway (see `search_options`) and are not replayed.
+    """
+
+    def __init__(
+        self,
+        spawn: SpawnEngine,
+        ping_timeout_s: float = 2.0,
+        watchdog_interval_s: float = 1.0,
+        hang_timeout_s: float = 30.0,
+        warm_positions: int = 4,
+    ) -> None:
+        self._spawn = spawn
+        self.ping_timeout_s = ping_timeout_s
+        self.watchdog_interval_s = watchdog_interval_s
+        self.hang_timeout_s = hang_timeout_s
+        self.restarts = 0
+        self._lock = threading.RLock()
+        self._history: deque[tuple[chess.Board, chess.engine.Limit]] = deque(
+            maxlen=max(0, warm_positions)
+        )
+        self._options: dict[str, Any] = {}
+        self._busy_since: float | None = None
+        self._analysing = False
+        self._closed = False
+        self._engine = spawn()
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+        if watchdog_interval_s > 0:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="engine-supervisor", daemon=True
+            )
+            self._watchdog.start()
+
+    @property
+    def engine(self) -> chess.engine.SimpleEngine:
+        return self._engine
+
+    @property
+    def options(self) -> Mapping[str, Any]:
+        return self._engine.options
+
+    @property
+    def id(self) -> Mapping[str, str]:
+        return self._engine.id
+
+    def configure(self, options: Mapping[str, Any]) -> None:
+        with self._lock:
+            self._options.update(options)
+            self._engine.configure(options)
+
+    def ping(self) -> None:
+        self._call("ping")
+
+    def analyse(self, board: chess.Board, limit: chess.engine.Limit, **kwargs: Any) -> Any:
+        return self._call("analyse", board, limit, **kwargs)
+
+    def play(
+        self, board: chess.Board, limit: chess.engine.Limit, **kwargs: Any
+    ) -> chess.engine.PlayResult:
+        return self._call("play", board, limit, **kwargs)
+
+    def analysis(
+        self, board: chess.Board, limit: chess.engine.Limit | None = None, **kwargs: Any
+    ) -> _TrackedAnalysis:
+        """Streaming analysis; restarted once if the engine dies during the search.
+
+        The hang watchdog covers analyses with a `limit`; unlimited ones are
+        expected to run until stopped.
+        """
+        with self._lock:
+            self._analysing = True
+            try:
+                try:
+                    inner = self._engine.analysis(board, limit, **kwargs)
+                except _RESTART_ERRORS as exc:
+                    self._restart(f"{type(exc).__name__}: {exc}")
+                    inner = self._engine.analysis(board, limit, **kwargs)
+            except BaseException:
+                self._analysing = False
+                raise
+            self._busy_since = None if limit is None else monotonic()
+            self._remember(board, limit)
+        return _TrackedAnalysis(self, inner, board, limit, kwargs)
+
+    def clear_history(self) -> None:
+        """Forget replay positions, e.g. when a new game starts."""
+        with self._lock:
+            self._history.clear()
+
+    def quit(self) -> None:
+        self._closed = True
+        self._stop.set()
+        with self._lock:
+            self._engine.quit()
+
+    def close(self) -> None:
+        self._closed = True
+        self._stop.set()
+        self._engine.close()
+
+    def _end_analysis(self) -> None:
+        self._busy_since = None
+        self._analysing = False
+
+    def _restart_analysis(
+        self,
+        board: chess.Board,
+        limit: chess.engine.Limit | None,
+        kwargs: dict[str, Any],
+        exc: BaseException,
+    ) -> Any:
+        """Restart after a failed analysis and start it again; None once closed."""
+        with self._lock:
+            if self._closed:
+                return None
+            self._busy_since = None
+            self._restart(f"{type(exc).__name__}: {exc}")
+            inner = self._engine.analysis(board, limit, **kwargs)
+            self._busy_since = None if limit is None else monotonic()
+            return inner
+
+    def _remember(self, board: chess.Board, limit: chess.engine.Limit | None) -> None:
+        if limit is not None and not runs_cold(limit) and self._history.maxlen:
+            self._history.append((board.copy(stack=False), limit))
+
+    def _call(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            for attempt in (1, 2):
+                self._busy_since = monotonic()
+                try:
+                    result = getattr(self._engine, name)(*args, **kwargs)
+                    if args:
+                        self._remember(args[0], args[1])
+                    return result
+                except _RESTART_ERRORS as exc:
+                    if attempt == 2 or self._closed:
+                        raise
+                    # The replay must not look like the hung call to the watchdog.
+                    self._busy_since = None
+                    self._restart(f"{type(exc).__name__}: {exc}")
+                finally:
+                    self._busy_since = None
+        raise AssertionError("unreachable")
+
+    def _restart(self, reason: str) -> None:
+        started = monotonic()
+        try:
+            self._engine.close()
+        except Exception:
+            LOGGER.warning("engine_close_failed", exc_info=True)
+        self._engine = self._spawn()
+        if self._options:
+            self._engine.configure(self._options)
+        self.restarts += 1
+
+        warmed = 0
+        for board, limit in list(self._history):
+            try:
+                self._engine.analyse(board, limit, **search_options(limit))
+            except _RESTART_ERRORS:
+                break
+            warmed += 1
+        LOGGER.warning(
+            "engine_restarted",
+            extra={
+                "reason": reason,
+                "restarts": self.restarts,
+                "warm_positions": warmed,
+                "restart_ms": round((monotonic() - started) * 1000.0, 1),
+            },
+        )
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.watchdog_interval_s):
+            busy_since = self._busy_since
+            if busy_since is not None:
+                busy_s = monotonic() - busy_since
+                if busy_s > self.hang_timeout_s:
+                    LOGGER.warning("engine_hang_detected", extra={"busy_s": round(busy_s, 1)})
+                    # Killing the process makes the blocked call fail and retry.
+                    self._engine.close()
+                continue
+            if self._analysing or not self._lock.acquire(blocking=False):
+                continue
+            try:
+                if self._closed:
+                    return
+                self._check_alive()
+            finally:
+                self._lock.release()
+
+    def _check_alive(self) -> None:
+        started = monotonic()
+        try:
+            self._engine.ping()
+        except _RESTART_ERRORS as exc:
+            self._restart(f"ping failed: {type(exc).__name__}")
+            return
+        latency = monotonic() - started
+        if latency > self.ping_timeout_s:
+            self._restart(f"ping took {latency:.2f}s")
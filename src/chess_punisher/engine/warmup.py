@@ -0,0 +1,133 @@
+"""Engine warm-up that runs while the board is still being calibrated."""
+
+from __future__ import annotations
+
+import threading
+from time import monotonic
+from typing import Any
+
+import chess
+import chess.engine
+
+from chess_punisher.observability import get_logger
+
+from .engine_pool import EnginePool, get_default_pool
+from .eval_cache import EvalCache, PositionEval, get_default_cache
+from .stockfish_engine import build_limit, search_options
+
+LOGGER = get_logger(__name__)
+
+# Main lines of the most common openings; each prefix position is searched.
+WARMUP_OPENINGS = (
+    "e2e4 e7e5 g1f3 b8c6 f1b5",
+    "e2e4 c7c5 g1f3 d7d6 d2d4",
+    "e2e4 e7e6 d2d4 d7d5",
+    "e2e4 c7c6 d2d4 d7d5",
+    "d2d4 d7d5 c2c4 e7e6",
+    "d2d4 g8f6 c2c4 g7g6",
+    "c2c4 e7e5",
+    "g1f3 d7d5",
+)
+
+
+def warmup_boards(openings: bool = False) -> list[chess.Board]:
+    """The start position, plus every position along `WARMUP_OPENINGS` if asked."""
+    boards = [chess.Board()]
+    if not openings:
+        return boards
+    seen = {boards[0].fen()}
+    for line in WARMUP_OPENINGS:
+        board = chess.Board()
+        for uci in line.split():
+            board.push_uci(uci)
+            if board.fen() not in seen:
+                seen.add(board.fen())
+                boards.append(board.copy(stack=False))
+    return boards
+
+
+class EngineWarmup:
+    """Spawns every pool engine and runs short searches on a background thread.
+
+    `start()` is meant to be called on entering CALIBRATING. Each of the
+    pool's `size` engines is started (applying its UCI options) and searches
+    the warm-up positions with the classifier's limit; results go to the eval
+    cache, so the first classification of the start position costs no search.
+    `wait()` blocks until the warm-up ends. The state moves from "idle" to
+    "running" and then "ready" or "failed"; the end is logged as
+    `engine_warmup` with the duration.
+    """
+
+    def __init__(
+        self,
+        time_limit_s: float = 0.1,
+        pool: EnginePool | None = None,
+        cache: EvalCache | None = None,
+        openings: bool = False,
+        depth: int | None = None,
+        nodes: int | None = None,
+    ) -> None:
+        self.limit = build_limit(time_limit_s, depth=depth, nodes=nodes)
+        self.pool = pool
+        self.cache = cache
+        self.openings = openings
+        self.state = "idle"
+        self.duration_s: float | None = None
+        self.error: str | None = None
+        self._done = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.state = "running"
+        LOGGER.info("engine_warmup", extra={"warmup_state": self.state})
+        self._thread = threading.Thread(target=self._run, name="engine-warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout_s: float | None = None) -> bool:
+        """Block until the warm-up finished; returns True if it succeeded."""
+        if self._thread is None:
+            return False
+        self._done.wait(timeout_s)
+        return self.state == "ready"
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "warmup_state": self.state,
+            "duration_ms": None if self.duration_s is None else round(self.duration_s * 1000, 1),
+            "error": self.error,
+        }
+
+    def _run(self) -> None:
+        pool = self.pool or get_default_pool()
+        cache = self.cache if self.cache is not None else get_default_cache()
+        boards = warmup_boards(self.openings)
+        started = monotonic()
+        engines: list[chess.engine.SimpleEngine] = []
+        try:
+            # Hold all engines at once so each pool slot gets spawned and warmed.
+            for _ in range(pool.size):
+                engines.append(pool.checkout())
+            for engine in engines:
+                for board in boards:
+                    info = engine.analyse(board, self.limit, **search_options(self.limit))
+                    cache.put(board, self.limit, PositionEval.from_info(info))
+            self.state = "ready"
+        except Exception as exc:
+            # Any failure must end the warm-up, or wait() would report a "running" state.
+            self.state = "failed"
+            self.error = f"{type(exc).__name__}: {exc}"
+        finally:
+            for engine in engines:
+                pool.checkin(engine, discard=self.state == "failed")
+            self.duration_s = monotonic() - started
+            LOGGER.info(
+                "engine_warmup",
+                extra={
+                    **self.stats(),
+                    "engines": len(engines),
+                    "positions": len(boards),
+                },
+            )
+            self._done.set()
@@ -15,8 +15,8 @@ class MoveLogEntry:
     move_uci: str
     mover: str
     bestmove_uci: str
-    eval_before_cp: int
-    eval_after_cp: int
+    eval_before_cp: int | None
+    eval_after_cp: int | None
     loss_cp: int
     classification: str
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
+from typing import Callable
 
 from .events import Event
 
@@ -33,11 +34,20 @@ class Transition:
 
 
 class AppStateMachine:
-    """Minimal explicit state machine for rapid iteration."""
+    """Minimal explicit state machine for rapid iteration.
 
-    def __init__(self) -> None:
+    `on_abort` is called with the transition reason whenever pending work
+    becomes stale (DESYNC, MOVE_REJECTED), e.g. to cancel engine searches.
+    """
+
+    def __init__(self, on_abort: Callable[[str], None] | None = None) -> None:
         self.state = AppState.IDLE
         self.context = MachineContext()
+        self.on_abort = on_abort
+
+    def _abort(self, reason: str) -> None:
+        if self.on_abort is not None:
+            self.on_abort(reason)
 
     def handle(self, evt: Event) -> Transition:
         previous = self.state
@@ -48,6 +58,7 @@ class AppStateMachine:
             self.context.pending_move_uci = None
             self.context.pending_punishment = False
             reason = "desync_recalibrate"
+            self._abort(reason)
             return Transition(previous=previous, current=self.state, reason=reason)
 
         if self.state == AppState.IDLE:
@@ -90,6 +101,7 @@ class AppStateMachine:
                 self.state = AppState.TRACKING
                 self.context.pending_move_uci = None
                 reason = "move_rejected"
+                self._abort(reason)
             return Transition(previous=previous, current=self.state, reason=reason)
 
         if self.state == AppState.APPLY_PUNISHMENT:
@@ -99,6 +111,12 @@ class AppStateMachine:
                 self.context.pending_move_uci = None
                 self.context.failure_count = 0
                 reason = "punish_ack"
+            if evt.type == "PUNISH_QUEUED":
+                # Handed to an asynchronous actuator; its outcome is reported separately.
+                self.state = AppState.TRACKING
+                self.context.pending_punishment = False
+                self.context.pending_move_uci = None
+                reason = "punish_queued"
             if evt.type == "PUNISH_TIMEOUT":
                 self.context.failure_count += 1
                 if self.context.failure_count >= 3:
@@ -0,0 +1,57 @@
+"""In-process engine stand-in shared by the engine-layer tests."""
+
+from __future__ import annotations
+
+import threading
+from typing import Mapping
+
+import chess
+import chess.engine
+
+
+class StubEngine:
+    """Answers `analyse` like `SimpleEngine`, without a process.
+
+    Every position scores `white_cp` from White's point of view, or the entry
+    for its board FEN in `table`, with the first legal move as the PV.
+    Searches are counted in `calls` and recorded in `searches` (FEN, limit)
+    and `kwargs`. With `gated`, searches block until `gate` is set (at most
+    5s); `started` is set as soon as one begins.
+    """
+
+    def __init__(
+        self,
+        white_cp: int = 0,
+        table: Mapping[str, int] | None = None,
+        gated: bool = False,
+    ) -> None:
+        self.white_cp = white_cp
+        self.table = dict(table or {})
+        self.gate = threading.Event()
+        if not gated:
+            self.gate.set()
+        self.started = threading.Event()
+        self.calls = 0
+        self.searches: list[tuple[str, chess.engine.Limit]] = []
+        self.kwargs: list[dict[str, object]] = []
+
+    def analyse(
+        self, board: chess.Board, limit: chess.engine.Limit, **kwargs: object
+    ) -> dict[str, object]:
+        self.started.set()
+        self.gate.wait(5)
+        self.calls += 1
+        self.searches.append((board.fen(), limit))
+        self.kwargs.append(kwargs)
+        cp = self.table.get(board.board_fen(), self.white_cp)
+        move = next(iter(board.legal_moves), None)
+        return {
+            "score": chess.engine.PovScore(chess.engine.Cp(cp), chess.WHITE),
+            "pv": [move] if move is not None else [],
+        }
+
+    def quit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+from pathlib import Path
+import sys
+
+import chess
+import chess.engine
+import chess.polyglot
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.async_engine import AsyncEnginePool, compute_cp_loss_for_mover_async
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.shortcuts import PositionOracle
+
+
+class AsyncTableEngine:
+    """Scores the start position at +30 and anything else at +250 for the side to move."""
+
+    active = 0
+    peak = 0
+
+    async def analyse(self, board: chess.Board, limit: chess.engine.Limit) -> dict[str, object]:
+        AsyncTableEngine.active += 1
+        AsyncTableEngine.peak = max(AsyncTableEngine.peak, AsyncTableEngine.active)
+        await asyncio.sleep(0.01)
+        AsyncTableEngine.active -= 1
+        cp = 30 if board.board_fen() == chess.STARTING_BOARD_FEN else 250
+        return {"score": chess.engine.PovScore(chess.engine.Cp(cp), board.turn)}
+
+    async def quit(self) -> None:
+        return None
+
+
+class OneMoveBook:
+    """A book that only knows 1.e4 from the start position."""
+
+    def find_all(self, board: chess.Board) -> list[chess.polyglot.Entry]:
+        if board.board_fen() != chess.STARTING_BOARD_FEN:
+            return []
+        return [chess.polyglot.Entry(0, 0, 1, 0, chess.Move.from_uci("e2e4"))]
+
+    def close(self) -> None:
+        pass
+
+
+async def _make_engine() -> AsyncTableEngine:
+    return AsyncTableEngine()
+
+
+class AsyncEngineTests(unittest.TestCase):
+    def test_pool_searches_both_positions_concurrently(self) -> None:
+        async def run() -> tuple[int, str]:
+            pool = AsyncEnginePool(size=2, factory=_make_engine)
+            try:
+                return await compute_cp_loss_for_mover_async(
+                    chess.Board(), chess.Move.from_uci("f2f3"), pool=pool, cache=EvalCache()
+                )
+            finally:
+                await pool.close()
+
+        AsyncTableEngine.peak = 0
+        self.assertEqual(asyncio.run(run()), (280, "MISTAKE"))
+        self.assertEqual(AsyncTableEngine.peak, 2)
+
+    def test_oracle_matches_the_blocking_api(self) -> None:
+        oracle = PositionOracle(book=OneMoveBook())
+        engine = AsyncTableEngine()
+        book = asyncio.run(
+            compute_cp_loss_for_mover_async(
+                chess.Board(), chess.Move.from_uci("e2e4"), engine, cache=EvalCache(), oracle=oracle
+            )
+        )
+        self.assertEqual(book, (0, "OK"))
+        self.assertEqual(oracle.stats()["engine"], 0)
+
+        asyncio.run(
+            compute_cp_loss_for_mover_async(
+                chess.Board(), chess.Move.from_uci("f2f3"), engine, cache=EvalCache(), oracle=oracle
+            )
+        )
+        self.assertEqual(oracle.stats(), {"book": 1, "tablebase": 0, "database": 0, "engine": 2})
+
+    def test_requires_engine_or_pool(self) -> None:
+        with self.assertRaises(ValueError):
+            asyncio.run(
+                compute_cp_loss_for_mover_async(
+                    chess.Board(), chess.Move.from_uci("e2e4"), cache=EvalCache()
+                )
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
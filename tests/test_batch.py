@@ -0,0 +1,54 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+import chess
+import chess.engine
+import chess.pgn
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+for path in (PROJECT_ROOT, SRC_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from chess_punisher.engine.batch import analyse_game, iter_pgn_games
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.game_analyzer import GameAnalyzer
+from tests.stub_engine import StubEngine
+
+PGN = """[Event "Club"]
+[White "A"]
+[Black "B"]
+[Result "*"]
+
+1. e4 e5 2. Nf3 *
+
+[Event "Club"]
+[White "C"]
+[Black "D"]
+[Result "*"]
+
+1. d4 *
+"""
+
+
+class BatchTests(unittest.TestCase):
+    def test_streams_games_and_classifies_mainline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "games.pgn"
+            path.write_text(PGN, encoding="utf-8")
+            games = list(iter_pgn_games([path]))
+
+        self.assertEqual(len(games), 2)
+        analyzer = GameAnalyzer(engine=StubEngine(), cache=EvalCache())
+        record = analyse_game(chess.pgn.read_game(io.StringIO(games[0])), analyzer)
+        self.assertEqual(record["headers"]["White"], "A")
+        self.assertEqual([m["move_uci"] for m in record["moves"]], ["e2e4", "e7e5", "g1f3"])
+        self.assertEqual({m["classification"] for m in record["moves"]}, {"OK"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+from pathlib import Path
+import sys
+import unittest
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.bench import LatencyStats, percentile, run_benchmarks
+from chess_punisher.engine.fake_uci import fake_engine_command
+
+
+class BenchTests(unittest.TestCase):
+    def test_latency_stats_percentiles(self) -> None:
+        stats = LatencyStats.from_samples("x", [i / 1000.0 for i in range(1, 101)])
+        self.assertAlmostEqual(stats.p50_ms, 50.0)
+        self.assertAlmostEqual(stats.p95_ms, 95.0)
+        self.assertAlmostEqual(stats.p99_ms, 99.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_run_benchmarks_against_fake_engine(self) -> None:
+        report = run_benchmarks(command=fake_engine_command(), iterations=3, depth=2)
+        names = [entry["name"] for entry in report["benchmarks"]]
+        self.assertEqual(
+            names, ["analyse_board", "best_move", "compute_cp_loss_for_mover", "harness_move"]
+        )
+        self.assertEqual(report["candidate_overlap"]["confirmed"], 3)
+        phases = {entry["name"]: entry for entry in report["phases"]}
+        self.assertEqual(phases["search"]["count"], 3)
+        self.assertIn("spawn", phases)
+        drivers = [entry["name"] for entry in report["drivers"]]
+        self.assertEqual(drivers, ["simple_analyse", "lean_analyse"])
+
+
+if __name__ == "__main__":
+    unittest.main()
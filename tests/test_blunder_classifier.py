@@ -1,14 +1,60 @@
+import argparse
 import unittest
 from pathlib import Path
 import sys
 
+import chess
 import chess.engine
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
 SRC_PATH = Path(__file__).resolve().parents[1] / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-from chess_punisher.engine.blunder_classifier import Thresholds, classify_cp_loss, cp_loss
+from chess_punisher.engine.blunder_classifier import (
+    CLASSIFICATION_LABELS,
+    MATE_CP_EQUIVALENT,
+    MultiPVClassifier,
+    Thresholds,
+    classify_cp_loss,
+    classify_cp_loss_array,
+    cp_loss,
+    cp_loss_array,
+    parse_thresholds,
+    player_accuracy,
+    player_acpl,
+)
+from chess_punisher.engine.eval_cache import EvalCache
+
+
+class MultiPVEngine:
+    """Returns fixed MultiPV lines for the root and a fixed score for any other position."""
+
+    def __init__(self, lines: list[tuple[str, int]], other_cp: int) -> None:
+        self.lines = lines
+        self.other_cp = other_cp
+        self.calls: list[int | None] = []
+
+    def analyse(
+        self,
+        board: chess.Board,
+        limit: chess.engine.Limit,
+        multipv: int | None = None,
+    ) -> object:
+        self.calls.append(multipv)
+        if multipv is None:
+            return {"score": chess.engine.PovScore(chess.engine.Cp(self.other_cp), board.turn)}
+        return [
+            {
+                "score": chess.engine.PovScore(chess.engine.Cp(cp), board.turn),
+                "pv": [chess.Move.from_uci(uci)],
+            }
+            for uci, cp in self.lines[:multipv]
+        ]
 
 
 class BlunderClassifierTests(unittest.TestCase):
@@ -23,6 +69,11 @@ class BlunderClassifierTests(unittest.TestCase):
         self.assertEqual(classify_cp_loss(59, thresholds=thresholds), "INACCURACY")
         self.assertEqual(classify_cp_loss(60, thresholds=thresholds), "MISTAKE")
 
+    def test_parse_thresholds(self) -> None:
+        self.assertEqual(parse_thresholds("20, 60,120"), Thresholds(20, 60, 120))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_thresholds("20,60")
+
     def test_cp_loss_from_ints(self) -> None:
         self.assertEqual(cp_loss(120, 80), 40)
         self.assertEqual(cp_loss(50, 100), 0)
@@ -33,5 +84,52 @@ class BlunderClassifierTests(unittest.TestCase):
         self.assertEqual(cp_loss(before, after), 19_995)
 
 
+class MultiPVClassifierTests(unittest.TestCase):
+    def test_move_in_top_lines_needs_no_second_search(self) -> None:
+        engine = MultiPVEngine([("e2e4", 40), ("d2d4", 35), ("a2a3", -30)], other_cp=0)
+        classifier = MultiPVClassifier(k=3, cache=EvalCache())
+        loss, label = classifier.classify(chess.Board(), chess.Move.from_uci("a2a3"), engine)
+        self.assertEqual((loss, label), (70, "INACCURACY"))
+        self.assertEqual(engine.calls, [3])
+        self.assertEqual(classifier.hit_rate, 1.0)
+
+    def test_move_outside_top_lines_falls_back_to_search(self) -> None:
+        engine = MultiPVEngine([("e2e4", 40), ("d2d4", 35)], other_cp=300)
+        classifier = MultiPVClassifier(k=2, cache=EvalCache())
+        loss, label = classifier.classify(chess.Board(), chess.Move.from_uci("g2g4"), engine)
+        # Opponent to move is +300 after g4, i.e. -300 for White.
+        self.assertEqual((loss, label), (340, "BLUNDER"))
+        self.assertEqual(engine.calls, [2, None])
+        self.assertEqual((classifier.hits, classifier.misses), (0, 1))
+
+
+@unittest.skipUnless(np is not None, "numpy not installed")
+class ArrayClassificationTests(unittest.TestCase):
+    def test_arrays_match_scalar_functions(self) -> None:
+        before = [30, 30, 500, MATE_CP_EQUIVALENT - 3, -20, 12_000]
+        after = [40, -40, 100, 0, -400, 11_000]
+        losses = cp_loss_array(before, after)
+        codes = classify_cp_loss_array(losses, Thresholds())
+
+        # Scores beyond the mate equivalent are clipped, so the last pair loses nothing.
+        self.assertEqual(losses.tolist(), [0, 70, 400, MATE_CP_EQUIVALENT - 3, 380, 0])
+        self.assertEqual(
+            [CLASSIFICATION_LABELS[code] for code in codes],
+            [classify_cp_loss(int(loss)) for loss in losses],
+        )
+
+    def test_per_player_acpl_and_accuracy(self) -> None:
+        losses = np.array([0, 100, 20, 2000, 50, 0])
+        is_white = np.array([True, False, True, False, True, False])
+        games = np.array([0, 0, 0, 0, 1, 1])
+
+        acpl = player_acpl(losses, is_white, games)
+        self.assertEqual(acpl.tolist(), [[10.0, 550.0], [50.0, 0.0]])
+
+        accuracy = player_accuracy(np.zeros(6), -losses, is_white, games)
+        self.assertAlmostEqual(float(accuracy[1, 1]), 100.0, places=3)
+        self.assertLess(float(accuracy[0, 1]), float(accuracy[0, 0]))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,59 @@
+import threading
+import time
+import unittest
+from pathlib import Path
+import sys
+
+import chess
+import chess.engine
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.cancellation import (
+    AnalysisCancelled,
+    CancellationRegistry,
+    CancelToken,
+)
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.fake_uci import fake_engine_command
+from chess_punisher.engine.stockfish_engine import evaluate_position
+
+
+class CancellationTests(unittest.TestCase):
+    def test_cancel_stops_running_search(self) -> None:
+        engine = chess.engine.SimpleEngine.popen_uci(fake_engine_command("--latency-ms", "5000"))
+        self.addCleanup(engine.quit)
+        cache = EvalCache()
+        limit = chess.engine.Limit(time=5.0)
+        token = CancelToken("game-1", 0)
+        threading.Timer(0.1, token.cancel, args=("desync",)).start()
+
+        started = time.monotonic()
+        with self.assertRaises(AnalysisCancelled):
+            evaluate_position(chess.Board(), limit, engine=engine, cache=cache, token=token)
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertIsNone(cache.get(chess.Board(), limit))
+        # The engine is free for the next position right away.
+        quick = chess.engine.Limit(time=0.05)
+        self.assertIsNotNone(evaluate_position(chess.Board(), quick, engine=engine, cache=cache))
+
+    def test_registry_cancels_by_game_and_ply(self) -> None:
+        registry = CancellationRegistry()
+        old_ply = registry.issue("game-1", 3)
+        takeback = registry.issue("game-1", 5)
+        other_game = registry.issue("game-2", 5)
+
+        self.assertEqual(registry.cancel("takeback", game_id="game-1", from_ply=4), 1)
+        self.assertTrue(takeback.cancelled)
+        self.assertFalse(old_ply.cancelled or other_game.cancelled)
+
+        registry.release(old_ply)
+        self.assertEqual(registry.cancel("reset"), 1)
+        self.assertTrue(other_game.cancelled)
+        self.assertFalse(old_ply.cancelled)
+
+
+if __name__ == "__main__":
+    unittest.main()
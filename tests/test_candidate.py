@@ -0,0 +1,83 @@
+import contextlib
+import io
+import time
+import unittest
+from pathlib import Path
+import sys
+
+import chess
+import chess.engine
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.cancellation import AnalysisCancelled
+from chess_punisher.engine.candidate import CandidatePipeline
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.fake_uci import fake_engine_command
+from chess_punisher.engine.game_analyzer import GameAnalyzer
+
+
+class CandidatePipelineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = chess.engine.SimpleEngine.popen_uci(
+            fake_engine_command("--latency-ms", "100")
+        )
+        self.addCleanup(self.engine.quit)
+        self.analyzer = GameAnalyzer(engine=self.engine, cache=EvalCache())
+
+    def test_confirm_reuses_analysis_started_at_candidate(self) -> None:
+        pipeline = CandidatePipeline(self.analyzer)
+        pipeline.begin(chess.Move.from_uci("e2e4"))
+        time.sleep(0.3)  # vision confirmation window
+
+        started = time.monotonic()
+        analysis = pipeline.confirm()
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertEqual(analysis.move_uci, "e2e4")
+        self.assertEqual(self.analyzer.board.move_stack, [chess.Move.from_uci("e2e4")])
+        self.assertGreater(pipeline.stats()["saved_ms"], 100)
+
+    def test_reject_cancels_and_leaves_board(self) -> None:
+        pipeline = CandidatePipeline(self.analyzer)
+        pipeline.begin(chess.Move.from_uci("e2e4"))
+        pipeline.reject()
+        self.assertIsNone(pipeline.pending)
+        self.assertEqual(pipeline.stats()["rejected"], 1)
+        self.assertEqual(self.analyzer.board.move_stack, [])
+
+        pipeline.begin(chess.Move.from_uci("d2d4"))
+        pipeline.registry.cancel("desync")
+        with self.assertRaises(AnalysisCancelled):
+            pipeline.confirm(timeout_s=5)
+        self.assertEqual(self.analyzer.board.move_stack, [])
+
+    def test_superseded_search_finishes_before_next_one_starts(self) -> None:
+        pipeline = CandidatePipeline(self.analyzer)
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), self.assertNoLogs(level="WARNING"):
+            for _ in range(3):
+                pipeline.begin(chess.Move.from_uci("e2e4"))
+                pipeline.begin(chess.Move.from_uci("d2d4"))
+                analysis = pipeline.confirm(timeout_s=5)
+                self.assertEqual(analysis.move_uci, "d2d4")
+                self.analyzer.reset()
+            # Flush any late engine callback of a superseded search.
+            self.engine.ping()
+        self.assertEqual(stderr.getvalue(), "")
+        self.assertEqual(pipeline.stats()["rejected"], 3)
+
+    def test_confirm_timeout_cancels_search(self) -> None:
+        pipeline = CandidatePipeline(self.analyzer)
+        pipeline.begin(chess.Move.from_uci("e2e4"))
+        with self.assertRaises(TimeoutError):
+            pipeline.confirm(timeout_s=0.01)
+        self.assertIsNone(pipeline.pending)
+        self.assertEqual(self.analyzer.board.move_stack, [])
+        pipeline.begin(chess.Move.from_uci("d2d4"))
+        self.assertEqual(pipeline.confirm(timeout_s=5).move_uci, "d2d4")
+
+
+if __name__ == "__main__":
+    unittest.main()
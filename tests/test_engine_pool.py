@@ -0,0 +1,69 @@
+import unittest
+from pathlib import Path
+import sys
+
+import chess.engine
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.engine_pool import EnginePool
+
+
+class FakeEngine:
+    def __init__(self) -> None:
+        self.quit_calls = 0
+
+    def quit(self) -> None:
+        self.quit_calls += 1
+
+
+class EnginePoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.spawned: list[FakeEngine] = []
+
+    def _factory(self) -> FakeEngine:
+        engine = FakeEngine()
+        self.spawned.append(engine)
+        return engine
+
+    def test_engine_is_reused_between_checkouts(self) -> None:
+        pool = EnginePool(size=1, idle_timeout_s=0, factory=self._factory)
+        with pool.engine() as first:
+            pass
+        with pool.engine() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(len(self.spawned), 1)
+        pool.close()
+        self.assertEqual(first.quit_calls, 1)
+
+    def test_checkout_times_out_when_pool_exhausted(self) -> None:
+        pool = EnginePool(size=1, idle_timeout_s=0, factory=self._factory)
+        held = pool.checkout()
+        with self.assertRaises(TimeoutError):
+            pool.checkout(timeout_s=0.01)
+        pool.checkin(held)
+        self.assertIs(pool.checkout(timeout_s=0.01), held)
+
+    def test_crashed_engine_is_discarded(self) -> None:
+        pool = EnginePool(size=1, idle_timeout_s=0, factory=self._factory)
+        with self.assertRaises(chess.engine.EngineTerminatedError):
+            with pool.engine():
+                raise chess.engine.EngineTerminatedError("engine died")
+        self.assertEqual(pool.live_count, 0)
+        with pool.engine() as replacement:
+            self.assertIs(replacement, self.spawned[1])
+
+    def test_idle_engines_are_shut_down(self) -> None:
+        pool = EnginePool(size=2, idle_timeout_s=0, factory=self._factory)
+        with pool.engine():
+            pass
+        self.assertEqual(pool.shutdown_idle(max_idle_s=0), 1)
+        self.assertEqual(pool.live_count, 0)
+        self.assertEqual(self.spawned[0].quit_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
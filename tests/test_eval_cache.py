@@ -0,0 +1,81 @@
+import unittest
+from pathlib import Path
+import sys
+
+import chess
+import chess.engine
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+for path in (PROJECT_ROOT, SRC_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from chess_punisher.engine.eval_cache import EvalCache, PositionEval
+from chess_punisher.engine.stockfish_engine import evaluate_position
+from tests.stub_engine import StubEngine
+
+
+def _eval(cp: int) -> PositionEval:
+    return PositionEval(
+        score=chess.engine.PovScore(chess.engine.Cp(cp), chess.WHITE),
+        best_move=None,
+    )
+
+
+class EvalCacheTests(unittest.TestCase):
+    def test_key_includes_search_limit(self) -> None:
+        cache = EvalCache()
+        board = chess.Board()
+        cache.put(board, chess.engine.Limit(time=0.1), _eval(10))
+        self.assertIsNotNone(cache.get(board, chess.engine.Limit(time=0.1)))
+        self.assertIsNone(cache.get(board, chess.engine.Limit(time=0.2)))
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+
+    def test_lru_eviction(self) -> None:
+        cache = EvalCache(max_entries=2)
+        limit = chess.engine.Limit(time=0.1)
+        boards = [chess.Board(), chess.Board(), chess.Board()]
+        boards[1].push_uci("e2e4")
+        boards[2].push_uci("d2d4")
+        cache.put(boards[0], limit, _eval(0))
+        cache.put(boards[1], limit, _eval(1))
+        cache.get(boards[0], limit)
+        cache.put(boards[2], limit, _eval(2))
+        self.assertIsNotNone(cache.get(boards[0], limit))
+        self.assertIsNone(cache.get(boards[1], limit))
+        self.assertEqual(cache.stats().evictions, 1)
+
+    def test_peek_leaves_counters_and_order_alone(self) -> None:
+        cache = EvalCache(max_entries=2)
+        limit = chess.engine.Limit(time=0.1)
+        boards = [chess.Board(), chess.Board(), chess.Board()]
+        boards[1].push_uci("e2e4")
+        boards[2].push_uci("d2d4")
+        cache.put(boards[0], limit, _eval(0))
+        cache.put(boards[1], limit, _eval(1))
+        self.assertEqual(cache.peek(boards[0], limit), _eval(0))
+        self.assertIsNone(cache.peek(boards[2], limit))
+        cache.put(boards[2], limit, _eval(2))
+        self.assertIsNone(cache.peek(boards[0], limit))
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses), (0, 0))
+
+    def test_transpositions_share_an_entry(self) -> None:
+        cache = EvalCache()
+        engine = StubEngine(white_cp=25)
+        limit = chess.engine.Limit(time=0.1)
+        first = chess.Board()
+        for uci in ("g1f3", "g8f6", "b1c3"):
+            first.push_uci(uci)
+        second = chess.Board()
+        for uci in ("b1c3", "g8f6", "g1f3"):
+            second.push_uci(uci)
+        evaluate_position(first, limit, engine=engine, cache=cache)
+        evaluate_position(second, limit, engine=engine, cache=cache)
+        self.assertEqual(engine.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+from pathlib import Path
+import struct
+import sys
+import tempfile
+import unittest
+
+import chess
+import chess.engine
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+for path in (PROJECT_ROOT, SRC_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from chess_punisher.engine.batch import build_eval_db
+from chess_punisher.engine.blunder_classifier import compute_cp_loss_for_mover
+from chess_punisher.engine.engine_pool import EnginePool
+from chess_punisher.engine.eval_cache import EvalCache, PositionEval
+from chess_punisher.engine.eval_db import EvalDatabase, write_eval_db
+from chess_punisher.engine.shortcuts import PositionOracle
+from chess_punisher.engine.stockfish_engine import build_limit
+from tests.stub_engine import StubEngine
+
+PGN = """[Event "a"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bb5 *
+
+[Event "b"]
+
+1. e4 c5 2. Nf3 *
+"""
+
+
+def _eval(board: chess.Board, score: chess.engine.Score, move: str | None) -> PositionEval:
+    return PositionEval(
+        score=chess.engine.PovScore(score, board.turn),
+        best_move=chess.Move.from_uci(move) if move else None,
+    )
+
+
+class EvalDatabaseTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "evals.db")
+        self.limit = build_limit(0.1, depth=12)
+
+    def test_round_trip_preserves_scores_and_moves(self) -> None:
+        start = chess.Board()
+        after_e4 = chess.Board()
+        after_e4.push_uci("e2e4")
+        promotion = chess.Board("8/4P3/8/8/8/k7/8/K7 w - - 0 1")
+        entries = [
+            (start, _eval(start, chess.engine.Cp(25), "e2e4")),
+            (after_e4, _eval(after_e4, chess.engine.Cp(-30), None)),
+            (promotion, _eval(promotion, chess.engine.Mate(3), "e7e8q")),
+        ]
+        self.assertEqual(write_eval_db(self.path, self.limit, entries), 3)
+
+        db = EvalDatabase(self.path, expected_limit=self.limit)
+        self.addCleanup(db.close)
+        self.assertEqual(len(db), 3)
+        for board, expected in entries:
+            self.assertEqual(db.lookup(board, self.limit), expected)
+        missing = chess.Board()
+        missing.push_uci("d2d4")
+        self.assertIsNone(db.get(missing))
+
+    def test_stale_databases_are_rejected(self) -> None:
+        board = chess.Board()
+        write_eval_db(self.path, self.limit, [(board, _eval(board, chess.engine.Cp(0), None))])
+
+        with self.assertRaises(ValueError):
+            EvalDatabase(self.path, expected_limit=build_limit(0.1, depth=14))
+        db = EvalDatabase(self.path)
+        self.addCleanup(db.close)
+        self.assertIsNone(db.lookup(board, build_limit(0.1)))
+
+        with open(self.path, "r+b") as handle:
+            handle.seek(8)
+            handle.write(struct.pack("<H", 99))
+        with self.assertRaises(ValueError):
+            EvalDatabase(self.path)
+
+    def test_classification_answers_from_database_without_engine(self) -> None:
+        engine = StubEngine(white_cp=15)
+        pool = EnginePool(size=2, idle_timeout_s=0, factory=lambda: StubEngine(white_cp=15))
+        self.addCleanup(pool.close)
+        pgn_path = os.path.join(self.tmp.name, "games.pgn")
+        with open(pgn_path, "w", encoding="utf-8") as handle:
+            handle.write(PGN)
+        # Start and 1.e4 are shared; each game adds two more positions by ply 3.
+        self.assertEqual(build_eval_db([pgn_path], self.path, max_ply=3, depth=12, pool=pool), 6)
+
+        db = EvalDatabase(self.path)
+        oracle = PositionOracle(eval_db=db)
+        self.addCleanup(oracle.close)
+        loss, label = compute_cp_loss_for_mover(
+            chess.Board(),
+            chess.Move.from_uci("e2e4"),
+            engine,
+            depth=12,
+            cache=EvalCache(max_entries=0),
+            oracle=oracle,
+        )
+        self.assertEqual((loss, label), (0, "OK"))
+        self.assertEqual(engine.calls, 0)
+        self.assertEqual(oracle.stats()["database"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import sqlite3
+from pathlib import Path
+import sys
+import tempfile
+import time
+import unittest
+
+import chess
+import chess.engine
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.eval_cache import EvalCache, PositionEval, position_key
+from chess_punisher.engine.eval_store import SqliteEvalStore
+from chess_punisher.engine.stockfish_engine import build_limit
+
+
+def _boards(count: int) -> list[chess.Board]:
+    boards = []
+    board = chess.Board()
+    for move in ("e2e4", "e7e5", "g1f3", "b8c6", "f1b5", "a7a6")[:count]:
+        board.push_uci(move)
+        boards.append(board.copy(stack=False))
+    return boards
+
+
+class SqliteEvalStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "evals.sqlite")
+        self.limit = build_limit(0.1, nodes=50_000)
+
+    def _store(self, **kwargs: int) -> SqliteEvalStore:
+        store = SqliteEvalStore(self.path, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def test_second_level_survives_restart(self) -> None:
+        board = chess.Board()
+        mate = PositionEval(
+            score=chess.engine.PovScore(chess.engine.Mate(-2), chess.BLACK),
+            best_move=chess.Move.from_uci("e7e8q"),
+        )
+        EvalCache(backing=self._store()).put(board, self.limit, mate)
+
+        # A fresh process: empty memory level, same file.
+        cache = EvalCache(backing=self._store())
+        self.assertEqual(cache.get(board, self.limit), mate)
+        self.assertEqual(cache.get(board, self.limit), mate)
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.backing_hits), (1, 1, 1))
+        self.assertIsNone(cache.get(board, build_limit(0.1, nodes=60_000)))
+
+    def test_eviction_keeps_most_recent_rows(self) -> None:
+        store = self._store(max_entries=3, evict_every=1)
+        boards = _boards(5)
+        for index, board in enumerate(boards):
+            value = PositionEval(chess.engine.PovScore(chess.engine.Cp(index), board.turn), None)
+            store.put(position_key(board, self.limit), value)
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.evictions, 2)
+        self.assertIsNone(store.get(position_key(boards[0], self.limit)))
+        self.assertIsNotNone(store.get(position_key(boards[-1], self.limit)))
+
+    def test_reads_refresh_rows_and_batches_keep_their_order(self) -> None:
+        store = self._store(max_entries=3, evict_every=1_000)
+        boards = _boards(4)
+        keys = [position_key(board, self.limit) for board in boards]
+        value = PositionEval(chess.engine.PovScore(chess.engine.Cp(0), chess.WHITE), None)
+        store.put_many([(key, value) for key in keys[:3]])
+        # A store hit, then memory hits reported through touch(), keep the first row in use.
+        cache = EvalCache(backing=store)
+        for _ in range(3):
+            self.assertIsNotNone(cache.get(boards[0], self.limit))
+        store.put(keys[3], value)
+
+        self.assertEqual(store.evict(), 1)
+        # The batch's second row is now the least recently used one.
+        self.assertEqual([key for key, _ in store.items()], [keys[3], keys[0], keys[2]])
+
+    def test_reads_never_write(self) -> None:
+        store = self._store()
+        key = position_key(chess.Board(), self.limit)
+        store.put(key, PositionEval(chess.engine.PovScore(chess.engine.Cp(0), chess.WHITE), None))
+        # Another process holding the write lock must not stall reads.
+        other = sqlite3.connect(store.path, isolation_level=None)
+        self.addCleanup(other.close)
+        other.execute("BEGIN IMMEDIATE")
+        started = time.monotonic()
+        for _ in range(200):
+            self.assertIsNotNone(store.get(key))
+            store.touch(key)
+        self.assertLess(time.monotonic() - started, 1.0)
+        other.execute("ROLLBACK")
+
+    def test_preload_fills_memory_level(self) -> None:
+        store = self._store()
+        boards = _boards(4)
+        store.put_many(
+            [
+                (
+                    position_key(board, self.limit),
+                    PositionEval(chess.engine.PovScore(chess.engine.Cp(10), board.turn), None),
+                )
+                for board in boards
+            ]
+        )
+
+        cache = EvalCache(max_entries=2)
+        self.assertEqual(cache.preload(store.items(limit=10)), 2)
+        self.assertEqual(len(cache), 2)
+        hits = [cache.get(board, self.limit) is not None for board in boards]
+        self.assertEqual(sum(hits), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
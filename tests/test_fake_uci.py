@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+import chess
+import chess.engine
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.blunder_classifier import compute_cp_loss_for_mover
+from chess_punisher.engine.engine_pool import EnginePool
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.fake_uci import fake_engine_command
+from chess_punisher.engine.stockfish_engine import analyse_board
+
+
+def _board_fen_after(*moves: str) -> str:
+    board = chess.Board()
+    for uci in moves:
+        board.push_uci(uci)
+    return board.board_fen()
+
+
+class FakeUciEngineTests(unittest.TestCase):
+    def test_table_scores_drive_classification(self) -> None:
+        table = {_board_fen_after("e2e4"): 30, _board_fen_after("e2e4", "g7g5"): 350}
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as handle:
+            json.dump(table, handle)
+        self.addCleanup(Path(handle.name).unlink)
+
+        engine = chess.engine.SimpleEngine.popen_uci(fake_engine_command("--table", handle.name))
+        try:
+            board = chess.Board()
+            board.push_uci("e2e4")
+            result = compute_cp_loss_for_mover(
+                board, chess.Move.from_uci("g7g5"), engine, cache=EvalCache()
+            )
+            self.assertEqual(result, (320, "BLUNDER"))
+
+            with engine.analysis(board) as analysis:
+                for info in analysis:
+                    if info.get("depth", 0) >= 2:
+                        analysis.stop()
+                        break
+            self.assertIsNotNone(analysis.wait().move)
+        finally:
+            engine.quit()
+
+    def test_seeded_scores_are_deterministic_through_pool(self) -> None:
+        scores = []
+        for _ in range(2):
+            pool = EnginePool(command=fake_engine_command("--seed", "7"), idle_timeout_s=0)
+            try:
+                score = analyse_board(chess.Board(), depth=4, pool=pool, cache=EvalCache())
+                scores.append(score.white().score())
+            finally:
+                pool.close()
+        self.assertEqual(scores[0], scores[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
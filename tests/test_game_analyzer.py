@@ -0,0 +1,64 @@
+import unittest
+from pathlib import Path
+import sys
+
+import chess
+import chess.engine
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+for path in (PROJECT_ROOT, SRC_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from chess_punisher.engine.blunder_classifier import compute_cp_loss_for_mover
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.game_analyzer import GameAnalyzer
+from tests.stub_engine import StubEngine
+
+
+def _fen_after(*moves: str) -> str:
+    board = chess.Board()
+    for uci in moves:
+        board.push_uci(uci)
+    return board.board_fen()
+
+
+class GameAnalyzerTests(unittest.TestCase):
+    def test_one_search_per_ply_after_first(self) -> None:
+        engine = StubEngine(table={_fen_after("e2e4"): 40, _fen_after("e2e4", "f7f6"): 120})
+        analyzer = GameAnalyzer(engine=engine, cache=EvalCache())
+
+        first = analyzer.push(chess.Move.from_uci("e2e4"))
+        self.assertEqual(engine.calls, 2)
+        second = analyzer.push(chess.Move.from_uci("f7f6"))
+        self.assertEqual(engine.calls, 3)
+
+        self.assertEqual(first.mover, "white")
+        self.assertEqual(first.loss_cp, 0)
+        self.assertEqual((second.eval_before_cp, second.eval_after_cp), (-40, -120))
+        self.assertEqual(second.loss_cp, 80)
+        self.assertEqual(second.classification, "INACCURACY")
+
+    def test_matches_compute_cp_loss_for_mover(self) -> None:
+        table = {_fen_after("d2d4"): 30, _fen_after("d2d4", "g7g5"): 420}
+        analyzer = GameAnalyzer(engine=StubEngine(table=table), cache=EvalCache())
+        analyzer.push(chess.Move.from_uci("d2d4"))
+        board_before = analyzer.board.copy()
+
+        analysis = analyzer.push(chess.Move.from_uci("g7g5"))
+        expected = compute_cp_loss_for_mover(
+            board_before, chess.Move.from_uci("g7g5"), StubEngine(table=table), 0.1, EvalCache()
+        )
+        self.assertEqual((analysis.loss_cp, analysis.classification), expected)
+
+    def test_illegal_move_does_not_search(self) -> None:
+        engine = StubEngine()
+        analyzer = GameAnalyzer(engine=engine, cache=EvalCache())
+        with self.assertRaises(ValueError):
+            analyzer.push(chess.Move.from_uci("e2e5"))
+        self.assertEqual(engine.calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+from pathlib import Path
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+import chess
+import chess.engine
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.blunder_classifier import MultiPVClassifier
+from chess_punisher.engine.cancellation import AnalysisCancelled, CancelToken
+from chess_punisher.engine.engine_pool import EnginePool
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.fake_uci import fake_engine_command
+from chess_punisher.engine.lean_uci import LeanUciEngine, parse_info
+from chess_punisher.engine.shortcuts import PositionOracle
+from chess_punisher.engine.speculation import Speculator
+from chess_punisher.engine.stockfish_engine import evaluate_position
+from chess_punisher.engine.streaming import compute_cp_loss_streaming
+
+
+class LeanUciEngineTests(unittest.TestCase):
+    def test_matches_simple_engine_on_same_positions(self) -> None:
+        command = fake_engine_command("--seed", "3")
+        lean = LeanUciEngine.popen_uci(command)
+        self.addCleanup(lean.quit)
+        simple = chess.engine.SimpleEngine.popen_uci(command)
+        self.addCleanup(simple.quit)
+        limit = chess.engine.Limit(depth=4)
+
+        board = chess.Board()
+        for uci in ("e2e4", "c7c5", "g1f3"):
+            expected = simple.analyse(board, limit)
+            info = lean.analyse(board, limit)
+            self.assertEqual(info["score"], expected["score"])
+            self.assertEqual(info["pv"], expected["pv"])
+            self.assertEqual(info["depth"], expected["depth"])
+            self.assertEqual(lean.play(board, limit).move, simple.play(board, limit).move)
+            board.push_uci(uci)
+
+    def test_parse_info_keeps_only_used_fields(self) -> None:
+        line = "info depth 12 seldepth 18 multipv 1 score mate -3 nodes 9000 pv e7e5 g1f3"
+        info = parse_info(line, chess.BLACK)
+        self.assertEqual(info["depth"], 12)
+        self.assertEqual(info["score"], chess.engine.PovScore(chess.engine.Mate(-3), chess.BLACK))
+        self.assertEqual(info["pv"], [chess.Move.from_uci("e7e5"), chess.Move.from_uci("g1f3")])
+        self.assertEqual(set(info), {"depth", "score", "pv"})
+
+    def test_pool_driver_and_cancellation(self) -> None:
+        pool = EnginePool(
+            command=fake_engine_command("--latency-ms", "5000"), idle_timeout_s=0, driver="lean"
+        )
+        self.addCleanup(pool.close)
+        token = CancelToken("game-1", 0)
+        threading.Timer(0.1, token.cancel, args=("desync",)).start()
+
+        with pool.engine() as engine:
+            self.assertIsInstance(engine, LeanUciEngine)
+            started = time.monotonic()
+            with self.assertRaises(AnalysisCancelled):
+                evaluate_position(
+                    chess.Board(),
+                    chess.engine.Limit(time=5.0),
+                    engine=engine,
+                    cache=EvalCache(),
+                    oracle=PositionOracle(),
+                    token=token,
+                )
+            self.assertLess(time.monotonic() - started, 2.0)
+            quick = evaluate_position(
+                chess.Board(), chess.engine.Limit(time=0.05), engine=engine, cache=EvalCache()
+            )
+            self.assertIsNotNone(quick.best_move)
+
+    def test_streaming_multipv_and_speculation_on_lean_pool(self) -> None:
+        command = fake_engine_command("--seed", "3")
+        results = {}
+        for driver in ("simple", "lean"):
+            pool = EnginePool(command=command, idle_timeout_s=0, supervise=True, driver=driver)
+            self.addCleanup(pool.close)
+            board = chess.Board()
+            move = chess.Move.from_uci("g2g4")
+            with pool.engine() as engine:
+                streaming = compute_cp_loss_streaming(
+                    board, move, engine, depth=6, min_depth=2, cache=EvalCache()
+                )
+                classifier = MultiPVClassifier(k=3, depth=6, cache=EvalCache())
+                multipv = classifier.classify(board, move, engine)
+                lines = engine.analyse(board, chess.engine.Limit(depth=6), multipv=3)
+                # MultiPV is reset for the next single-line search.
+                single = engine.analyse(board, chess.engine.Limit(depth=6))
+            cache = EvalCache()
+            speculator = Speculator(top_n=2, depth=6, pool=pool, cache=cache)
+            speculator.start(board)
+            self.assertTrue(speculator.wait(timeout_s=10))
+            results[driver] = (
+                streaming.loss_cp,
+                multipv,
+                [(info["score"], info["pv"][0]) for info in lines],
+                single["score"],
+                len(cache),
+            )
+        self.assertEqual(results["lean"], results["simple"])
+        self.assertEqual(len(results["lean"][2]), 3)
+        self.assertEqual(results["lean"][4], 2)
+
+    def test_new_game_is_sent_only_when_the_game_changes(self) -> None:
+        lean = LeanUciEngine.popen_uci(fake_engine_command())
+        self.addCleanup(lean.quit)
+        board = chess.Board()
+        limit = chess.engine.Limit(depth=2)
+        game = object()
+        with mock.patch.object(lean, "_send", wraps=lean._send) as send:
+            lean.analyse(board, limit)
+            lean.analyse(board, limit)
+            lean.analyse(board, limit, game=game)
+            lean.analyse(board, limit, game=game)
+            evaluate_position(
+                board, limit, engine=lean, cache=EvalCache(), oracle=PositionOracle()
+            )
+        sent = [call.args[0] for call in send.call_args_list]
+        self.assertEqual(sent.count("ucinewgame"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import contextlib
+import io
+import os
+import unittest
+from pathlib import Path
+import sys
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+for path in (PROJECT_ROOT, SRC_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from chess_punisher.engine import fake_uci
+from chess_punisher.engine.engine_pool import EnginePool
+from chess_punisher.engine.eval_cache import EvalCache
+from scripts import move_harness
+
+
+class MoveHarnessTests(unittest.TestCase):
+    def _run(self, *inputs: str) -> tuple[int, list[object]]:
+        pool = EnginePool(
+            command=fake_uci.fake_engine_command("--latency-ms", "500"), idle_timeout_s=0
+        )
+        self.addCleanup(pool.close)
+        # --depth keeps the fake engine's latency from being capped by a movetime.
+        argv = ["move_harness", "--actuation-mode", "sim", "--confirm-moves", "--depth", "8"]
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(mock.patch.object(sys, "argv", argv + ["--speculate", "0"]))
+            stack.enter_context(mock.patch.dict(os.environ, {"STOCKFISH_PATH": fake_uci.__file__}))
+            stack.enter_context(mock.patch("builtins.input", side_effect=list(inputs)))
+            stack.enter_context(mock.patch.object(move_harness, "configure_logging"))
+            stack.enter_context(
+                mock.patch("chess_punisher.engine.engine_pool._DEFAULT_POOL", pool)
+            )
+            stack.enter_context(
+                mock.patch("chess_punisher.engine.eval_cache._DEFAULT_CACHE", EvalCache())
+            )
+            stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            logs = stack.enter_context(self.assertLogs(level="INFO"))
+            code = move_harness.main()
+        return code, logs.records
+
+    def test_reset_cancels_search_in_flight(self) -> None:
+        # The search after e2e4 takes 500ms; "reset" at the confirmation prompt cuts it short.
+        code, records = self._run("e2e4", "reset", "quit")
+
+        self.assertEqual(code, 0)
+        cancelled = [record for record in records if record.getMessage() == "analysis_cancelled"]
+        self.assertEqual([(record.reason, record.count) for record in cancelled], [("reset", 1)])
+        messages = [record.getMessage() for record in records]
+        self.assertNotIn("move_classified", messages)
+        (quit_record,) = [
+            record for record in records if record.getMessage() == "move_harness_quit"
+        ]
+        self.assertEqual(quit_record.candidate_overlap["rejected"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,13 @@
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
 import queue
+import threading
+import time
 import unittest
 from pathlib import Path
 import sys
+from typing import Callable
+from unittest import mock
 
 SRC_PATH = Path(__file__).resolve().parents[1] / "src"
 if str(SRC_PATH) not in sys.path:
@@ -12,6 +18,19 @@ from chess_punisher.actuation.mqtt_dispatcher import MqttCommandTracker
 from chess_punisher.actuation.protocol import CommandAck, PunishCommand
 
 
+def _command(command_id: str, seq: int = 1) -> PunishCommand:
+    return PunishCommand(
+        command_id=command_id,
+        game_id="g1",
+        seq=seq,
+        action="tap",
+        severity="MISTAKE",
+        pulse_ms=100,
+        ttl_ms=1000,
+        created_at=datetime.now(timezone.utc).isoformat(),
+    )
+
+
 class FakeTransport:
     def __init__(self) -> None:
         self.acks: queue.Queue[CommandAck] = queue.Queue()
@@ -30,6 +49,32 @@ class FakeTransport:
         return
 
 
+class CallbackTransport:
+    """Delivers ACKs through `set_ack_handler` like PahoAckTransport."""
+
+    def __init__(self, ack_after_s: float | None = 0.01) -> None:
+        self.ack_after_s = ack_after_s
+        self.handler: Callable[[CommandAck], None] | None = None
+        self.published: list[tuple[str, str, int]] = []
+
+    def set_ack_handler(self, handler: Callable[[CommandAck], None]) -> None:
+        self.handler = handler
+
+    def publish(self, topic: str, payload: str, qos: int = 1) -> None:
+        self.published.append((topic, payload, qos))
+        if self.ack_after_s is None:
+            return
+        command = PunishCommand.from_json(payload)
+        ack = CommandAck(command_id=command.command_id, state="executed", ts_ms=1)
+        threading.Timer(self.ack_after_s, self.handler, args=(ack,)).start()
+
+    def recv_ack(self, timeout_s: float) -> CommandAck | None:
+        raise AssertionError("callback transports are never polled")
+
+    def close(self) -> None:
+        return
+
+
 class MqttAdapterTests(unittest.TestCase):
     def test_send_and_wait_success(self) -> None:
         transport = FakeTransport()
@@ -44,13 +89,50 @@ class MqttAdapterTests(unittest.TestCase):
             severity="MISTAKE",
             pulse_ms=100,
             ttl_ms=1000,
-            created_at="2026-03-04T12:00:00Z",
+            created_at=datetime.now(timezone.utc).isoformat(),
         )
         transport.acks.put(CommandAck(command_id="c1", state="executed", ts_ms=123))
         ok = adapter.send_and_wait(command)
         self.assertTrue(ok)
         self.assertEqual(len(transport.published), 1)
 
+    def test_send_is_non_blocking_and_resolved_from_callback(self) -> None:
+        transport = CallbackTransport(ack_after_s=0.02)
+        tracker = MqttCommandTracker(ack_timeout_s=1.0, max_attempts=2)
+        adapter = MqttActuatorAdapter(device_id="esp32-1", tracker=tracker, transport=transport)
+
+        futures = [adapter.send(_command(f"c{seq}", seq)) for seq in (1, 2, 3)]
+        self.assertFalse(any(future.done() for future in futures))
+        self.assertEqual([future.result(timeout=1.0) for future in futures], [True] * 3)
+        self.assertEqual(len(transport.published), 3)
+        adapter.close()
+
+    def test_retries_fire_from_timers_until_exhausted(self) -> None:
+        transport = CallbackTransport(ack_after_s=None)
+        tracker = MqttCommandTracker(ack_timeout_s=0.03, max_attempts=3)
+        adapter = MqttActuatorAdapter(device_id="esp32-1", tracker=tracker, transport=transport)
+
+        started = time.monotonic()
+        self.assertFalse(adapter.send_and_wait(_command("c1")))
+        self.assertLess(time.monotonic() - started, 0.3)
+        self.assertEqual(len(transport.published), 3)
+        self.assertFalse(tracker.is_pending("c1"))
+        adapter.close()
+
+    def test_timed_out_wait_is_never_retried(self) -> None:
+        transport = CallbackTransport(ack_after_s=None)
+        tracker = MqttCommandTracker(ack_timeout_s=0.03, max_attempts=3)
+        adapter = MqttActuatorAdapter(device_id="esp32-1", tracker=tracker, transport=transport)
+        self.addCleanup(adapter.close)
+
+        # The wait gives up before the first retry is due.
+        with mock.patch.object(Future, "result", side_effect=FutureTimeoutError):
+            self.assertFalse(adapter.send_and_wait(_command("c1")))
+        self.assertFalse(tracker.is_pending("c1"))
+
+        time.sleep(0.15)
+        self.assertEqual(len(transport.published), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
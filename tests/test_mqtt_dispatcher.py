@@ -1,3 +1,5 @@
+from datetime import datetime, timezone
+import time
 import unittest
 from pathlib import Path
 import sys
@@ -6,10 +8,26 @@ SRC_PATH = Path(__file__).resolve().parents[1] / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
+from chess_punisher.actuation.bench import run_tracker_benchmark
 from chess_punisher.actuation.mqtt_dispatcher import MqttCommandTracker
 from chess_punisher.actuation.protocol import CommandAck, PunishCommand
 
 
+def _command(
+    command_id: str, seq: int = 1, severity: str = "MISTAKE", ttl_ms: int = 1000
+) -> PunishCommand:
+    return PunishCommand(
+        command_id=command_id,
+        game_id="g1",
+        seq=seq,
+        action="tap",
+        severity=severity,
+        pulse_ms=100,
+        ttl_ms=ttl_ms,
+        created_at=datetime.now(timezone.utc).isoformat(),
+    )
+
+
 class MqttDispatcherTests(unittest.TestCase):
     def test_register_and_ack(self) -> None:
         tracker = MqttCommandTracker(ack_timeout_s=0.01, max_attempts=2)
@@ -21,12 +39,54 @@ class MqttDispatcherTests(unittest.TestCase):
             severity="MISTAKE",
             pulse_ms=100,
             ttl_ms=1000,
-            created_at="2026-03-04T12:00:00Z",
+            created_at=datetime.now(timezone.utc).isoformat(),
         )
         tracker.register(command)
         ok = tracker.mark_ack(CommandAck(command_id="c1", state="executed", ts_ms=42))
         self.assertTrue(ok)
 
+    def test_retries_follow_deadline_order(self) -> None:
+        tracker = MqttCommandTracker(ack_timeout_s=0.02, max_attempts=2)
+        self.assertIsNone(tracker.next_deadline())
+        first = tracker.register(_command("c1", 1))
+        tracker.register(_command("c2", 2))
+        tracker.register(_command("c3", 3))
+        tracker.mark_ack(CommandAck(command_id="c1", state="executed", ts_ms=1))
+        self.assertGreater(tracker.next_deadline(), first.deadline_s)
+        self.assertEqual(tracker.due_retries(), [])
+
+        time.sleep(0.03)
+        retried = [command.command_id for command in tracker.due_retries()]
+        self.assertEqual(retried, ["c2", "c3"])
+        self.assertEqual(tracker.due_retries(), [])
+        time.sleep(0.03)
+        self.assertEqual(tracker.due_retries(), [])
+        self.assertEqual(len(tracker), 0)
+        self.assertIsNone(tracker.next_deadline())
+
+    def test_expired_commands_are_dropped_and_retries_sorted_by_severity(self) -> None:
+        tracker = MqttCommandTracker(ack_timeout_s=0.05, max_attempts=3)
+        stale = PunishCommand.from_dict({**_command("stale").as_dict(), "created_at": "2026-03-04"})
+        self.assertTrue(tracker.register(stale).expired)
+        short = tracker.register(_command("short", 1, ttl_ms=150))
+        self.assertLessEqual(short.deadline_s, short.expires_s)
+        tracker.register(_command("minor", 2, severity="INACCURACY"))
+        tracker.register(_command("major", 3, severity="BLUNDER"))
+
+        time.sleep(0.07)
+        retried = [command.command_id for command in tracker.due_retries()]
+        self.assertEqual(retried, ["major", "short", "minor"])
+        time.sleep(0.1)
+        retried = [command.command_id for command in tracker.due_retries()]
+        self.assertEqual(retried, ["major", "minor"])
+        self.assertFalse(tracker.is_pending("short"))
+        self.assertEqual(tracker.expired_total, 2)
+
+    def test_tracker_benchmark_reports_per_op_costs(self) -> None:
+        report = run_tracker_benchmark(pending=500, ticks=10)
+        self.assertEqual(report["retried"], 500)
+        self.assertIn("idle_tick_us", report)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,139 @@
+from datetime import datetime, timezone
+import json
+import unittest
+from pathlib import Path
+import sys
+from typing import Callable
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.actuation.mqtt_adapter import MqttActuatorAdapter
+from chess_punisher.actuation.mqtt_dispatcher import MqttCommandTracker
+from chess_punisher.actuation.mqtt_pipeline import MqttCommandPipeline
+from chess_punisher.actuation.protocol import CommandAck, PunishCommand
+
+# One creation time, so commands with equal severity and TTL are ordered by seq.
+CREATED_AT = datetime.now(timezone.utc).isoformat()
+
+
+class ManualTransport:
+    """Records publishes; the test decides when each command is ACKed."""
+
+    def __init__(self) -> None:
+        self.handler: Callable[[CommandAck], None] | None = None
+        self.published: list[str] = []
+
+    def set_ack_handler(self, handler: Callable[[CommandAck], None]) -> None:
+        self.handler = handler
+
+    def publish(self, topic: str, payload: str, qos: int = 1) -> None:
+        self.published.append(json.loads(payload)["command_id"])
+
+    def ack(self, command_id: str) -> None:
+        assert self.handler is not None
+        self.handler(CommandAck(command_id=command_id, state="executed", ts_ms=1))
+
+    def recv_ack(self, timeout_s: float) -> CommandAck | None:
+        return None
+
+    def close(self) -> None:
+        return
+
+
+def _command(
+    seq: int, severity: str = "MISTAKE", ttl_ms: int = 60_000, created_at: str = CREATED_AT
+) -> PunishCommand:
+    return PunishCommand(
+        command_id=f"c{seq}",
+        game_id="g1",
+        seq=seq,
+        action="tap",
+        severity=severity,
+        pulse_ms=100,
+        ttl_ms=ttl_ms,
+        created_at=created_at,
+    )
+
+
+def _adapter(device_id: str, transport: ManualTransport) -> MqttActuatorAdapter:
+    tracker = MqttCommandTracker(ack_timeout_s=5.0, max_attempts=1)
+    return MqttActuatorAdapter(device_id=device_id, tracker=tracker, transport=transport)
+
+
+class MqttCommandPipelineTests(unittest.TestCase):
+    def test_window_limits_in_flight_and_sends_lowest_seq_first(self) -> None:
+        transport = ManualTransport()
+        adapter = _adapter("esp32-1", transport)
+        self.addCleanup(adapter.close)
+        pipeline = MqttCommandPipeline([adapter], window=2)
+        done: list[tuple[str, bool]] = []
+
+        def on_done(command: PunishCommand, executed: bool) -> None:
+            done.append((command.command_id, executed))
+
+        futures = [pipeline.submit(_command(seq), on_done=on_done) for seq in (1, 2, 5, 4, 3)]
+        self.assertEqual(transport.published, ["c1", "c2"])
+        transport.ack("c2")
+        self.assertEqual(transport.published, ["c1", "c2", "c3"])
+        for command_id in ("c1", "c3", "c4", "c5"):
+            transport.ack(command_id)
+
+        self.assertEqual(transport.published, ["c1", "c2", "c3", "c4", "c5"])
+        self.assertTrue(all(future.result(timeout=1.0) for future in futures))
+        self.assertEqual([command_id for command_id, _ in done], ["c2", "c1", "c3", "c4", "c5"])
+        (stats,) = pipeline.stats()
+        self.assertEqual((stats.in_flight, stats.max_in_flight, stats.executed), (0, 2, 5))
+
+    def test_slow_device_does_not_block_another(self) -> None:
+        slow, fast = ManualTransport(), ManualTransport()
+        adapters = [_adapter("slow", slow), _adapter("fast", fast)]
+        for adapter in adapters:
+            self.addCleanup(adapter.close)
+        pipeline = MqttCommandPipeline(adapters, window=1)
+
+        pipeline.submit(_command(1), device_id="slow")
+        queued = pipeline.submit(_command(2), device_id="slow")
+        first = pipeline.submit(_command(3), device_id="fast")
+        fast.ack("c3")
+        second = pipeline.submit(_command(4), device_id="fast")
+        fast.ack("c4")
+
+        self.assertTrue(first.result(timeout=1.0) and second.result(timeout=1.0))
+        self.assertFalse(queued.done())
+        with self.assertRaises(ValueError):
+            pipeline.submit(_command(5))
+        pipeline.close()
+        self.assertFalse(queued.result(timeout=1.0))
+        by_device = {stats.device_id: stats for stats in pipeline.stats()}
+        self.assertEqual((by_device["slow"].in_flight, by_device["slow"].failed), (1, 1))
+        self.assertEqual(by_device["fast"].executed, 2)
+
+    def test_severity_first_and_stale_commands_are_dropped(self) -> None:
+        transport = ManualTransport()
+        adapter = _adapter("esp32-1", transport)
+        self.addCleanup(adapter.close)
+        pipeline = MqttCommandPipeline([adapter], window=1)
+
+        pipeline.submit(_command(1))
+        stale = pipeline.submit(_command(2, severity="BLUNDER", ttl_ms=1))
+        pipeline.submit(_command(3, severity="INACCURACY"))
+        pipeline.submit(_command(4, severity="BLUNDER"))
+        old = pipeline.submit(_command(5, created_at="2026-03-04T12:00:00Z"))
+        for command_id in ("c1", "c4", "c3"):
+            transport.ack(command_id)
+
+        self.assertEqual(transport.published, ["c1", "c4", "c3"])
+        self.assertFalse(stale.result(timeout=1.0) or old.result(timeout=1.0))
+        (stats,) = pipeline.stats()
+        self.assertEqual((stats.executed, stats.failed, stats.expired), (3, 2, 2))
+
+        # An already-stale command handed straight to the adapter is never published.
+        self.assertFalse(adapter.send(_command(6, ttl_ms=1)).result(timeout=1.0))
+        self.assertEqual(transport.published, ["c1", "c4", "c3"])
+        self.assertEqual(pipeline.stats()[0].expired, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
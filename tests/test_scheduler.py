@@ -0,0 +1,81 @@
+import unittest
+from pathlib import Path
+import sys
+
+import chess
+import chess.engine
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+for path in (PROJECT_ROOT, SRC_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from chess_punisher.engine.engine_pool import EnginePool
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.scheduler import AnalysisScheduler
+from tests.stub_engine import StubEngine
+
+
+def _board(*moves: str) -> chess.Board:
+    board = chess.Board()
+    for uci in moves:
+        board.push_uci(uci)
+    return board
+
+
+class AnalysisSchedulerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = StubEngine(gated=True)
+        self.pool = EnginePool(size=1, idle_timeout_s=0, factory=lambda: self.engine)
+        self.scheduler = AnalysisScheduler(pool=self.pool, cache=EvalCache(max_entries=0))
+        self.addCleanup(self.pool.close)
+        self.addCleanup(self.scheduler.close)
+
+    def test_priority_then_deadline_order_and_budget_cuts(self) -> None:
+        blocker = self.scheduler.submit(_board(), deadline_s=10)
+        self.engine.started.wait(5)
+        low = self.scheduler.submit(_board("e2e4"), deadline_s=1, priority=0)
+        late = self.scheduler.submit(_board("d2d4"), deadline_s=9, priority=5)
+        urgent = self.scheduler.submit(_board("c2c4"), deadline_s=8, priority=5)
+        self.assertEqual(self.scheduler.queue_depth, 3)
+
+        self.engine.gate.set()
+        for future in (blocker, low, late, urgent):
+            future.result(timeout=5)
+
+        order = [fen for fen, _ in self.engine.searches]
+        expected = [_board(), _board("c2c4"), _board("d2d4"), _board("e2e4")]
+        self.assertEqual(order, [board.fen() for board in expected])
+        # Three jobs queued behind one engine: a third of the budget, rounded down to a quarter.
+        self.assertEqual(self.engine.searches[1][1].time, 0.1 / 4)
+        self.assertGreaterEqual(self.scheduler.stats().budget_cuts, 1)
+
+    def test_missed_deadline_is_counted(self) -> None:
+        self.engine.gate.set()
+        loss, label = self.scheduler.submit(
+            _board(), chess.Move.from_uci("e2e4"), deadline_s=0.0
+        ).result(timeout=5)
+        self.assertEqual((loss, label), (0, "OK"))
+        stats = self.scheduler.stats()
+        self.assertEqual((stats.completed, stats.missed_deadlines), (1, 1))
+        self.assertEqual(self.engine.searches[0][1].time, self.scheduler.min_time_s)
+
+    def test_depth_and_node_budgets_are_never_cut(self) -> None:
+        self.engine.gate.set()
+        self.scheduler.submit(_board(), deadline_s=0.0, depth=12).result(timeout=5)
+        self.scheduler.submit(
+            _board(), chess.Move.from_uci("e2e4"), deadline_s=0.0, nodes=5_000
+        ).result(timeout=5)
+
+        limits = [limit for _, limit in self.engine.searches]
+        self.assertEqual(limits[0], chess.engine.Limit(depth=12))
+        self.assertEqual(limits[1:], [chess.engine.Limit(nodes=5_000)] * 2)
+        stats = self.scheduler.stats()
+        self.assertEqual((stats.budget_cuts, stats.missed_deadlines), (0, 2))
+        with self.assertRaises(ValueError):
+            self.scheduler.submit(_board(), depth=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
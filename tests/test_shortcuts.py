@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+import struct
+import sys
+import tempfile
+import unittest
+
+import chess
+import chess.engine
+import chess.polyglot
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+for path in (PROJECT_ROOT, SRC_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from chess_punisher.engine.blunder_classifier import MATE_CP_EQUIVALENT, compute_cp_loss_for_mover
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.game_analyzer import GameAnalyzer
+from chess_punisher.engine.shortcuts import PositionOracle
+from chess_punisher.engine.stockfish_engine import evaluate_position
+from tests.stub_engine import StubEngine
+
+
+class FakeTablebase:
+    """The side with a queen wins, the other side loses; DTZ is always 1."""
+
+    def probe_wdl(self, board: chess.Board) -> int:
+        return 2 if board.pieces(chess.QUEEN, board.turn) else -2
+
+    def probe_dtz(self, board: chess.Board) -> int:
+        return 1
+
+    def close(self) -> None:
+        pass
+
+
+def _write_book(path: str, board: chess.Board, move: chess.Move) -> None:
+    raw_move = move.to_square | (move.from_square << 6)
+    entry = struct.pack(">QHHI", chess.polyglot.zobrist_hash(board), raw_move, 1, 0)
+    with open(path, "wb") as handle:
+        handle.write(entry)
+
+
+class PositionOracleTests(unittest.TestCase):
+    def test_book_move_skips_search(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            book_path = os.path.join(tmp, "book.bin")
+            _write_book(book_path, chess.Board(), chess.Move.from_uci("e2e4"))
+            oracle = PositionOracle.from_paths(book_path=book_path)
+            try:
+                engine = StubEngine()
+                result = compute_cp_loss_for_mover(
+                    chess.Board(),
+                    chess.Move.from_uci("e2e4"),
+                    engine,
+                    cache=EvalCache(),
+                    oracle=oracle,
+                )
+                self.assertEqual(result, (0, "OK"))
+                self.assertEqual(engine.calls, 0)
+
+                analyzer = GameAnalyzer(engine=engine, cache=EvalCache(), oracle=oracle)
+                book = analyzer.push(chess.Move.from_uci("e2e4"))
+                self.assertEqual((book.source, book.bestmove_uci), ("book", "e2e4"))
+                self.assertEqual(engine.calls, 0)
+                out_of_book = analyzer.push(chess.Move.from_uci("e7e5"))
+                self.assertEqual(out_of_book.source, "engine")
+                self.assertEqual(engine.calls, 2)
+                self.assertEqual(oracle.stats(), {"book": 2, "tablebase": 0, "database": 0, "engine": 2})
+            finally:
+                oracle.close()
+
+    def test_tablebase_position_is_exact(self) -> None:
+        oracle = PositionOracle(tablebase=FakeTablebase())
+        engine = StubEngine()
+        board = chess.Board("8/8/8/8/8/2k5/8/KQ6 w - - 0 1")
+
+        result = evaluate_position(
+            board, chess.engine.Limit(time=0.1), engine=engine, cache=EvalCache(), oracle=oracle
+        )
+        self.assertEqual(result.score.pov(chess.WHITE).score(), MATE_CP_EQUIVALENT)
+        self.assertIsNotNone(result.best_move)
+        self.assertEqual(engine.calls, 0)
+
+        opening = evaluate_position(
+            chess.Board(),
+            chess.engine.Limit(time=0.1),
+            engine=engine,
+            cache=EvalCache(),
+            oracle=oracle,
+        )
+        self.assertEqual(opening.score.pov(chess.WHITE).score(), 0)
+        self.assertEqual(oracle.stats(), {"book": 0, "tablebase": 1, "database": 0, "engine": 1})
+
+    def test_missing_tablebase_directory_is_logged_not_raised(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            missing = os.path.join(tmp, "missing")
+            with self.assertLogs(level="WARNING") as logs:
+                oracle = PositionOracle.from_paths(syzygy_path=missing)
+            self.assertIsNone(oracle.tablebase)
+            self.assertEqual(logs.records[0].getMessage(), "tablebase_unavailable")
+
+            with self.assertLogs(level="WARNING"):
+                oracle = PositionOracle.from_paths(syzygy_path=os.pathsep.join([missing, tmp]))
+            self.assertIsNotNone(oracle.tablebase)
+            oracle.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 import unittest
 from pathlib import Path
 import sys
@@ -34,7 +35,7 @@ class SimulatedPunishFlowTests(unittest.TestCase):
             severity=label,
             pulse_ms=250,
             ttl_ms=3000,
-            created_at="2026-03-04T12:00:00Z",
+            created_at=datetime.now(timezone.utc).isoformat(),
         )
         tracker = MqttCommandTracker(ack_timeout_s=0.2, max_attempts=3)
         tracker.register(command)
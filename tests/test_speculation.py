@@ -0,0 +1,86 @@
+import unittest
+from pathlib import Path
+import sys
+
+import chess
+import chess.engine
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.engine_pool import EnginePool
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.speculation import Speculator
+
+
+class FinishedAnalysis:
+    def __init__(self, lines: list[dict[str, object]]) -> None:
+        self.multipv = lines
+
+    def wait(self) -> None:
+        return None
+
+    def stop(self) -> None:
+        return None
+
+
+class ReplyEngine:
+    """Ranks replies in legal-move order and scores every position at +10 for the mover."""
+
+    def analysis(
+        self,
+        board: chess.Board,
+        limit: chess.engine.Limit,
+        multipv: int | None = None,
+    ) -> FinishedAnalysis:
+        moves = list(board.legal_moves)[: multipv or 1]
+        return FinishedAnalysis(
+            [
+                {"score": chess.engine.PovScore(chess.engine.Cp(10), board.turn), "pv": [move]}
+                for move in moves
+            ]
+        )
+
+    def quit(self) -> None:
+        return None
+
+
+class SpeculatorTests(unittest.TestCase):
+    def test_speculated_reply_is_cached_and_counted(self) -> None:
+        cache = EvalCache()
+        pool = EnginePool(size=1, idle_timeout_s=0, factory=ReplyEngine)
+        speculator = Speculator(top_n=2, time_limit_s=0.1, pool=pool, cache=cache)
+        board = chess.Board()
+        board.push_uci("e2e4")
+
+        speculator.start(board)
+        self.assertTrue(speculator.wait(timeout_s=2.0))
+
+        reply = list(board.legal_moves)[0]
+        self.assertTrue(speculator.preempt(reply))
+        board.push(reply)
+        self.assertIsNotNone(cache.get(board, chess.engine.Limit(time=0.1)))
+
+        speculator.start(board)
+        speculator.wait(timeout_s=2.0)
+        self.assertFalse(speculator.preempt(chess.Move.from_uci("h2h4")))
+        self.assertEqual(speculator.stats()["hit_rate"], 0.5)
+        pool.close()
+
+    def test_speculation_does_not_count_as_cache_traffic(self) -> None:
+        cache = EvalCache()
+        pool = EnginePool(size=1, idle_timeout_s=0, factory=ReplyEngine)
+        self.addCleanup(pool.close)
+        speculator = Speculator(top_n=2, time_limit_s=0.1, pool=pool, cache=cache)
+
+        for _ in range(2):
+            speculator.start(chess.Board())
+            self.assertTrue(speculator.wait(timeout_s=2.0))
+
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (0, 0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
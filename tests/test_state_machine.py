@@ -29,6 +29,17 @@ class StateMachineTests(unittest.TestCase):
         machine.handle(event("PUNISH_ACK"))
         self.assertEqual(machine.state, AppState.TRACKING)
 
+    def test_queued_punishment_resumes_tracking_without_ack(self) -> None:
+        machine = AppStateMachine()
+        machine.handle(event("START"))
+        machine.handle(event("CALIBRATION_STABLE", confidence=0.95))
+        machine.handle(event("MOVE_CANDIDATE", move_uci="e2e4", confidence=0.92))
+        machine.handle(event("MOVE_CONFIRMED", punish=True))
+        transition = machine.handle(event("PUNISH_QUEUED"))
+        self.assertEqual(machine.state, AppState.TRACKING)
+        self.assertEqual(transition.reason, "punish_queued")
+        self.assertFalse(machine.context.pending_punishment)
+
     def test_timeout_recalibration(self) -> None:
         machine = AppStateMachine()
         machine.handle(event("START"))
@@ -40,6 +51,16 @@ class StateMachineTests(unittest.TestCase):
         machine.handle(event("PUNISH_TIMEOUT"))
         self.assertEqual(machine.state, AppState.CALIBRATING)
 
+    def test_rejection_and_desync_abort_pending_work(self) -> None:
+        aborted: list[str] = []
+        machine = AppStateMachine(on_abort=aborted.append)
+        machine.handle(event("START"))
+        machine.handle(event("CALIBRATION_STABLE", confidence=1.0))
+        machine.handle(event("MOVE_CANDIDATE", move_uci="e2e4", confidence=0.9))
+        machine.handle(event("MOVE_REJECTED"))
+        machine.handle(event("DESYNC"))
+        self.assertEqual(aborted, ["move_rejected", "desync_recalibrate"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from pathlib import Path
+import sys
+
+import chess
+import chess.engine
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+for path in (PROJECT_ROOT, SRC_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from chess_punisher.engine.eval_cache import EvalCache, limit_key
+from chess_punisher.engine.shortcuts import PositionOracle
+from chess_punisher.engine.stockfish_engine import build_limit, evaluate_position, measure_nps
+from tests.stub_engine import StubEngine
+
+
+class NpsEngine:
+    def analyse(self, board: chess.Board, limit: chess.engine.Limit) -> dict[str, object]:
+        return {"nodes": 50_000, "time": 0.1}
+
+
+class StockfishEngineTests(unittest.TestCase):
+    def test_node_and_depth_budgets_replace_time(self) -> None:
+        self.assertEqual(build_limit(0.2).time, 0.2)
+        limit = build_limit(0.2, nodes=100_000)
+        self.assertIsNone(limit.time)
+        self.assertEqual(limit.nodes, 100_000)
+        self.assertEqual(limit_key(build_limit(0.1, depth=12)), limit_key(build_limit(0.5, depth=12)))
+        with self.assertRaises(ValueError):
+            build_limit(depth=0)
+
+    def test_measure_nps(self) -> None:
+        nps = measure_nps([chess.Board(), chess.Board()], engine=NpsEngine())
+        self.assertAlmostEqual(nps, 500_000)
+
+    def test_depth_and_node_searches_start_a_new_game(self) -> None:
+        engine = StubEngine()
+        oracle = PositionOracle()
+        board = chess.Board()
+        for limit in (build_limit(depth=8), build_limit(nodes=1_000), build_limit(0.1)):
+            evaluate_position(board, limit, engine=engine, cache=EvalCache(), oracle=oracle)
+
+        depth_game, nodes_game, timed = engine.kwargs
+        # A fresh game object each time makes python-chess send ucinewgame (clearing the hash).
+        self.assertIsNot(depth_game["game"], nodes_game["game"])
+        self.assertEqual(timed, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
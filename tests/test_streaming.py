@@ -0,0 +1,80 @@
+import unittest
+from pathlib import Path
+import sys
+
+import chess
+import chess.engine
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.streaming import compute_cp_loss_streaming
+
+
+class FakeAnalysis:
+    def __init__(self, infos: list[dict[str, object]]) -> None:
+        self._infos = infos
+        self.info: dict[str, object] = {}
+        self.stopped = False
+
+    def __enter__(self) -> "FakeAnalysis":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def __iter__(self):
+        for info in self._infos:
+            if self.stopped:
+                return
+            self.info = info
+            yield info
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+class StreamingEngine:
+    """Start position is level; after the move, each depth reports `after_cp` for the mover."""
+
+    def __init__(self, after_cp: int, depths: int = 20) -> None:
+        self.after_cp = after_cp
+        self.depths = depths
+        self.last_analysis: FakeAnalysis | None = None
+
+    def analyse(self, board: chess.Board, limit: chess.engine.Limit) -> dict[str, object]:
+        return {"score": chess.engine.PovScore(chess.engine.Cp(0), board.turn)}
+
+    def analysis(self, board: chess.Board, limit: chess.engine.Limit) -> FakeAnalysis:
+        mover = not board.turn
+        infos = [
+            {"depth": d, "score": chess.engine.PovScore(chess.engine.Cp(self.after_cp), mover)}
+            for d in range(1, self.depths + 1)
+        ]
+        self.last_analysis = FakeAnalysis(infos)
+        return self.last_analysis
+
+
+class StreamingTests(unittest.TestCase):
+    def test_clear_blunder_stops_at_min_depth(self) -> None:
+        engine = StreamingEngine(after_cp=-900)
+        result = compute_cp_loss_streaming(
+            chess.Board(), chess.Move.from_uci("f2f3"), engine, min_depth=6, cache=EvalCache()
+        )
+        self.assertTrue(result.stopped_early)
+        self.assertEqual((result.loss_cp, result.classification, result.depth), (900, "BLUNDER", 6))
+
+    def test_borderline_loss_searches_to_the_end(self) -> None:
+        engine = StreamingEngine(after_cp=-60)
+        result = compute_cp_loss_streaming(
+            chess.Board(), chess.Move.from_uci("a2a3"), engine, min_depth=6, cache=EvalCache()
+        )
+        self.assertFalse(result.stopped_early)
+        self.assertEqual((result.classification, result.depth), ("INACCURACY", 20))
+        self.assertEqual(result.saved_s, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+from pathlib import Path
+import sys
+import threading
+import time
+import unittest
+
+import chess
+import chess.engine
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from chess_punisher.engine.cancellation import CancelToken
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.fake_uci import fake_engine_command
+from chess_punisher.engine.lean_uci import LeanUciEngine
+from chess_punisher.engine.shortcuts import PositionOracle
+from chess_punisher.engine.stockfish_engine import evaluate_position
+from chess_punisher.engine.supervisor import SupervisedEngine
+
+
+class FlakyEngine:
+    """Fails its first analyse (if `crash`) or every ping (if `wedged`)."""
+
+    def __init__(self, crash: bool = False, wedged: bool = False) -> None:
+        self.crash = crash
+        self.wedged = wedged
+        self.analysed: list[str] = []
+        self.closed = False
+        self.options: dict[str, object] = {}
+
+    def analyse(self, board: chess.Board, limit: chess.engine.Limit) -> dict[str, object]:
+        if self.crash:
+            raise chess.engine.EngineTerminatedError("engine process died unexpectedly")
+        self.analysed.append(board.fen())
+        return {"score": chess.engine.PovScore(chess.engine.Cp(10), board.turn)}
+
+    def ping(self) -> None:
+        if self.wedged:
+            raise TimeoutError()
+
+    def close(self) -> None:
+        self.closed = True
+
+    def quit(self) -> None:
+        self.closed = True
+
+
+class SupervisedEngineTests(unittest.TestCase):
+    def test_crash_restarts_warms_and_retries(self) -> None:
+        first, second = FlakyEngine(), FlakyEngine()
+        spawned = [first, second]
+        supervised = SupervisedEngine(lambda: spawned.pop(0), watchdog_interval_s=0)
+        limit = chess.engine.Limit(time=0.05)
+        board = chess.Board()
+        supervised.analyse(board, limit)
+        board.push_uci("e2e4")
+
+        first.crash = True
+        info = supervised.analyse(board, limit)
+
+        self.assertEqual(supervised.restarts, 1)
+        self.assertTrue(first.closed)
+        self.assertEqual(info["score"].relative, chess.engine.Cp(10))
+        # The replacement replays the earlier position before the retried search.
+        self.assertEqual(second.analysed, [chess.STARTING_FEN, board.fen()])
+
+    def test_depth_limited_searches_are_not_replayed(self) -> None:
+        first, second = FlakyEngine(), FlakyEngine()
+        spawned = [first, second]
+        supervised = SupervisedEngine(lambda: spawned.pop(0), watchdog_interval_s=0)
+        board = chess.Board()
+        supervised.analyse(board, chess.engine.Limit(depth=5))
+
+        first.crash = True
+        supervised.analyse(board, chess.engine.Limit(time=0.05))
+
+        # Depth searches run on a cleared hash, so replaying them would warm nothing.
+        self.assertEqual(second.analysed, [chess.STARTING_FEN])
+
+    def test_watchdog_restarts_unresponsive_engine(self) -> None:
+        engines = [FlakyEngine(wedged=True), FlakyEngine()]
+        supervised = SupervisedEngine(lambda: engines.pop(0), watchdog_interval_s=0.01)
+        try:
+            deadline = time.monotonic() + 2.0
+            while supervised.restarts == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(supervised.restarts, 1)
+        finally:
+            supervised.quit()
+
+    def test_killed_uci_process_is_replaced(self) -> None:
+        supervised = SupervisedEngine(
+            lambda: chess.engine.SimpleEngine.popen_uci(fake_engine_command()),
+            watchdog_interval_s=0,
+        )
+        try:
+            supervised.analyse(chess.Board(), chess.engine.Limit(depth=2))
+            supervised.engine.transport.kill()
+            info = supervised.analyse(chess.Board(), chess.engine.Limit(depth=2))
+            self.assertIn("score", info)
+            self.assertEqual(supervised.restarts, 1)
+        finally:
+            supervised.quit()
+
+    def test_engine_killed_during_token_search_is_restarted(self) -> None:
+        command = fake_engine_command("--latency-ms", "300")
+        spawners = {
+            "simple": lambda: chess.engine.SimpleEngine.popen_uci(command),
+            "lean": lambda: LeanUciEngine.popen_uci(command),
+        }
+        for driver, spawn in spawners.items():
+            with self.subTest(driver=driver):
+                supervised = SupervisedEngine(spawn, watchdog_interval_s=0)
+                self.addCleanup(supervised.quit)
+                killed = supervised.engine
+                kill = killed.transport.kill if driver == "simple" else killed._process.kill
+                threading.Timer(0.1, kill).start()
+
+                result = evaluate_position(
+                    chess.Board(),
+                    chess.engine.Limit(depth=4),
+                    engine=supervised,
+                    cache=EvalCache(),
+                    oracle=PositionOracle(),
+                    token=CancelToken("game-1", 0),
+                )
+
+                self.assertIsNotNone(result.score)
+                self.assertEqual(supervised.restarts, 1)
+                self.assertIsNot(supervised.engine, killed)
+
+    def test_watchdog_kills_hung_analysis(self) -> None:
+        supervised = SupervisedEngine(
+            lambda: chess.engine.SimpleEngine.popen_uci(
+                fake_engine_command("--latency-ms", "5000")
+            ),
+            watchdog_interval_s=0.02,
+            hang_timeout_s=0.2,
+        )
+        self.addCleanup(supervised.close)
+        started = time.monotonic()
+        with self.assertRaises(chess.engine.EngineError):
+            with supervised.analysis(chess.Board(), chess.engine.Limit(depth=4)) as analysis:
+                analysis.wait()
+        # Killed once, restarted, and the retry killed as well, well before the 5s search ends.
+        self.assertLess(time.monotonic() - started, 3.0)
+        self.assertEqual(supervised.restarts, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import unittest
+from pathlib import Path
+import sys
+from unittest import mock
+
+import chess
+import chess.engine
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+for path in (PROJECT_ROOT, SRC_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from chess_punisher.app.main import run_once
+from chess_punisher.engine.engine_pool import EnginePool
+from chess_punisher.engine.eval_cache import EvalCache
+from chess_punisher.engine.warmup import EngineWarmup, warmup_boards
+from tests.stub_engine import StubEngine
+
+
+class EngineWarmupTests(unittest.TestCase):
+    def test_every_pool_engine_is_warmed_and_cached(self) -> None:
+        spawned: list[StubEngine] = []
+
+        def factory() -> StubEngine:
+            spawned.append(StubEngine(white_cp=20))
+            return spawned[-1]
+
+        pool = EnginePool(size=2, idle_timeout_s=0, factory=factory)
+        cache = EvalCache()
+        warmup = EngineWarmup(pool=pool, cache=cache, openings=True)
+        warmup.start()
+        self.assertTrue(warmup.wait(timeout_s=5))
+
+        positions = len(warmup_boards(openings=True))
+        self.assertEqual([engine.calls for engine in spawned], [positions, positions])
+        self.assertIsNotNone(cache.get(chess.Board(), warmup.limit))
+        self.assertEqual(warmup.stats()["warmup_state"], "ready")
+        pool.close()
+
+    def test_spawn_failure_marks_warmup_failed(self) -> None:
+        def factory() -> StubEngine:
+            raise RuntimeError("Stockfish binary not found")
+
+        warmup = EngineWarmup(pool=EnginePool(idle_timeout_s=0, factory=factory))
+        warmup.start()
+        self.assertFalse(warmup.wait(timeout_s=5))
+        self.assertEqual(warmup.state, "failed")
+        self.assertIsNotNone(warmup.duration_s)
+
+    def test_any_search_error_marks_warmup_failed(self) -> None:
+        engine = StubEngine(white_cp=20)
+        pool = EnginePool(idle_timeout_s=0, factory=lambda: engine)
+        self.addCleanup(pool.close)
+        warmup = EngineWarmup(pool=pool)
+        with mock.patch.object(engine, "analyse", side_effect=ValueError("bad limit")):
+            warmup.start()
+            self.assertFalse(warmup.wait(timeout_s=5))
+        self.assertEqual((warmup.state, warmup.error), ("failed", "ValueError: bad limit"))
+
+    def test_app_boots_without_stockfish_binary(self) -> None:
+        with mock.patch.dict(os.environ, {"STOCKFISH_PATH": "/nonexistent/stockfish"}):
+            with self.assertLogs("chess_punisher.app.main", level="INFO") as logs:
+                self.assertIsNone(run_once())
+        self.assertIn("engine_warmup_skipped", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()